@@ -5,7 +5,15 @@ Measures wall-time overhead ratio, event throughput, and trace size for each
 instrumentation tier against an untraced baseline, in-process (subprocess
 startup excluded so the numbers reflect steady-state tracing cost).
 
-    python benchmarks/bench.py [--iterations N] [--markdown]
+    python benchmarks/bench.py [--iterations N] [--capture-format jsonl|binary]
+                               [--writer sync|async] [--markdown]
+    python benchmarks/bench.py --thread-scaling [--iterations N]
+
+Mode "t1-nobt" is t1 with ``capture_backtrace = false``: the difference to
+t1 is the cost of resolving each call's source location.
+
+``--thread-scaling`` instead measures traced calls per second with 1 to 16
+threads sharing one recorder (call context ids, occurrence counters, writer).
 """
 
 from __future__ import annotations
@@ -13,6 +21,7 @@ from __future__ import annotations
 import argparse
 import sys
 import tempfile
+import threading
 import time
 
 import numpy as np
@@ -20,7 +29,7 @@ import numpy as np
 from pytracer.instrumentation.patcher import Patcher, resolve_targets
 from pytracer.instrumentation.recorder import Recorder, set_active_recorder
 from pytracer.instrumentation.tracer_array import taint
-from pytracer.trace.writer import TraceWriter
+from pytracer.trace.writer import CAPTURE_FORMATS, WRITER_MODES, make_trace_writer
 
 
 def workload_small_calls(n: int) -> float:
@@ -55,18 +64,19 @@ def timed(fn, *args) -> float:
     return time.perf_counter() - start
 
 
-def run_mode(mode: str, workload, n: int) -> dict:
+def run_mode(mode: str, workload, n: int, capture_format: str = "jsonl",
+             writer_mode: str = "sync") -> dict:
     if mode == "baseline":
         elapsed = timed(workload, n)
         return {"time": elapsed, "events": 0, "bytes": 0}
 
     with tempfile.TemporaryDirectory() as tmp:
-        writer = TraceWriter(tmp)
-        recorder = Recorder(writer, "bench", capture_backtrace=True)
+        writer = make_trace_writer(tmp, capture_format, mode=writer_mode)
+        recorder = Recorder(writer, "bench", capture_backtrace=(mode != "t1-nobt"))
         set_active_recorder(recorder)
         patcher = Patcher(recorder)
         try:
-            if mode == "t1":
+            if mode in ("t1", "t1-nobt"):
                 patcher.patch(resolve_targets(["numpy.sum"]).resolved)
                 elapsed = timed(workload, n)
             elif mode == "t2":
@@ -91,15 +101,68 @@ def run_mode(mode: str, workload, n: int) -> dict:
         return {"time": elapsed, "events": writer.n_events, "bytes": size}
 
 
+def run_threads(n_threads: int, n: int, capture_format: str = "jsonl",
+                writer_mode: str = "sync") -> dict:
+    """n traced numpy.sum calls split across n_threads threads."""
+    per_thread = max(1, n // n_threads)
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = make_trace_writer(tmp, capture_format, mode=writer_mode)
+        recorder = Recorder(writer, "bench", capture_backtrace=True)
+        set_active_recorder(recorder)
+        patcher = Patcher(recorder)
+        barrier = threading.Barrier(n_threads + 1)
+
+        def worker():
+            barrier.wait()
+            workload_small_calls(per_thread)
+
+        threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+        try:
+            patcher.patch(resolve_targets(["numpy.sum"]).resolved)
+            for t in threads:
+                t.start()
+            start = time.perf_counter()
+            barrier.wait()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+        finally:
+            patcher.unpatch()
+            set_active_recorder(None)
+            writer.close()
+        return {"time": elapsed, "calls": per_thread * n_threads, "events": writer.n_events}
+
+
+def thread_scaling(n: int, capture_format: str, writer_mode: str, markdown: bool) -> None:
+    rows = [(k, run_threads(k, n, capture_format, writer_mode)) for k in (1, 2, 4, 8, 16)]
+    base = rows[0][1]["calls"] / rows[0][1]["time"]
+    if markdown:
+        print("| Threads | Time (s) | Calls/s | vs 1 thread |")
+        print("|---|---|---|---|")
+    for k, r in rows:
+        rate = r["calls"] / r["time"]
+        if markdown:
+            print(f"| {k} | {r['time']:.3f} | {rate:,.0f} | {rate / base:.2f}x |")
+        else:
+            print(f"{k:>3d} threads {r['time']:8.3f}s {rate:>12,.0f} calls/s {rate / base:6.2f}x")
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--capture-format", choices=CAPTURE_FORMATS, default="jsonl")
+    parser.add_argument("--writer", choices=WRITER_MODES, default="sync")
     parser.add_argument("--markdown", action="store_true")
+    parser.add_argument("--thread-scaling", action="store_true")
     args = parser.parse_args()
     n = args.iterations
 
+    if args.thread_scaling:
+        thread_scaling(n, args.capture_format, args.writer, args.markdown)
+        return 0
+
     cases = [
-        ("small calls (numpy.sum x N)", workload_small_calls, ["baseline", "t1"]),
+        ("small calls (numpy.sum x N)", workload_small_calls, ["baseline", "t1", "t1-nobt"]),
         ("large arrays (2e6 elements)", workload_large_arrays, ["baseline", "t1"]),
         ("operator loop (x*a+b x N)", workload_operators, ["baseline", "taint"]),
     ]
@@ -108,7 +171,9 @@ def main() -> int:
     for name, workload, modes in cases:
         base = run_mode("baseline", workload, n)
         for mode in modes:
-            r = base if mode == "baseline" else run_mode(mode, workload, n)
+            r = base if mode == "baseline" else run_mode(
+                mode, workload, n, args.capture_format, args.writer
+            )
             rows.append({
                 "workload": name,
                 "mode": mode,
@@ -6,7 +6,16 @@ files are created, no logging is configured.
 
 __version__ = "2.0.0"
 
-__all__ = ["__version__", "trace_function", "taint", "PytracerError"]
+__all__ = [
+    "__version__",
+    "trace_function",
+    "taint",
+    "pause",
+    "resume",
+    "paused",
+    "region",
+    "PytracerError",
+]
 
 
 def __getattr__(name):
@@ -19,6 +28,14 @@ def __getattr__(name):
         from pytracer.instrumentation.tracer_array import taint
 
         return taint
+    if name in ("pause", "resume", "paused"):
+        from pytracer.instrumentation import pause
+
+        return getattr(pause, name)
+    if name == "region":
+        from pytracer.instrumentation.region import region
+
+        return region
     if name == "PytracerError":
         from pytracer._errors import PytracerError
 
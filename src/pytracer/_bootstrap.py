@@ -3,7 +3,9 @@
 Invoked by the experiment orchestrator as
 ``python -m pytracer._bootstrap <spec.json>``. One subprocess per repetition:
 repeats must be statistically independent (module caches, RNG state,
-perturbation-backend seeds are all per-process).
+perturbation-backend seeds are all per-process). With
+``run.start_method = "forkserver"`` the same ``run_from_spec`` runs in a
+child forked from a warm zygote instead (see pytracer._forkserver).
 
 Instrumentation is installed BEFORE the target script is imported, so the
 script's own ``import numpy`` sees the patched attributes.
@@ -12,21 +14,26 @@ script's own ``import numpy`` sees the patched attributes.
 from __future__ import annotations
 
 import json
+import os
 import runpy
 import sys
+import time
 import traceback
 from pathlib import Path
 
 from pytracer.instrumentation.monitor import Monitor
-from pytracer.instrumentation.patcher import Patcher, resolve_targets
+from pytracer.instrumentation.patcher import Patcher, ResolutionReport, resolve_targets
 from pytracer.instrumentation.recorder import Recorder, set_active_recorder
 from pytracer.storage.arrays import make_array_store
-from pytracer.storage.parquet import finalize_run
+from pytracer.storage.finalize import finalize_run_dir
+from pytracer.storage.parquet import DEFAULT_ROW_GROUP_SIZE
 from pytracer.trace.metadata import collect_run_metadata, write_metadata
-from pytracer.trace.writer import TraceWriter
+from pytracer.trace.summary import DEFAULT_SAMPLE_SIZE, DEFAULT_SUMMARY_CACHE_SIZE
+from pytracer.trace.writer import DEFAULT_QUEUE_SIZE, make_trace_writer
 
 
-def run_from_spec(spec: dict) -> int:
+def run_from_spec(spec: dict, targets: ResolutionReport | None = None) -> int:
+    """Trace one run; *targets* are pre-resolved by the fork-server zygote."""
     run_dir = Path(spec["run_dir"])
     run_dir.mkdir(parents=True, exist_ok=True)
     script = spec["script"]
@@ -38,8 +45,20 @@ def run_from_spec(spec: dict) -> int:
         run_id=spec["run_id"],
         command=[script, *script_args],
     )
+    if spec.get("cpus"):  # run.pin_cpus
+        try:
+            os.sched_setaffinity(0, spec["cpus"])
+        except (AttributeError, OSError) as e:
+            meta.notes.append(f"CPU pinning failed: {e}")
 
-    writer = TraceWriter(run_dir)
+    writer = make_trace_writer(
+        run_dir,
+        spec.get("capture_format", "jsonl"),
+        mode=spec.get("writer", "sync"),
+        queue_size=spec.get("writer_queue_size", DEFAULT_QUEUE_SIZE),
+        backpressure=spec.get("writer_backpressure", "block"),
+        stream_fd=spec.get("stream_fd"),
+    )
     array_store = make_array_store(
         run_dir,
         spec.get("store_arrays", "never"),
@@ -51,14 +70,23 @@ def run_from_spec(spec: dict) -> int:
         spec["run_id"],
         capture_backtrace=spec.get("capture_backtrace", True),
         mode=spec.get("mode", "summary"),
+        sample_threshold=spec.get("sample_threshold", 1_000_000),
+        sample_size=spec.get("sample_size", DEFAULT_SAMPLE_SIZE),
+        summary_cache=spec.get("summary_cache", DEFAULT_SUMMARY_CACHE_SIZE),
+        summary_cache_validate=spec.get("summary_cache_validate", "exact"),
+        call_sampling=spec.get("call_sampling", "all"),
+        call_sampling_first=spec.get("call_sampling_first", 1000),
+        call_sampling_every=spec.get("call_sampling_every", 100),
         array_store=array_store,
         taint_outputs=instrumentation == "taint",
+        scope=spec.get("scope", "all"),
     )
     set_active_recorder(recorder)
 
     patcher = Patcher(recorder)
+    recorder.patcher = patcher
     if instrumentation in ("hybrid", "patch", "taint"):
-        report = resolve_targets(spec.get("targets", []))
+        report = targets if targets is not None else resolve_targets(spec.get("targets", []))
         meta.unresolved_targets = report.errors
         patcher.patch(report.resolved)
 
@@ -70,6 +98,9 @@ def run_from_spec(spec: dict) -> int:
     else:
         meta.notes.append("monitor tier disabled by configuration")
 
+    if spec.get("launched_at") is not None:
+        meta.startup_s = round(time.time() - spec["launched_at"], 6)
+
     status = 0
     old_argv = sys.argv
     try:
@@ -85,18 +116,23 @@ def run_from_spec(spec: dict) -> int:
         meta.error = traceback.format_exc()
     finally:
         sys.argv = old_argv
+        while recorder.paused:  # a script that exits while paused
+            recorder.resume()
         set_active_recorder(None)
         patcher.unpatch()
         monitor.stop()
-        writer.close()
+        writer.close()  # drains the async writer's buffer
+        meta.capture_stats = {**writer.stats(), **recorder.stats()}
+        recorder.write_call_sampling(run_dir)
+        recorder.write_pauses(run_dir)
+        recorder.write_regions(run_dir)
         meta.exit_code = status
         write_metadata(run_dir / "metadata.json", meta)
-        try:
-            finalize_run(run_dir)
-        except Exception as e:  # parquet is an artifact, not the capture
-            note = f"parquet finalize failed: {type(e).__name__}: {e}"
-            meta.notes.append(note)
-            write_metadata(run_dir / "metadata.json", meta)
+        if spec.get("finalize", True):  # else the orchestrator does (storage.finalize)
+            finalize_run_dir(
+                run_dir,
+                row_group_size=spec.get("parquet_row_group_size", DEFAULT_ROW_GROUP_SIZE),
+            )
     return status
 
 
@@ -0,0 +1,278 @@
+"""Fork-server launcher (``run.start_method = "forkserver"``).
+
+A spawned run pays for interpreter startup, ``import numpy/scipy/sklearn``
+and target resolution on every repetition. In fork-server mode the
+orchestrator starts one zygote per experiment:
+
+    python -m pytracer._forkserver <control fd>
+
+The zygote imports the tracing stack, resolves the experiment's targets
+(which imports the traced libraries), then forks one child per
+repetition. The child installs the run's environment, reseeds the
+``random`` and ``numpy.random`` global generators from OS entropy, and
+calls ``_bootstrap.run_from_spec`` with the pre-resolved targets; patching
+happens in the child, so the zygote itself is never instrumented.
+
+Runs stay process-independent, with one caveat: environment variables a
+library reads when it is loaded (``OMP_NUM_THREADS``, a perturbation
+backend's seed read at load time) keep the zygote's value. ``perturb.env``
+is applied after fork and only reaches code that reads the environment
+later; ``PYTHONHASHSEED`` is likewise fixed for all children.
+
+Control protocol, over a Unix socket pair: length-prefixed JSON messages,
+a run request optionally carrying the stream pipe's write end as
+SCM_RIGHTS ancillary data (the zygote predates the pipe).
+
+    hello   {"targets": [...]}              -> {"ready": true, "preload_s": t}
+    run     {"spec_path": p, "env": {...}}  -> {"spec_path": p, "exit_code": n}
+
+Several runs may be in flight at once (``run.jobs``): the zygote forks as
+requests arrive and answers each as its child is reaped, so replies carry
+the spec path they belong to. Closing the socket shuts the zygote down.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import select
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import TYPE_CHECKING, NoReturn
+
+from pytracer._errors import ExperimentError
+
+if TYPE_CHECKING:
+    from pytracer.instrumentation.patcher import ResolutionReport
+
+_LENGTH = struct.Struct("<I")
+_MAX_FDS = 1
+REAP_INTERVAL = 0.05  # seconds the zygote waits for a request while children run
+
+
+def _send(sock: socket.socket, message: dict, fds: list[int] | None = None) -> None:
+    body = json.dumps(message).encode()
+    data = _LENGTH.pack(len(body)) + body
+    if fds:
+        socket.send_fds(sock, [data], fds)
+    else:
+        sock.sendall(data)
+
+
+def _recv(sock: socket.socket) -> tuple[dict | None, list[int]]:
+    """Return (message, fds); (None, []) once the peer has closed."""
+    header, fds, _flags, _addr = socket.recv_fds(sock, _LENGTH.size, _MAX_FDS)
+    while header and len(header) < _LENGTH.size:
+        more = sock.recv(_LENGTH.size - len(header))
+        if not more:
+            break
+        header += more
+    if len(header) < _LENGTH.size:
+        for fd in fds:
+            os.close(fd)
+        return None, []
+    (length,) = _LENGTH.unpack(header)
+    chunks = []
+    while length:
+        chunk = sock.recv(min(length, 1 << 16))
+        if not chunk:
+            return None, []
+        chunks.append(chunk)
+        length -= len(chunk)
+    return json.loads(b"".join(chunks)), fds
+
+
+def forkserver_supported() -> str | None:
+    """None when fork-server mode can run here, else the reason it cannot."""
+    if not hasattr(os, "fork") or not hasattr(socket, "send_fds"):
+        return "fork() and fd passing are unavailable on this platform"
+    return None
+
+
+class ForkServer:
+    """Orchestrator-side handle on one zygote process.
+
+    ``run`` may be called from several threads at once; a reader thread
+    routes each reply to the caller waiting for it.
+    """
+
+    def __init__(self, targets: list[str], env: dict[str, str], cwd: str):
+        ours, theirs = socket.socketpair()
+        try:
+            self._proc = subprocess.Popen(
+                [sys.executable, "-m", "pytracer._forkserver", str(theirs.fileno())],
+                env=env,
+                cwd=cwd,
+                pass_fds=(theirs.fileno(),),
+            )
+        finally:
+            theirs.close()
+        self._sock = ours
+        self._send_lock = threading.Lock()
+        self._replies = threading.Condition()
+        self._exit_codes: dict[str, int] = {}
+        self._lost: str | None = None
+        self._closed = False
+        _send(ours, {"targets": targets})
+        try:
+            reply, _ = _recv(ours)
+        except OSError:
+            reply = None
+        if reply is None:
+            self.close()
+            raise ExperimentError(f"fork server exited while starting{self._exit_status()}")
+        self.preload_s: float = reply["preload_s"]
+        self._reader = threading.Thread(
+            target=self._read_replies, name="pytracer-forkserver", daemon=True
+        )
+        self._reader.start()
+
+    @property
+    def alive(self) -> bool:
+        return self._lost is None and not self._closed
+
+    def _exit_status(self) -> str:
+        code = self._proc.poll()
+        return f" (exit code {code})" if code is not None else ""
+
+    def _read_replies(self) -> None:
+        while True:
+            try:
+                reply, _ = _recv(self._sock)
+            except OSError:
+                reply = None
+            with self._replies:
+                if reply is None:
+                    self._lost = f"fork server exited{self._exit_status()}"
+                    self._replies.notify_all()
+                    return
+                self._exit_codes[reply["spec_path"]] = reply["exit_code"]
+                self._replies.notify_all()
+
+    def run(self, spec_path: Path, env: dict[str, str], stream_fd: int | None = None) -> int:
+        """Fork one run from the zygote and wait for it; returns its exit code."""
+        key = str(spec_path)
+        try:
+            with self._send_lock:
+                _send(
+                    self._sock,
+                    {"spec_path": key, "env": env},
+                    [stream_fd] if stream_fd is not None else None,
+                )
+        except OSError as e:
+            raise ExperimentError(f"fork server unreachable: {e}") from e
+        with self._replies:
+            while key not in self._exit_codes and self._lost is None:
+                self._replies.wait()
+            if key in self._exit_codes:
+                return self._exit_codes.pop(key)
+            raise ExperimentError(f"{self._lost} while running {spec_path.parent.name}")
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)  # wakes the reader thread
+        except OSError:
+            pass
+        self._sock.close()
+        try:
+            self._proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+
+
+def _reseed() -> None:
+    """Give the child fresh global RNG state (fork copies the zygote's)."""
+    import random
+
+    random.seed()
+    np_random = sys.modules.get("numpy.random")
+    if np_random is not None:
+        np_random.seed()
+
+
+def _run_child(
+    sock: socket.socket, request: dict, fds: list[int], targets: ResolutionReport
+) -> NoReturn:
+    status = 1
+    try:
+        sock.close()
+        os.environ.clear()
+        os.environ.update(request["env"])
+        _reseed()
+        from pytracer._bootstrap import run_from_spec
+
+        spec = json.loads(Path(request["spec_path"]).read_text())
+        if fds:
+            spec["stream_fd"] = fds[0]  # the fd number differs from the orchestrator's
+        status = run_from_spec(spec, targets=targets)
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(status)
+
+
+def serve(fd: int) -> int:
+    sock = socket.socket(fileno=fd)
+    hello, _ = _recv(sock)
+    if hello is None:
+        return 0
+    t0 = time.perf_counter()
+    import pytracer._bootstrap  # noqa: F401  (the tracing stack, before any fork)
+    from pytracer.instrumentation.patcher import resolve_targets
+
+    targets = resolve_targets(hello.get("targets", []))
+    _send(sock, {"ready": True, "preload_s": round(time.perf_counter() - t0, 6)})
+
+    children: dict[int, str] = {}  # pid -> spec path
+    accepting = True
+    while accepting or children:
+        if accepting:
+            timeout = REAP_INTERVAL if children else None
+            if select.select([sock], [], [], timeout)[0]:
+                request, fds = _recv(sock)
+                if request is None:
+                    accepting = False
+                else:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    pid = os.fork()
+                    if pid == 0:
+                        _run_child(sock, request, fds, targets)
+                    for stream_fd in fds:
+                        os.close(stream_fd)  # the child's copy is the only writer now
+                    children[pid] = request["spec_path"]
+        while children:
+            pid, wait_status = os.waitpid(-1, 0 if not accepting else os.WNOHANG)
+            if pid == 0:
+                break
+            spec_path = children.pop(pid, None)
+            if spec_path is None or not accepting:
+                continue
+            reply = {"spec_path": spec_path, "exit_code": os.waitstatus_to_exitcode(wait_status)}
+            _send(sock, reply)
+    return 0
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) != 1:
+        print("usage: python -m pytracer._forkserver <control fd>", file=sys.stderr)
+        return 2
+    return serve(int(argv[0]))
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -2,43 +2,271 @@
 
 from __future__ import annotations
 
+from collections import Counter
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from pytracer.analysis.aggregate import AggregationResult, aggregate, write_aggregation
+from pytracer._errors import PytracerError
+from pytracer.analysis.aggregate import (
+    AggregationResult,
+    aggregate,
+    unconverged_functions,
+    write_aggregation,
+)
 from pytracer.analysis.align import (
     Alignment,
     align,
+    alignment_summary,
+    call_count_divergence,
+    count_divergence_from_counts,
     load_experiment_calls,
+    pause_windows_per_run,
     write_alignment,
 )
 from pytracer.analysis.coverage import build_coverage, write_coverage
+from pytracer.trace.reader import load_run_calls
+
+if TYPE_CHECKING:
+    from pytracer.analysis.incremental import AnalysisState
 
-__all__ = ["analyze_experiment", "Alignment", "AggregationResult"]
+__all__ = [
+    "analyze_experiment",
+    "analyze_incremental",
+    "analyze_columnar",
+    "analyze",
+    "Alignment",
+    "AggregationResult",
+]
+
+ENGINES = ("auto", "records", "columnar")
 
 
 def analyze_experiment(
     experiment_dir: str | Path,
     alignment_mode: str = "callsite",
     target_specs: list[str] | None = None,
+    streamed_calls: dict[str, list] | None = None,
 ) -> tuple[Alignment, AggregationResult, dict]:
     """Full analysis pass over an experiment directory; writes analysis/*."""
-    import json
-
     experiment_dir = Path(experiment_dir)
     if target_specs is None:
-        exp_meta_path = experiment_dir / "experiment.json"
-        target_specs = []
-        if exp_meta_path.is_file():
-            target_specs = json.loads(exp_meta_path.read_text()).get("targets", [])
+        target_specs = _experiment_targets(experiment_dir)
 
-    run_ids, calls_per_run, truncated = load_experiment_calls(experiment_dir)
+    run_ids, calls_per_run, truncated = load_experiment_calls(experiment_dir, streamed_calls)
     alignment = align(run_ids, calls_per_run, mode=alignment_mode, truncated_runs=truncated)
+    run_dirs = [experiment_dir / "runs" / run_id for run_id in run_ids]
+    alignment.count_divergence = call_count_divergence(run_dirs, calls_per_run)
+    alignment.pause_windows = pause_windows_per_run(run_ids, run_dirs)
     write_alignment(experiment_dir, alignment)
 
-    run_dirs = [experiment_dir / "runs" / run_id for run_id in run_ids]
     aggregation = aggregate(alignment, run_dirs=run_dirs)
     write_aggregation(experiment_dir, aggregation)
 
     coverage = build_coverage(experiment_dir, calls_per_run, target_specs)
     write_coverage(experiment_dir, coverage)
     return alignment, aggregation, coverage
+
+
+def _experiment_targets(experiment_dir: Path) -> list[str]:
+    import json
+
+    exp_meta_path = experiment_dir / "experiment.json"
+    if not exp_meta_path.is_file():
+        return []
+    return json.loads(exp_meta_path.read_text()).get("targets", [])
+
+
+def _fold_new_runs(
+    experiment_dir: str | Path,
+    state: AnalysisState | None,
+    alignment_mode: str,
+    streamed_calls: dict[str, list] | None = None,
+) -> AnalysisState:
+    """Fold the experiment's runs not yet in *state* into it; returns a new
+    state when there is none or some of its runs were removed."""
+    from pytracer.analysis.incremental import AnalysisState
+
+    experiment_dir = Path(experiment_dir)
+    runs_dir = experiment_dir / "runs"
+    run_dirs = sorted(p for p in runs_dir.iterdir() if p.is_dir()) if runs_dir.is_dir() else []
+    if not run_dirs:
+        raise PytracerError(f"{experiment_dir}: no runs found")
+    if state is None or not set(state.run_ids) <= {p.name for p in run_dirs}:
+        state = AnalysisState(mode=alignment_mode)  # missing, stale, or runs were removed
+    known = set(state.run_ids)
+    streamed_calls = streamed_calls or {}
+    for run_dir in run_dirs:
+        if run_dir.name in known:
+            continue
+        if run_dir.name in streamed_calls:
+            calls, truncated = streamed_calls[run_dir.name], False
+        else:
+            calls, truncated = load_run_calls(run_dir)
+        state.add_run(run_dir.name, calls, run_dir, truncated)
+    return state
+
+
+def analyze_incremental(
+    experiment_dir: str | Path,
+    alignment_mode: str = "callsite",
+    target_specs: list[str] | None = None,
+    streamed_calls: dict[str, list] | None = None,
+) -> tuple[dict, AggregationResult, dict]:
+    """Fold the runs not yet analyzed into analysis/state.msgpack, then
+    rewrite analysis/* from it (see analysis.incremental).
+
+    Returns (alignment summary, aggregation, coverage). Without a saved
+    state the first call folds every run, which costs one full pass; fuzzy
+    alignment always runs the full analysis.
+    """
+    from pytracer.analysis.incremental import INCREMENTAL_MODES, load_state, save_state
+
+    experiment_dir = Path(experiment_dir)
+    if alignment_mode not in INCREMENTAL_MODES:
+        alignment, aggregation, coverage = analyze_experiment(
+            experiment_dir, alignment_mode, target_specs, streamed_calls
+        )
+        return alignment.summary_dict(), aggregation, coverage
+    if target_specs is None:
+        target_specs = _experiment_targets(experiment_dir)
+
+    state = _fold_new_runs(experiment_dir, load_state(experiment_dir, alignment_mode),
+                          alignment_mode, streamed_calls)
+    if alignment_mode == "strict":
+        state.check_strict()
+    save_state(experiment_dir, state)
+
+    runs_dir = experiment_dir / "runs"
+    state_run_dirs = [runs_dir / run_id for run_id in state.run_ids]
+    summary = state.alignment_summary(
+        count_divergence_from_counts(state_run_dirs, state.recorded_counts()),
+        pause_windows_per_run(state.run_ids, state_run_dirs),
+    )
+    write_alignment(experiment_dir, summary)
+
+    aggregation = state.aggregation()
+    write_aggregation(experiment_dir, aggregation)
+
+    tally = (
+        Counter(state.calls_per_tier),
+        Counter(state.calls_per_region),
+        set(state.traced_functions),
+    )
+    coverage = build_coverage(experiment_dir, [], target_specs, tally=tally)
+    write_coverage(experiment_dir, coverage)
+    return summary, aggregation, coverage
+
+
+def analyze_columnar(
+    experiment_dir: str | Path,
+    alignment_mode: str = "callsite",
+    target_specs: list[str] | None = None,
+    streamed_calls: dict[str, list] | None = None,
+    fallback: bool = True,
+) -> tuple[dict, AggregationResult, dict]:
+    """``analyze_experiment`` computed from the runs' events.parquet with
+    array operations (see analysis.columnar); writes the same analysis/*.
+
+    Returns (alignment summary, aggregation, coverage). Runs the engine
+    cannot handle (fuzzy alignment, stored arrays, runs not finalized,
+    calls received over the pipe transport) go through the record engine
+    when *fallback*, else raise ColumnarUnsupported.
+    """
+    from pytracer.analysis.columnar import ColumnarUnsupported, analyze_runs
+
+    experiment_dir = Path(experiment_dir)
+    runs_dir = experiment_dir / "runs"
+    run_dirs = sorted(p for p in runs_dir.iterdir() if p.is_dir()) if runs_dir.is_dir() else []
+    if not run_dirs:
+        raise PytracerError(f"{experiment_dir}: no runs found")
+    try:
+        if streamed_calls:
+            raise ColumnarUnsupported("calls streamed over the pipe transport")
+        result = analyze_runs(run_dirs, alignment_mode)
+    except ColumnarUnsupported:
+        if not fallback:
+            raise
+        alignment, aggregation, coverage = analyze_experiment(
+            experiment_dir, alignment_mode, target_specs, streamed_calls
+        )
+        return alignment.summary_dict(), aggregation, coverage
+    if target_specs is None:
+        target_specs = _experiment_targets(experiment_dir)
+
+    summary = alignment_summary(
+        mode=alignment_mode,
+        run_ids=result.run_ids,
+        groups=result.groups,
+        truncated_runs=result.truncated_runs,
+        count_divergence=count_divergence_from_counts(run_dirs, result.recorded),
+        pause_windows=pause_windows_per_run(result.run_ids, run_dirs),
+    )
+    write_alignment(experiment_dir, summary)
+    write_aggregation(experiment_dir, result.aggregation)
+    coverage = build_coverage(experiment_dir, [], target_specs, tally=result.tally)
+    write_coverage(experiment_dir, coverage)
+    return summary, result.aggregation, coverage
+
+
+def analyze(
+    experiment_dir: str | Path,
+    alignment_mode: str = "callsite",
+    target_specs: list[str] | None = None,
+    streamed_calls: dict[str, list] | None = None,
+    engine: str = "auto",
+    incremental: bool = False,
+) -> tuple[dict, AggregationResult, dict]:
+    """Analyze with the configured ``analysis.engine`` (or incrementally);
+    returns (alignment summary, aggregation, coverage)."""
+    if incremental:
+        return analyze_incremental(experiment_dir, alignment_mode, target_specs, streamed_calls)
+    if engine == "records":
+        alignment, aggregation, coverage = analyze_experiment(
+            experiment_dir, alignment_mode, target_specs, streamed_calls
+        )
+        return alignment.summary_dict(), aggregation, coverage
+    return analyze_columnar(
+        experiment_dir, alignment_mode, target_specs, streamed_calls, fallback=engine == "auto"
+    )
+
+
+def sig_convergence(
+    experiment_dir: str | Path,
+    max_ci_bits: float,
+    alignment_mode: str = "callsite",
+    streamed_calls: dict[str, list] | None = None,
+    state: AnalysisState | None = None,
+) -> tuple[dict, AnalysisState | None]:
+    """Aggregate the runs so far in memory (nothing is written); returns the
+    wave's record and the analysis state for the next wave.
+
+    Used between waves of an adaptive experiment (``run.adaptive``): each
+    wave folds only its new runs into *state* (see analysis.incremental);
+    fuzzy alignment, which cannot be folded, re-aligns every run. The
+    experiment has converged once ``unconverged`` is empty.
+    """
+    from pytracer.analysis.incremental import INCREMENTAL_MODES
+
+    experiment_dir = Path(experiment_dir)
+    if alignment_mode in INCREMENTAL_MODES:
+        state = _fold_new_runs(experiment_dir, state, alignment_mode, streamed_calls)
+        if alignment_mode == "strict":
+            state.check_strict()
+        n_runs = len(state.run_ids)
+        aggregation = state.aggregation()
+    else:
+        run_ids, calls_per_run, truncated = load_experiment_calls(experiment_dir, streamed_calls)
+        alignment = align(run_ids, calls_per_run, mode=alignment_mode, truncated_runs=truncated)
+        run_dirs = [experiment_dir / "runs" / run_id for run_id in run_ids]
+        n_runs = len(run_ids)
+        aggregation = aggregate(alignment, run_dirs=run_dirs)
+    widths = [
+        r.min_output_sig_ci_bits
+        for r in aggregation.functions
+        if r.min_output_sig_ci_bits is not None
+    ]
+    return {
+        "runs": n_runs,
+        "max_ci_width_bits": max(widths) if widths else None,
+        "unconverged": [r.function for r in unconverged_functions(aggregation, max_ci_bits)],
+    }, state
@@ -10,25 +10,50 @@ Two metric bases, never conflated (plan §3.1):
   arrays stored during capture (``store_arrays``). The real measurement;
   used whenever every run stored the argument's payload.
 
+Under ``trace.mode = "sampled"`` large arrays carry summaries estimated from
+a sample (``NumericSummary.sample_ratio``). Any summary-basis sig computed
+from such a summary is flagged ``sampled`` on its argument and function
+rows: it mixes sampling error into the cross-run spread.
+
 Amplification (plan §3.2): per aligned call,
     amplification = min sig(inputs) − min sig(outputs)
 i.e. how many bits of precision this call destroyed. Functions are ranked
 by amplification first — separating *sources* of instability from victims
 of already-noisy inputs.
+
+Confidence: ``min_output_sig_ci_bits`` is the width of a 95% percentile
+bootstrap interval of ``min_output_sig_bits``. The runs are resampled with
+replacement (``SIG_CI_RESAMPLES`` times, fixed seed) and the function's
+lowest output sig(mean) is recomputed from the resampled per-run means, so
+the interval narrows as the runs themselves agree, and it drives early
+stopping (``run.adaptive``). Element-wise sig keeps no per-run values per
+element to resample; functions on that basis get the normal approximation
+
+    Var(sig) ≈ (1 / (2(n-1)) + 2^(-2 sig) / n) / ln(2)^2
+
+(``sig_ci_width``), which depends only on sig and n.
 """
 
 from __future__ import annotations
 
+import itertools
 import json
 import math
 from dataclasses import asdict, dataclass, field
+from operator import attrgetter
 from pathlib import Path
 
+import numpy as np
+
 from pytracer.analysis.align import Alignment
 from pytracer.analysis.elementwise import elementwise_sig, stack_arrays
 from pytracer.storage.arrays import load_array
+from pytracer.trace.event import NumericSummary
 
 SIG_CAP_BITS = 53.0  # float64 mantissa; "std == 0" means indistinguishable-from-exact
+SIG_CI_Z = 1.96  # 95% two-sided
+SIG_CI_RESAMPLES = 200  # bootstrap replicates of min_output_sig_bits
+_BOOTSTRAP_FIRST_ROWS = 8  # per function, resampled first to bound its lowest sig
 
 
 def sig_bits(values: list[float]) -> float | None:
@@ -38,8 +63,12 @@ def sig_bits(values: list[float]) -> float | None:
         return None
     n = len(clean)
     mean = sum(clean) / n
-    var = sum((v - mean) ** 2 for v in clean) / n
-    std = math.sqrt(var)
+    var = sum((v - mean) * (v - mean) for v in clean) / n
+    return sig_from_moments(mean, math.sqrt(var))
+
+
+def sig_from_moments(mean: float, std: float) -> float:
+    """-log2(std/|mean|) clipped to [0, SIG_CAP_BITS]."""
     if std == 0.0:
         return SIG_CAP_BITS
     if mean == 0.0:
@@ -47,6 +76,159 @@ def sig_bits(values: list[float]) -> float | None:
     return max(0.0, min(SIG_CAP_BITS, -math.log2(std / abs(mean))))
 
 
+def sig_from_moments_array(mean: np.ndarray, std: np.ndarray) -> np.ndarray:
+    """``sig_from_moments`` of every element, same special cases."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sig = np.clip(-np.log2(std / np.abs(mean)), 0.0, SIG_CAP_BITS)
+    return np.where(std == 0.0, SIG_CAP_BITS, np.where(mean == 0.0, 0.0, sig))
+
+
+def _compensated_sum(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Per row, the float ``sum()`` of the masked values in column order,
+    compensated exactly as CPython (>= 3.12) does it."""
+    total = np.zeros(len(values))
+    compensation = np.zeros(len(values))
+    with np.errstate(invalid="ignore", over="ignore"):
+        for j in range(values.shape[1]):
+            x, use = values[:, j], mask[:, j]
+            t = total + x
+            c = np.where(np.abs(total) >= np.abs(x), (total - t) + x, (x - t) + total)
+            compensation = np.where(use, compensation + c, compensation)
+            total = np.where(use, t, total)
+        fix = (compensation != 0) & np.isfinite(compensation)
+        return np.where(fix, total + compensation, total)
+
+
+def _segment_sums(values: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    """The float ``sum()`` of every segment of *values* between consecutive
+    *bounds*: the same compensated summation as ``_compensated_sum``, one C
+    loop per segment, so long segments cost no Python-level iterations."""
+    edges = bounds.tolist()
+    return np.array(
+        [sum(values[a:b].tolist()) for a, b in itertools.pairwise(edges)], dtype=np.float64
+    )
+
+
+def sig_bits_matrix(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """``sig_bits`` of every row of an (n, n_runs) matrix at once (NaN where
+    fewer than two values are finite), and the mean of each row's finite
+    values (NaN where none is)."""
+    finite = np.isfinite(values)
+    n = finite.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = _compensated_sum(values, finite) / n
+        deviation = values - mean[:, None]
+        std = np.sqrt(_compensated_sum(deviation * deviation, finite) / n)
+        sig = sig_from_moments_array(mean, std)
+    return np.where(n >= 2, sig, np.nan), mean
+
+
+def sig_ci_width(sig: float | None, n_runs: int) -> float | None:
+    """Width (bits) of the 95% confidence interval of *sig* over *n_runs* runs."""
+    if sig is None or n_runs < 2:
+        return None
+    if sig >= SIG_CAP_BITS:
+        return 0.0  # every run agreed exactly
+    var = 1.0 / (2 * (n_runs - 1)) + 2.0 ** (-2 * sig) / n_runs
+    return 2 * SIG_CI_Z * math.sqrt(var) / math.log(2)
+
+
+def _resampled_sig(
+    first: np.ndarray, present: np.ndarray, diff: np.ndarray, weights: np.ndarray
+) -> np.ndarray:
+    """``sig_bits`` of each row drawn ``weights[j]`` times from run j, from
+    its (n_runs, rows) differences to its *first* finite mean (0 where
+    absent, *present* 0 too). Two-pass, so equal draws give 53 bits."""
+    count = np.zeros(len(first))
+    total = np.zeros(len(first))
+    for w, p, d in zip(weights, present, diff, strict=True):
+        count += w * p
+        total += w * d
+    with np.errstate(invalid="ignore", divide="ignore"):
+        shift = total / count
+        total_sq = np.zeros(len(first))
+        for w, p, d in zip(weights, present, diff, strict=True):
+            deviation = d - shift
+            total_sq += (w * p) * (deviation * deviation)
+        sig = sig_from_moments_array(first + shift, np.sqrt(total_sq / count))
+    return np.where(count >= 2, sig, np.nan)
+
+
+def bootstrap_ci_widths(runs: np.ndarray, function: np.ndarray, n_functions: int) -> np.ndarray:
+    """Width (bits) of the 95% bootstrap interval of each function's lowest
+    ``sig_bits`` over the rows of *runs*, an (n, n_runs) matrix of per-run
+    means with the function of each row in *function*. NaN where undefined.
+
+    A replicate draws every run a multinomial number of times, the same for
+    all rows. A row's sig in any replicate is at least a bound from its
+    range (a resampled std is at most half of it), so within a function,
+    rows in bound order are resampled only while their bound is below the
+    lowest sig found so far: most rows of a function are never touched.
+    """
+    widths = np.full(n_functions, np.nan)
+    n, n_runs = runs.shape
+    if not n or n_runs < 2:
+        return widths
+    finite = np.isfinite(runs)
+    with np.errstate(invalid="ignore", over="ignore"):
+        lo = np.where(finite, runs, np.inf).min(axis=1)
+        hi = np.where(finite, runs, -np.inf).max(axis=1)
+        same_sign = (lo > 0) | (hi < 0)
+        magnitude = np.where(same_sign, np.minimum(np.abs(lo), np.abs(hi)), 0.0)
+        bound = sig_from_moments_array(magnitude, (hi - lo) / 2)
+    bound[finite.sum(axis=1) < 2] = np.inf  # never defined: nothing to resample
+
+    order = np.lexsort((bound, function))
+    function, bound, finite, runs = function[order], bound[order], finite[order], runs[order]
+    edges = _segments(function)
+    starts, ends = edges[:-1], edges[1:]
+    first = runs[np.arange(n), finite.argmax(axis=1)]
+    with np.errstate(invalid="ignore"):
+        diff = np.where(finite, runs - first[:, None], 0.0).T.copy()  # (n_runs, n)
+    present = finite.T.astype(np.float64)
+    # per segment, the rows in bound order: key = segment + bound / 64, increasing
+    segment = np.repeat(np.arange(len(starts)), ends - starts)
+    key = segment + np.minimum(bound, SIG_CAP_BITS + 1) / 64
+
+    rng = np.random.default_rng(0)  # the same runs always give the same widths
+    draws = rng.multinomial(n_runs, np.full(n_runs, 1 / n_runs), size=SIG_CI_RESAMPLES)
+    lowest = np.full((SIG_CI_RESAMPLES, len(starts)), np.nan)
+    for b, weights in enumerate(draws.astype(np.float64)):
+        drawn = np.flatnonzero(weights)
+        if len(drawn) == 1:  # one run drawn n_runs times: exact agreement
+            has = np.logical_or.reduceat(finite[:, drawn[0]], starts)
+            lowest[b, has] = SIG_CAP_BITS
+            continue
+        begin = starts
+        for limit in (np.minimum(starts + _BOOTSTRAP_FIRST_ROWS, ends), None):
+            if limit is None:  # the rest: rows whose bound is below the lowest sig so far
+                below = np.where(np.isnan(lowest[b]), SIG_CAP_BITS + 1, lowest[b]) + 1e-6
+                limit = np.searchsorted(key, np.arange(len(starts)) + below / 64)
+            counts = np.maximum(limit - begin, 0)
+            taken = counts > 0
+            if taken.any():
+                offsets = np.cumsum(counts) - counts
+                rows = np.arange(counts.sum()) + np.repeat(begin - offsets, counts)
+                sig = _resampled_sig(first[rows], present[:, rows], diff[:, rows], weights)
+                found = np.fmin.reduceat(sig, offsets[taken])
+                lowest[b, taken] = np.fmin(lowest[b, taken], found)
+            begin = np.maximum(begin, limit)
+    defined = ~np.isnan(lowest).all(axis=0)
+    low, high = np.nanpercentile(lowest[:, defined], [2.5, 97.5], axis=0)
+    widths[function[starts][defined]] = high - low
+    return widths
+
+
+def _ci_width(
+    min_sig: float | None, bootstrap: float, element_based: bool, n_runs: int
+) -> float | None:
+    """A function's ``min_output_sig_ci_bits``: the bootstrap width, or the
+    normal approximation on the element basis."""
+    if min_sig is None or element_based or math.isnan(bootstrap):
+        return sig_ci_width(min_sig, n_runs)
+    return bootstrap
+
+
 @dataclass(slots=True)
 class ArgumentRow:
     function: str
@@ -63,6 +245,7 @@ class ArgumentRow:
     std_of_means: float | None = None
     nan_instability: bool = False
     inf_instability: bool = False
+    sampled: bool = False  # sig_mean_bits derived from sampled summaries
 
 
 @dataclass(slots=True)
@@ -79,6 +262,9 @@ class FunctionRow:
     inf_instability: bool
     sig_basis: str = "summary"
     tiers: list[str] = field(default_factory=list)
+    sampled: bool = False  # some output/amplification sig came from sampled summaries
+    regions: list[str] = field(default_factory=list)  # pytracer.region paths it ran in
+    min_output_sig_ci_bits: float | None = None  # 95% CI width of min_output_sig_bits
 
 
 def _median(values: list[float]) -> float | None:
@@ -137,14 +323,42 @@ def _element_sig_for_arg(
     return elementwise_sig(stack)
 
 
-def aggregate(alignment: Alignment, run_dirs: list[Path] | None = None) -> AggregationResult:
-    n_runs = len(alignment.run_ids)
-    per_function: dict[str, dict] = {}
-    per_argument: dict[tuple[str, str, str], dict] = {}
+@dataclass(slots=True)
+class ArgObservation:
+    """One argument of one complete aligned group, reduced across runs."""
 
-    for group in alignment.groups:
-        function = group.function
-        f = per_function.setdefault(
+    phase: str  # "input" | "output"
+    arg_name: str
+    proxy_sig: float | None  # sig(mean)
+    element: dict | None  # elementwise_sig distribution, when every run stored it
+    sampled: bool
+    nan_varies: bool
+    inf_varies: bool
+    mean: float | None  # mean of the finite per-run means
+    run_means: list[float] | None = None  # per run, NaN when absent: for the bootstrap
+
+
+class GroupAccumulator:
+    """Fold aligned groups into function and argument rows, one at a time.
+
+    The incremental analysis (groups of running moments, see
+    analysis.incremental) builds its rows this way; ``aggregate`` reduces
+    all groups at once with ``reduce_observations``, under the same rules.
+    """
+
+    def __init__(self) -> None:
+        self._functions: dict[str, dict] = {}
+        self._arguments: dict[tuple[str, str, str], dict] = {}
+
+    def add_group(
+        self,
+        function: str,
+        complete: bool,
+        tiers: set[str] | list[str] | None = None,
+        regions: set[str] | list[str] | None = None,
+        observations: list[ArgObservation] | None = None,
+    ) -> None:
+        f = self._functions.setdefault(
             function,
             {
                 "groups": 0,
@@ -155,124 +369,458 @@ def aggregate(alignment: Alignment, run_dirs: list[Path] | None = None) -> Aggre
                 "inf": False,
                 "tiers": set(),
                 "element_based": False,
+                "sampled": False,
+                "regions": set(),
+                "run_means": [],  # of its summary-basis outputs
             },
         )
         f["groups"] += 1
-        if not group.complete:
-            continue
+        if not complete:
+            return
         f["matched"] += 1
-        calls = [c for c in group.calls if c is not None]
-        f["tiers"].update(c.tier for c in calls)
+        f["tiers"].update(tiers or ())
+        f["regions"].update(regions or ())
 
         input_sigs: list[float] = []
         output_sigs: list[float] = []
-        for phase, get_args in (("input", lambda c: c.inputs), ("output", lambda c: c.outputs)):
-            arg_names = set()
-            for c in calls:
-                arg_names.update(get_args(c))
-            for arg_name in arg_names:
-                summaries = [get_args(c).get(arg_name) for c in calls]
-                if any(s is None for s in summaries):
-                    continue
-                means = [s.mean for s in summaries]
-                proxy_sig = sig_bits(means)
-                element = _element_sig_for_arg(calls, phase, arg_name, run_dirs)
-                sig = element["min"] if element is not None else proxy_sig
-                if element is not None:
-                    f["element_based"] = True
-
-                nan_var = len({s.nan_count for s in summaries}) > 1
-                inf_var = len({s.inf_count for s in summaries}) > 1
-                f["nan"] |= nan_var
-                f["inf"] |= inf_var
-                if sig is not None:
-                    (input_sigs if phase == "input" else output_sigs).append(sig)
-
-                a = per_argument.setdefault(
-                    (function, arg_name, phase),
-                    {
-                        "groups": 0,
-                        "sigs": [],
-                        "proxy_sigs": [],
-                        "p05s": [],
-                        "medians": [],
-                        "means": [],
-                        "basis": "summary",
-                        "nan": False,
-                        "inf": False,
-                    },
-                )
-                a["groups"] += 1
-                if sig is not None:
-                    a["sigs"].append(sig)
-                if proxy_sig is not None:
-                    a["proxy_sigs"].append(proxy_sig)
-                if element is not None:
-                    a["basis"] = "element"
-                    a["p05s"].append(element["p05"])
-                    a["medians"].append(element["median"])
-                clean = [m for m in means if m is not None and math.isfinite(m)]
-                if clean:
-                    a["means"].append(sum(clean) / len(clean))
-                a["nan"] |= nan_var
-                a["inf"] |= inf_var
+        for obs in observations or ():
+            element = obs.element
+            sig = element["min"] if element is not None else obs.proxy_sig
+            if element is not None:
+                f["element_based"] = True
+            if element is None and obs.sampled and obs.proxy_sig is not None:
+                f["sampled"] = True
+            f["nan"] |= obs.nan_varies
+            f["inf"] |= obs.inf_varies
+            if sig is not None:
+                (input_sigs if obs.phase == "input" else output_sigs).append(sig)
+            if obs.phase == "output" and element is None and obs.run_means is not None:
+                f["run_means"].append(obs.run_means)
+
+            a = self._arguments.setdefault(
+                (function, obs.arg_name, obs.phase),
+                {
+                    "groups": 0,
+                    "sigs": [],
+                    "proxy_sigs": [],
+                    "p05s": [],
+                    "medians": [],
+                    "means": [],
+                    "basis": "summary",
+                    "nan": False,
+                    "inf": False,
+                    "sampled": False,
+                },
+            )
+            a["groups"] += 1
+            if sig is not None:
+                a["sigs"].append(sig)
+            if obs.proxy_sig is not None:
+                a["proxy_sigs"].append(obs.proxy_sig)
+                a["sampled"] |= obs.sampled
+            if element is not None:
+                a["basis"] = "element"
+                a["p05s"].append(element["p05"])
+                a["medians"].append(element["median"])
+            if obs.mean is not None:
+                a["means"].append(obs.mean)
+            a["nan"] |= obs.nan_varies
+            a["inf"] |= obs.inf_varies
 
         if output_sigs:
             f["output_sigs"].append(min(output_sigs))
             if input_sigs:
                 f["amplifications"].append(min(input_sigs) - min(output_sigs))
 
+    def result(self, n_runs: int) -> AggregationResult:
+        functions = sorted(self._functions.items())
+        run_means = [means for _, f in functions for means in f["run_means"]]
+        widths = bootstrap_ci_widths(
+            np.array(run_means, dtype=np.float64).reshape(len(run_means), n_runs),
+            np.repeat(np.arange(len(functions)), [len(f["run_means"]) for _, f in functions]),
+            len(functions),
+        )
+        function_rows = []
+        for k, (function, f) in enumerate(functions):
+            amps = f["amplifications"]
+            min_sig = min(f["output_sigs"]) if f["output_sigs"] else None
+            function_rows.append(
+                FunctionRow(
+                    function=function,
+                    n_call_groups=f["groups"],
+                    n_matched=f["matched"],
+                    divergence_score=(f["groups"] - f["matched"]) / f["groups"],
+                    min_output_sig_bits=min_sig,
+                    median_output_sig_bits=_median(f["output_sigs"]),
+                    max_amplification_bits=max(amps) if amps else None,
+                    mean_amplification_bits=(sum(amps) / len(amps)) if amps else None,
+                    nan_instability=f["nan"],
+                    inf_instability=f["inf"],
+                    sig_basis="element" if f["element_based"] else "summary",
+                    tiers=sorted(f["tiers"]),
+                    sampled=f["sampled"],
+                    regions=sorted(f["regions"]),
+                    min_output_sig_ci_bits=_ci_width(
+                        min_sig, widths[k].item(), f["element_based"], n_runs
+                    ),
+                )
+            )
+
+        argument_rows = []
+        for (function, arg_name, phase), a in sorted(self._arguments.items()):
+            mom = sum(a["means"]) / len(a["means"]) if a["means"] else None
+            if a["means"] and len(a["means"]) > 1:
+                mu = mom
+                som = math.sqrt(sum((m - mu) * (m - mu) for m in a["means"]) / len(a["means"]))
+            else:
+                som = None
+            is_element = a["basis"] == "element"
+            argument_rows.append(
+                ArgumentRow(
+                    function=function,
+                    arg_name=arg_name,
+                    phase=phase,
+                    n_runs=n_runs,
+                    n_call_groups=a["groups"],
+                    sig_basis=a["basis"],
+                    sig_mean_bits=min(a["proxy_sigs"]) if a["proxy_sigs"] else None,
+                    sig_min_bits=min(a["sigs"]) if is_element and a["sigs"] else None,
+                    sig_p05_bits=min(a["p05s"]) if is_element and a["p05s"] else None,
+                    sig_median_bits=_median(a["medians"]) if is_element else None,
+                    mean_of_means=mom,
+                    std_of_means=som,
+                    nan_instability=a["nan"],
+                    inf_instability=a["inf"],
+                    sampled=a["sampled"],
+                )
+            )
+
+        return AggregationResult(functions=function_rows, arguments=argument_rows)
+
+
+def _segments(*columns: np.ndarray) -> np.ndarray:
+    """Start of every run of equal tuples in already sorted *columns*, plus the end."""
+    n = len(columns[0])
+    change = np.zeros(n, dtype=bool)
+    if n:
+        change[0] = True
+        for column in columns:
+            change[1:] |= column[1:] != column[:-1]
+    return np.append(np.flatnonzero(change), n)
+
+
+def _segment_medians(segment: np.ndarray, values: np.ndarray, n: int) -> np.ndarray:
+    """``_median`` of the *values* of each of *n* segments (NaN when empty)."""
+    order = np.lexsort((values, segment))
+    values = values[order]
+    counts = np.bincount(segment, minlength=n)
+    starts = np.cumsum(counts) - counts
+    medians = np.full(n, np.nan)
+    have = counts > 0
+    start, count = starts[have], counts[have]
+    low, high = values[start + (count - 1) // 2], values[start + count // 2]
+    medians[have] = np.where(count % 2, high, (low + high) / 2)
+    return medians
+
+
+def _scatter(n: int, index: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """*values* at *index* of a length-*n* array, NaN elsewhere."""
+    out = np.full(n, np.nan)
+    out[index] = values
+    return out
+
+
+def _optional(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+@dataclass(slots=True)
+class Observations:
+    """Every observation of an alignment as parallel arrays, in (group, phase)
+    order. An observation is one argument summarized in all runs of a
+    complete group, reduced across runs; absent floats are NaN."""
+
+    group: np.ndarray  # index of the group, in alignment order
+    phase: np.ndarray  # 0 input, 1 output
+    name: np.ndarray  # code of the argument name
+    proxy: np.ndarray  # sig(mean)
+    mean: np.ndarray  # mean of the finite per-run means
+    sampled: np.ndarray
+    nan_varies: np.ndarray
+    inf_varies: np.ndarray
+    element: np.ndarray  # (n, 3): element-wise sig min, p05, median
+    runs: np.ndarray  # (n, n_runs): the per-run means
+
+
+def observations(
+    group: np.ndarray,
+    phase: np.ndarray,
+    name: np.ndarray,
+    means: np.ndarray,
+    nans: np.ndarray,
+    infs: np.ndarray,
+    sampled: np.ndarray,
+    element: np.ndarray | None = None,
+) -> Observations:
+    """Reduce (observations x runs) matrices of per-run means and NaN/Inf
+    counts to Observations in one pass."""
+    if element is None:
+        element = np.full((len(group), 3), np.nan)
+    if not len(group):
+        empty = np.zeros(0, dtype=bool)
+        return Observations(
+            group, phase, name, np.zeros(0), np.zeros(0), empty, empty, empty, element, means
+        )
+    proxy, mean = sig_bits_matrix(means)
+    return Observations(
+        group=group,
+        phase=phase,
+        name=name,
+        proxy=proxy,
+        mean=mean,
+        sampled=sampled,
+        nan_varies=nans.min(axis=1) != nans.max(axis=1),
+        inf_varies=infs.min(axis=1) != infs.max(axis=1),
+        element=element,
+        runs=means,
+    )
+
+
+def reduce_observations(
+    obs: Observations,
+    n_runs: int,
+    function_names: list[str],
+    group_function: np.ndarray,
+    complete: np.ndarray,
+    function_tiers: dict[int, set[str]],
+    function_regions: dict[int, set[str]],
+    arg_names: list,
+) -> AggregationResult:
+    """Function and argument rows from *obs* by segment reductions.
+
+    Shared by both engines: the observations are sorted into (group, phase),
+    (function) and (function, argument, phase) segments, each reduced at
+    once with ``np.fmin.reduceat`` and friends. Same rules as
+    ``GroupAccumulator``: an argument's sig is its element-wise minimum when
+    every run stored it, else sig(mean).
+    """
+    n_groups = len(group_function)
+    n_functions = len(function_names)
+    groups = np.bincount(group_function, minlength=n_functions)
+    matched = np.bincount(group_function[complete], minlength=n_functions)
+    has_element = ~np.isnan(obs.element[:, 0])
+    has_proxy = ~np.isnan(obs.proxy)
+    sig = np.where(has_element, obs.element[:, 0], obs.proxy)
+    obs_function = group_function[obs.group]
+
+    # per group: lowest input and output sig
+    bounds = _segments(obs.group, obs.phase)
+    starts = bounds[:-1]
+    lowest = np.fmin.reduceat(sig, starts) if len(sig) else sig
+    side_min = []
+    for phase in (0, 1):
+        at = obs.phase[starts] == phase
+        side_min.append(_scatter(n_groups, obs.group[starts[at]], lowest[at]))
+    input_min, output_min = side_min
+
+    # per function, over its groups in alignment order
+    with_output = np.flatnonzero(~np.isnan(output_min))
+    with_output = with_output[np.argsort(group_function[with_output], kind="stable")]
+    out_function, out_sigs = group_function[with_output], output_min[with_output]
+    out_starts = _segments(out_function)[:-1]
+    if len(out_sigs):
+        min_output = _scatter(
+            n_functions, out_function[out_starts], np.minimum.reduceat(out_sigs, out_starts)
+        )
+    else:
+        min_output = np.full(n_functions, np.nan)
+    median_output = _segment_medians(out_function, out_sigs, n_functions)
+    with_both = with_output[~np.isnan(input_min[with_output])]
+    amps = input_min[with_both] - output_min[with_both]
+    amp_function = group_function[with_both]
+    amp_bounds = _segments(amp_function)
+    amp_starts, amp_counts = amp_bounds[:-1], np.diff(amp_bounds)
+    amp_at = amp_function[amp_starts]
+    if len(amps):
+        max_amp = _scatter(n_functions, amp_at, np.maximum.reduceat(amps, amp_starts))
+        mean_amp = _scatter(n_functions, amp_at, _segment_sums(amps, amp_bounds) / amp_counts)
+    else:
+        max_amp = mean_amp = np.full(n_functions, np.nan)
+
+    def any_per_function(mask: np.ndarray) -> np.ndarray:
+        flags = np.zeros(n_functions, dtype=bool)
+        flags[obs_function[mask]] = True
+        return flags
+
+    nan = any_per_function(obs.nan_varies)
+    inf = any_per_function(obs.inf_varies)
+    element_based = any_per_function(has_element)
+    sampled = any_per_function(obs.sampled & has_proxy & ~has_element)
+    resampled = (obs.phase == 1) & ~has_element
+    widths = bootstrap_ci_widths(obs.runs[resampled], obs_function[resampled], n_functions)
+
     function_rows = []
-    for function, f in sorted(per_function.items()):
-        amps = f["amplifications"]
+    for f in sorted(np.flatnonzero(groups).tolist(), key=function_names.__getitem__):
+        min_sig = _optional(min_output[f].item())
         function_rows.append(
             FunctionRow(
-                function=function,
-                n_call_groups=f["groups"],
-                n_matched=f["matched"],
-                divergence_score=(f["groups"] - f["matched"]) / f["groups"],
-                min_output_sig_bits=min(f["output_sigs"]) if f["output_sigs"] else None,
-                median_output_sig_bits=_median(f["output_sigs"]),
-                max_amplification_bits=max(amps) if amps else None,
-                mean_amplification_bits=(sum(amps) / len(amps)) if amps else None,
-                nan_instability=f["nan"],
-                inf_instability=f["inf"],
-                sig_basis="element" if f["element_based"] else "summary",
-                tiers=sorted(f["tiers"]),
+                function=function_names[f],
+                n_call_groups=int(groups[f]),
+                n_matched=int(matched[f]),
+                divergence_score=int(groups[f] - matched[f]) / int(groups[f]),
+                min_output_sig_bits=min_sig,
+                median_output_sig_bits=_optional(median_output[f].item()),
+                max_amplification_bits=_optional(max_amp[f].item()),
+                mean_amplification_bits=_optional(mean_amp[f].item()),
+                nan_instability=bool(nan[f]),
+                inf_instability=bool(inf[f]),
+                sig_basis="element" if element_based[f] else "summary",
+                tiers=sorted(function_tiers.get(f, ())),
+                sampled=bool(sampled[f]),
+                regions=sorted(function_regions.get(f, ())),
+                min_output_sig_ci_bits=_ci_width(
+                    min_sig, widths[f].item(), bool(element_based[f]), n_runs
+                ),
             )
         )
 
+    # per (function, argument, phase), over its groups in alignment order
+    order = np.lexsort((obs.group, obs.phase, obs.name, obs_function))
+    bounds = _segments(obs_function[order], obs.name[order], obs.phase[order])
+    starts, counts = bounds[:-1], np.diff(bounds)
+    n_args = len(starts)
+    segment = np.repeat(np.arange(n_args), counts)
+    first = order[starts]
+
+    def reduce(ufunc, values: np.ndarray) -> np.ndarray:
+        return ufunc.reduceat(values[order], starts) if n_args else values[:0]
+
+    element_arg = reduce(np.logical_or, has_element)
+    proxy_min = reduce(np.fmin, obs.proxy)
+    sig_min = reduce(np.fmin, sig)
+    p05_min = reduce(np.fmin, obs.element[:, 1])
+    medians = obs.element[order, 2]
+    keep = ~np.isnan(medians)
+    median_of_medians = _segment_medians(segment[keep], medians[keep], n_args)
+    means = obs.mean[order]
+    has_mean = ~np.isnan(means)
+    means = means[has_mean]
+    mean_bounds = np.searchsorted(np.flatnonzero(has_mean), bounds)
+    n_means = np.diff(mean_bounds)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mom = _segment_sums(means, mean_bounds) / n_means
+        deviation = means - np.repeat(mom, n_means)
+        som = np.sqrt(_segment_sums(deviation * deviation, mean_bounds) / n_means)
+    arg_nan = reduce(np.logical_or, obs.nan_varies)
+    arg_inf = reduce(np.logical_or, obs.inf_varies)
+    arg_sampled = reduce(np.logical_or, obs.sampled & has_proxy)
+
     argument_rows = []
-    for (function, arg_name, phase), a in sorted(per_argument.items()):
-        mom = sum(a["means"]) / len(a["means"]) if a["means"] else None
-        if a["means"] and len(a["means"]) > 1:
-            mu = mom
-            som = math.sqrt(sum((m - mu) ** 2 for m in a["means"]) / len(a["means"]))
-        else:
-            som = None
-        is_element = a["basis"] == "element"
+    for k, row in enumerate(first.tolist()):
+        is_element = bool(element_arg[k])
         argument_rows.append(
             ArgumentRow(
-                function=function,
-                arg_name=arg_name,
-                phase=phase,
+                function=function_names[obs_function[row]],
+                arg_name=arg_names[obs.name[row]],
+                phase="output" if obs.phase[row] else "input",
                 n_runs=n_runs,
-                n_call_groups=a["groups"],
-                sig_basis=a["basis"],
-                sig_mean_bits=min(a["proxy_sigs"]) if a["proxy_sigs"] else None,
-                sig_min_bits=min(a["sigs"]) if is_element and a["sigs"] else None,
-                sig_p05_bits=min(a["p05s"]) if is_element and a["p05s"] else None,
-                sig_median_bits=_median(a["medians"]) if is_element else None,
-                mean_of_means=mom,
-                std_of_means=som,
-                nan_instability=a["nan"],
-                inf_instability=a["inf"],
+                n_call_groups=int(counts[k]),
+                sig_basis="element" if is_element else "summary",
+                sig_mean_bits=_optional(proxy_min[k].item()),
+                sig_min_bits=_optional(sig_min[k].item()) if is_element else None,
+                sig_p05_bits=_optional(p05_min[k].item()) if is_element else None,
+                sig_median_bits=_optional(median_of_medians[k].item()) if is_element else None,
+                mean_of_means=_optional(mom[k].item()) if n_means[k] else None,
+                std_of_means=som[k].item() if n_means[k] > 1 else None,
+                nan_instability=bool(arg_nan[k]),
+                inf_instability=bool(arg_inf[k]),
+                sampled=bool(arg_sampled[k]),
             )
         )
-
+    argument_rows.sort(key=lambda r: (r.function, r.arg_name, r.phase))
     return AggregationResult(functions=function_rows, arguments=argument_rows)
 
 
+def aggregate(alignment: Alignment, run_dirs: list[Path] | None = None) -> AggregationResult:
+    """Gather the per-run summaries of every observation into (observations x
+    runs) matrices, then reduce them with ``reduce_observations``."""
+    n_runs = len(alignment.run_ids)
+    functions: dict[str, int] = {}
+    names: dict[str, int] = {}
+    group_function: list[int] = []
+    complete: list[bool] = []
+    function_tiers: dict[int, set[str]] = {}
+    function_regions: dict[int, set[str]] = {}
+    obs_group: list[int] = []
+    obs_phase: list[int] = []
+    obs_name: list[int] = []
+    summaries: list[NumericSummary | None] = []  # none is None: checked per observation
+    elements: list[tuple[float, float, float]] = []
+    for g, group in enumerate(alignment.groups):
+        f = functions.setdefault(group.function, len(functions))
+        group_function.append(f)
+        done = group.complete
+        complete.append(done)
+        if not done:
+            continue
+        calls = [c for c in group.calls if c is not None]
+        function_tiers.setdefault(f, set()).update(c.tier for c in calls)
+        regions = function_regions.setdefault(f, set())
+        regions.update(c.region for c in calls if c.region is not None)
+        for phase, sides in enumerate(([c.inputs for c in calls], [c.outputs for c in calls])):
+            for arg_name in sides[0]:  # an observation needs the argument in every run
+                run_summaries = [side.get(arg_name) for side in sides]
+                if None in run_summaries:
+                    continue
+                obs_group.append(g)
+                obs_phase.append(phase)
+                obs_name.append(names.setdefault(arg_name, len(names)))
+                summaries += run_summaries
+                if run_dirs is not None:
+                    element = _element_sig_for_arg(
+                        calls, "output" if phase else "input", arg_name, run_dirs
+                    )
+                    if element is not None:
+                        elements.append((element["min"], element["p05"], element["median"]))
+                        continue
+                elements.append((math.nan, math.nan, math.nan))
+
+    def per_run(field: str) -> np.ndarray:
+        values = list(map(attrgetter(field), summaries))
+        return np.array(values, dtype=np.float64).reshape(len(obs_group), n_runs)
+
+    obs = observations(
+        group=np.array(obs_group, dtype=np.int64),
+        phase=np.array(obs_phase, dtype=np.int64),
+        name=np.array(obs_name, dtype=np.int64),
+        means=per_run("mean"),
+        nans=per_run("nan_count"),
+        infs=per_run("inf_count"),
+        sampled=~np.isnan(per_run("sample_ratio")).all(axis=1),
+        element=None if run_dirs is None else np.array(elements, dtype=np.float64).reshape(-1, 3),
+    )
+    return reduce_observations(
+        obs,
+        n_runs,
+        function_names=list(functions),
+        group_function=np.array(group_function, dtype=np.int64),
+        complete=np.array(complete, dtype=bool),
+        function_tiers=function_tiers,
+        function_regions=function_regions,
+        arg_names=list(names),
+    )
+
+
+def unconverged_functions(result: AggregationResult, max_ci_bits: float) -> list[FunctionRow]:
+    """Functions whose min_output_sig_bits interval is still wider than *max_ci_bits*."""
+    return [
+        r
+        for r in result.functions
+        if r.min_output_sig_bits is not None
+        and (r.min_output_sig_ci_bits is None or r.min_output_sig_ci_bits > max_ci_bits)
+    ]
+
+
 def write_aggregation(experiment_dir: str | Path, result: AggregationResult) -> None:
     analysis_dir = Path(experiment_dir) / "analysis"
     analysis_dir.mkdir(exist_ok=True)
@@ -5,6 +5,15 @@ matched across runs by callsite key: (module, qualname, ufunc_method,
 source file, source line, occurrence). Occurrence is a deterministic
 per-callsite counter, so identical control flow aligns exactly.
 
+Calls enter alignment in program order (``reader.program_order``): by the
+timestamp of their first event, ties broken by event id. Event ids alone
+are only ordered within a thread, since each thread allocates them in
+blocks; captures without timestamps fall back to them.
+
+Internally each distinct callsite gets an experiment-wide integer index
+(resolved once per run-local callsite id, not once per call), and calls are
+matched on ``(site index, occurrence)`` int pairs.
+
 Modes:
 - strict:   every call must match in every run; first divergence is an error.
 - callsite: keys (including occurrence index) missing from some runs are
@@ -13,17 +22,33 @@ Modes:
 - fuzzy:    per-callsite longest-common-subsequence matching on argument
             signatures (dtype/shape), so insertions and deletions are
             localized as extra/missing calls instead of cascading.
+
+With call sampling (``trace.call_sampling``) the recorded occurrences are the
+same in every run, so they align as usual; skipped calls are compared as
+per-callsite totals (``call_count_divergence``) instead.
+
+Calls made while recording is paused (pytracer.pause) take no occurrence
+number, so runs that pause at the same points still align exactly. The
+per-run pause window counts are reported; when they differ, divergent
+groups may be artifacts of where each run paused.
 """
 
 from __future__ import annotations
 
 import json
+from collections import Counter
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
 from pathlib import Path
 
 from pytracer._errors import AlignmentError, PytracerError
-from pytracer.trace.reader import CallKey, CallRecord, load_run_calls
+from pytracer.trace.reader import (
+    CallKey,
+    CallRecord,
+    load_call_sampling,
+    load_pause_windows,
+    load_run_calls,
+)
 
 
 @dataclass(slots=True)
@@ -35,6 +60,11 @@ class AlignedGroup:
     def complete(self) -> bool:
         return all(c is not None for c in self.calls)
 
+    @property
+    def sampled(self) -> bool:
+        """Some run summarized this call from a sample (trace.mode = "sampled")."""
+        return any(c is not None and c.sampled for c in self.calls)
+
     @property
     def function(self) -> str:
         for c in self.calls:
@@ -49,6 +79,8 @@ class Alignment:
     run_ids: list[str]
     groups: list[AlignedGroup] = field(default_factory=list)
     truncated_runs: list[str] = field(default_factory=list)
+    count_divergence: list[dict] = field(default_factory=list)
+    pause_windows: dict[str, int] = field(default_factory=dict)  # run id -> windows
 
     @property
     def matched(self) -> list[AlignedGroup]:
@@ -59,48 +91,85 @@ class Alignment:
         return [g for g in self.groups if not g.complete]
 
     def summary_dict(self) -> dict:
-        per_function: dict[str, dict] = {}
-        for group in self.groups:
-            entry = per_function.setdefault(
-                group.function, {"expected": 0, "missing": 0, "missing_in_runs": set()}
-            )
-            entry["expected"] += 1
-            if not group.complete:
-                entry["missing"] += 1
-                for run_id, call in zip(self.run_ids, group.calls, strict=True):
-                    if call is None:
-                        entry["missing_in_runs"].add(run_id)
-        divergent_calls = [
-            {
-                "function": fn,
-                "divergence_score": e["missing"] / e["expected"],
-                "missing_in_runs": sorted(e["missing_in_runs"]),
-            }
-            for fn, e in sorted(per_function.items())
-            if e["missing"]
-        ]
-        return {
-            "alignment_mode": self.mode,
-            "runs": len(self.run_ids),
-            "run_ids": self.run_ids,
-            "total_call_groups": len(self.groups),
-            "matched_call_groups": len(self.matched),
-            "divergent_call_groups": len(self.divergent),
-            "truncated_runs": self.truncated_runs,
-            "divergent_calls": divergent_calls,
+        return alignment_summary(
+            mode=self.mode,
+            run_ids=self.run_ids,
+            groups=[
+                (g.function, [i for i, c in enumerate(g.calls) if c is None], g.sampled)
+                for g in self.groups
+            ],
+            truncated_runs=self.truncated_runs,
+            count_divergence=self.count_divergence,
+            pause_windows=self.pause_windows,
+        )
+
+
+def alignment_summary(
+    *,
+    mode: str,
+    run_ids: list[str],
+    groups: list[tuple[str, list[int], bool]],
+    truncated_runs: list[str],
+    count_divergence: list[dict],
+    pause_windows: dict[str, int],
+) -> dict:
+    """The alignment.json document; *groups* are (function, missing run
+    indexes, sampled) in alignment order."""
+    per_function: dict[str, dict] = {}
+    n_matched = n_sampled = 0
+    for function, missing, sampled in groups:
+        entry = per_function.setdefault(
+            function, {"expected": 0, "missing": 0, "missing_in_runs": set()}
+        )
+        entry["expected"] += 1
+        n_sampled += sampled
+        if missing:
+            entry["missing"] += 1
+            entry["missing_in_runs"].update(run_ids[i] for i in missing)
+        else:
+            n_matched += 1
+    divergent_calls = [
+        {
+            "function": fn,
+            "divergence_score": e["missing"] / e["expected"],
+            "missing_in_runs": sorted(e["missing_in_runs"]),
         }
+        for fn, e in sorted(per_function.items())
+        if e["missing"]
+    ]
+    return {
+        "alignment_mode": mode,
+        "runs": len(run_ids),
+        "run_ids": run_ids,
+        "total_call_groups": len(groups),
+        "matched_call_groups": n_matched,
+        "divergent_call_groups": len(groups) - n_matched,
+        "sampled_call_groups": n_sampled,
+        "truncated_runs": truncated_runs,
+        "divergent_calls": divergent_calls,
+        "call_count_divergence": count_divergence,
+        "pause_windows": pause_windows,
+        "pause_windows_differ": len(set(pause_windows.values())) > 1,
+    }
 
 
 def load_experiment_calls(
     experiment_dir: str | Path,
+    streamed_calls: dict[str, list[CallRecord]] | None = None,
 ) -> tuple[list[str], list[list[CallRecord]], list[str]]:
+    """Calls per run; runs in *streamed_calls* (complete live streams, see
+    trace.stream) are taken from there instead of their capture files."""
     runs_dir = Path(experiment_dir) / "runs"
     run_dirs = sorted(p for p in runs_dir.iterdir() if p.is_dir()) if runs_dir.is_dir() else []
     if not run_dirs:
         raise PytracerError(f"{experiment_dir}: no runs found")
     run_ids, calls_per_run, truncated = [], [], []
+    streamed_calls = streamed_calls or {}
     for run_dir in run_dirs:
-        calls, was_truncated = load_run_calls(run_dir)
+        if run_dir.name in streamed_calls:
+            calls, was_truncated = streamed_calls[run_dir.name], False
+        else:
+            calls, was_truncated = load_run_calls(run_dir)
         run_ids.append(run_dir.name)
         calls_per_run.append(calls)
         if was_truncated:
@@ -108,6 +177,47 @@ def load_experiment_calls(
     return run_ids, calls_per_run, truncated
 
 
+def call_count_divergence(
+    run_dirs: list[Path], calls_per_run: list[list[CallRecord]]
+) -> list[dict]:
+    """Callsites whose total call count (recorded + skipped by call sampling)
+    differs between runs. Empty when no run used call sampling."""
+    return count_divergence_from_counts(
+        run_dirs, [Counter(call.site for call in calls) for calls in calls_per_run]
+    )
+
+
+def count_divergence_from_counts(run_dirs: list[Path], recorded: list[Counter]) -> list[dict]:
+    """``call_count_divergence`` from per-run recorded calls per site."""
+    skipped_per_run = [load_call_sampling(run_dir) for run_dir in run_dirs]
+    if all(skipped is None for skipped in skipped_per_run):
+        return []
+    totals: list[Counter] = []
+    for counts, skipped in zip(recorded, skipped_per_run, strict=True):
+        counts = Counter(counts)
+        counts.update(skipped or {})
+        totals.append(counts)
+    sites = dict.fromkeys(site for counts in totals for site in counts)
+    return [
+        {
+            "function": f"{site[0]}.{site[1]}",
+            "source": f"{site[3]}:{site[4]}" if site[3] else None,
+            "calls_per_run": [counts.get(site, 0) for counts in totals],
+        }
+        for site in sites
+        if len({counts.get(site, 0) for counts in totals}) > 1
+    ]
+
+
+def pause_windows_per_run(run_ids: list[str], run_dirs: list[Path]) -> dict[str, int]:
+    """Pause windows per run id; empty when no run paused."""
+    counts = {
+        run_id: len(load_pause_windows(run_dir))
+        for run_id, run_dir in zip(run_ids, run_dirs, strict=True)
+    }
+    return counts if any(counts.values()) else {}
+
+
 def _call_signature(call: CallRecord) -> tuple:
     """Perturbation-stable identity of a call's arguments (dtype/shape only)."""
     return tuple(
@@ -122,33 +232,53 @@ def _call_signature(call: CallRecord) -> tuple:
 SiteKey = tuple[str, str, str | None, str | None, int | None]
 
 
+def _site_indexes(
+    calls_per_run: list[list[CallRecord]],
+) -> tuple[list[SiteKey], list[list[int]]]:
+    """Experiment-wide site index for every call, in first-seen order.
+
+    Calls carrying a run-local callsite id hash their site tuple once per
+    distinct id; the rest (traces without a callsite table) once per call.
+    """
+    index: dict[SiteKey, int] = {}
+    sites: list[SiteKey] = []
+    per_run: list[list[int]] = []
+    for calls in calls_per_run:
+        local: dict[int, int] = {}
+        site_ids: list[int] = []
+        for call in calls:
+            sid = local.get(call.callsite_id) if call.callsite_id is not None else None
+            if sid is None:
+                site = call.site
+                sid = index.get(site)
+                if sid is None:
+                    sid = index[site] = len(sites)
+                    sites.append(site)
+                if call.callsite_id is not None:
+                    local[call.callsite_id] = sid
+            site_ids.append(sid)
+        per_run.append(site_ids)
+    return sites, per_run
+
+
 def _fuzzy_align(
     run_ids: list[str],
     calls_per_run: list[list[CallRecord]],
     truncated_runs: list[str] | None,
 ) -> Alignment:
     n_runs = len(run_ids)
-    sites: dict[SiteKey, list[list[CallRecord]]] = {}
-    site_order: list[SiteKey] = []
+    site_keys, site_ids = _site_indexes(calls_per_run)
+    per_site: list[list[list[CallRecord]]] = [
+        [[] for _ in range(n_runs)] for _ in site_keys
+    ]
     for run_index, calls in enumerate(calls_per_run):
-        for call in calls:
-            site: SiteKey = (
-                call.module,
-                call.qualname,
-                call.ufunc_method,
-                call.source.file if call.source else None,
-                call.source.lineno if call.source else None,
-            )
-            if site not in sites:
-                sites[site] = [[] for _ in range(n_runs)]
-                site_order.append(site)
-            sites[site][run_index].append(call)
+        for call, sid in zip(calls, site_ids[run_index], strict=True):
+            per_site[sid][run_index].append(call)
 
     alignment = Alignment(
         mode="fuzzy", run_ids=run_ids, truncated_runs=list(truncated_runs or [])
     )
-    for site in site_order:
-        per_run = sites[site]
+    for site, per_run in zip(site_keys, per_site, strict=True):
         # reference: the run with the most calls at this site
         ref_index = max(range(n_runs), key=lambda i: len(per_run[i]))
         ref_calls = per_run[ref_index]
@@ -195,20 +325,21 @@ def align(
 ) -> Alignment:
     if mode == "fuzzy":
         return _fuzzy_align(run_ids, calls_per_run, truncated_runs)
-    indexes = [{c.key: c for c in run_calls} for run_calls in calls_per_run]
-    ordered_keys: list[CallKey] = []
-    seen: set[CallKey] = set()
-    for calls in calls_per_run:
-        for call in calls:
-            if call.key not in seen:
-                seen.add(call.key)
-                ordered_keys.append(call.key)
+    site_keys, site_ids = _site_indexes(calls_per_run)
+    indexes: list[dict[tuple[int, int], CallRecord]] = []
+    ordered_keys: dict[tuple[int, int], None] = {}
+    for calls, sids in zip(calls_per_run, site_ids, strict=True):
+        index = {(sid, c.occurrence): c for c, sid in zip(calls, sids, strict=True)}
+        indexes.append(index)
+        ordered_keys.update(dict.fromkeys(index))
 
     alignment = Alignment(
         mode=mode, run_ids=run_ids, truncated_runs=list(truncated_runs or [])
     )
-    for key in ordered_keys:
-        group = AlignedGroup(key=key, calls=[idx.get(key) for idx in indexes])
+    for int_key in ordered_keys:
+        sid, occurrence = int_key
+        key: CallKey = (*site_keys[sid], occurrence)
+        group = AlignedGroup(key=key, calls=[idx.get(int_key) for idx in indexes])
         if mode == "strict" and not group.complete:
             missing = [
                 run_ids[i] for i, call in enumerate(group.calls) if call is None
@@ -222,9 +353,11 @@ def align(
     return alignment
 
 
-def write_alignment(experiment_dir: str | Path, alignment: Alignment) -> Path:
+def write_alignment(experiment_dir: str | Path, alignment: Alignment | dict) -> Path:
+    """Write alignment.json from an Alignment or its ``summary_dict()``."""
+    summary = alignment.summary_dict() if isinstance(alignment, Alignment) else alignment
     analysis_dir = Path(experiment_dir) / "analysis"
     analysis_dir.mkdir(exist_ok=True)
     path = analysis_dir / "alignment.json"
-    path.write_text(json.dumps(alignment.summary_dict(), indent=2))
+    path.write_text(json.dumps(summary, indent=2))
     return path
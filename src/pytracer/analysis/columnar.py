@@ -0,0 +1,416 @@
+"""Columnar analysis engine: align and aggregate from the runs' events.parquet.
+
+The record engine (``align`` + ``aggregate``) decodes every event into a
+CallRecord and loops over calls in Python. This engine reads the Parquet
+tables written at finalization (storage.parquet) and does the same work on
+integer columns:
+
+- each call becomes one ``(site << 32) | occurrence`` key; within a run the
+  last call of a key wins and keys keep their first-seen order, as in
+  ``align``;
+- runs are joined on their sorted key arrays, which yields the group table
+  (alignment order, missing runs) without any per-call object;
+- the summaries of every argument present in all runs of a complete group
+  form one row of an (observations x runs) matrix, reduced at once to
+  ``sig(mean)``, the mean of the finite means and the NaN/Inf variability;
+- per-function and per-argument rows are segment reductions over those
+  observations.
+
+Results are identical to the record engine's, not merely close: both hand
+their observation matrices, in alignment order, to
+``aggregate.observations`` and ``aggregate.reduce_observations``.
+
+Only what the summary basis needs is covered: the callsite and strict
+modes, every run finalized by this version (``events.parquet`` newer than
+the capture and carrying its truncation flag, or no table for a capture
+without events), no stored array payloads (element-wise sig reads the
+arrays) and no unnamed per-argument events from older captures.
+``columnar_unsupported`` names the first obstacle.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from pytracer._errors import AlignmentError, PytracerError
+from pytracer.analysis.aggregate import (
+    AggregationResult,
+    _segments,
+    observations,
+    reduce_observations,
+)
+from pytracer.analysis.align import SiteKey
+from pytracer.analysis.coverage import CallTally
+from pytracer.storage.finalize import empty_capture
+from pytracer.storage.parquet import PARQUET_FILENAME, TRUNCATED_KEY, _schema
+from pytracer.trace.reader import find_events_file
+
+COLUMNAR_MODES = ("callsite", "strict")
+_COLUMNS = [
+    "event_id", "call_id", "phase", "module", "qualname", "tier", "ufunc_method",
+    "source_file", "source_lineno", "occurrence", "region", "arg_name", "payload_kind",
+    "dtype", "mean", "nan_count", "inf_count", "sample_ratio", "ts_ns",
+]
+_SITE_COLUMNS = ("module", "qualname", "ufunc_method", "source_file", "source_lineno")
+_OCCURRENCE_BITS = 32
+
+
+class ColumnarUnsupported(PytracerError):
+    """The experiment needs the record engine."""
+
+
+def columnar_unsupported(run_dirs: list[Path], alignment_mode: str) -> str | None:
+    """Why the columnar engine cannot analyze these runs, or None when it can."""
+    if alignment_mode not in COLUMNAR_MODES:
+        return f"{alignment_mode} alignment"
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return "pyarrow is not installed"
+    if not run_dirs:
+        return "no runs"
+    for run_dir in run_dirs:
+        events_path = find_events_file(run_dir)
+        path = run_dir / PARQUET_FILENAME
+        if events_path is not None and not path.exists() and empty_capture(run_dir) is not None:
+            continue  # no events, hence no table: analyzed as an empty run
+        try:
+            if events_path is None or path.stat().st_mtime_ns < events_path.stat().st_mtime_ns:
+                return f"{run_dir.name}: events.parquet missing or older than the capture"
+            metadata = pq.read_schema(path).metadata or {}
+        except (OSError, ValueError) as e:
+            return f"{run_dir.name}: unreadable events.parquet ({e})"
+        if TRUNCATED_KEY.encode() not in metadata:
+            return f"{run_dir.name}: events.parquet predates the columnar engine"
+    return None
+
+
+class _Codes:
+    """Experiment-wide integer codes of column values (None included)."""
+
+    def __init__(self) -> None:
+        self.index: dict = {}
+        self.values: list = []
+
+    def code(self, value) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, column) -> np.ndarray:
+        array = column.combine_chunks().dictionary_encode()
+        lookup = np.array(
+            [self.code(v) for v in array.dictionary.to_pylist()] + [self.code(None)],
+            dtype=np.int64,
+        )
+        return lookup[array.indices.fill_null(len(array.dictionary)).to_numpy()]
+
+
+class _Sites:
+    """Experiment-wide site ids, keyed on the codes of the SiteKey fields."""
+
+    def __init__(self, codes: _Codes) -> None:
+        self.codes = codes
+        self.index: dict[tuple, int] = {}
+        self.keys: list[SiteKey] = []
+        self.function: list[int] = []  # function id per site
+        self.functions: dict[str, int] = {}
+        self.function_names: list[str] = []
+        self.traced: list[str] = []  # module.qualname per site (coverage)
+
+    def ids(self, site_codes: np.ndarray) -> np.ndarray:
+        """Site id per row of an (n, 5) array of codes."""
+        if not len(site_codes):
+            return np.zeros(0, dtype=np.int64)
+        unique, inverse = np.unique(site_codes, axis=0, return_inverse=True)
+        ids = np.array([self._id(tuple(row)) for row in unique.tolist()], dtype=np.int64)
+        return ids[inverse.ravel()]
+
+    def _id(self, row: tuple) -> int:
+        sid = self.index.get(row)
+        if sid is None:
+            module, qualname, ufunc_method, file, lineno = (self.codes.values[c] for c in row)
+            sid = self.index[row] = len(self.keys)
+            self.keys.append((module, qualname, ufunc_method, file, lineno))
+            name = f"{module}.{qualname}"
+            self.traced.append(name)
+            if ufunc_method and ufunc_method != "__call__":
+                name += f".{ufunc_method}"
+            fid = self.functions.get(name)
+            if fid is None:
+                fid = self.functions[name] = len(self.function_names)
+                self.function_names.append(name)
+            self.function.append(fid)
+        return sid
+
+
+@dataclass(slots=True)
+class _Run:
+    """One run reduced to integer columns."""
+
+    truncated: bool
+    call_sites: np.ndarray  # every call, in program order
+    call_tiers: np.ndarray
+    call_regions: np.ndarray
+    keys: np.ndarray  # alignment keys, first-seen order
+    tiers: np.ndarray  # per key: its call's tier code
+    regions: np.ndarray
+    sampled: np.ndarray  # per key: some argument summary was sampled
+    arg_slot: np.ndarray  # per argument with a summary: index into keys
+    arg_phase: np.ndarray  # 0 input, 1 output
+    arg_name: np.ndarray
+    arg_mean: np.ndarray  # NaN when absent
+    arg_nan: np.ndarray
+    arg_inf: np.ndarray
+    arg_sampled: np.ndarray
+
+
+def _last_of_each(*columns: np.ndarray) -> np.ndarray:
+    """Index of the last row of each distinct tuple of *columns*, tuple-sorted."""
+    n = len(columns[0])
+    order = np.lexsort((np.arange(n), *reversed(columns)))
+    last = np.zeros(n, dtype=bool)
+    if n:
+        last[-1] = True
+        for column in columns:
+            ordered = column[order]
+            last[:-1] |= ordered[1:] != ordered[:-1]
+    return order[last]
+
+
+def _load_run(run_dir: Path, codes: _Codes, sites: _Sites) -> _Run:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    path = run_dir / PARQUET_FILENAME
+    if path.exists():
+        table = pq.read_table(path, columns=_COLUMNS)
+        truncated = (table.schema.metadata or {}).get(TRUNCATED_KEY.encode()) == b"true"
+    else:  # an empty capture (see columnar_unsupported)
+        table = _schema(pa).empty_table().select(_COLUMNS)
+        truncated = bool(empty_capture(run_dir))
+    if pc.any(pc.equal(table.column("payload_kind"), "array_ref")).as_py():
+        raise ColumnarUnsupported(f"{run_dir.name}: stored array payloads")
+
+    # calls, in program order (as reader.program_order), with the
+    # attributes of their first event
+    call_id = table.column("call_id").to_numpy()
+    _, first, row_call = np.unique(call_id, return_index=True, return_inverse=True)
+    first_event_id = table.column("event_id").to_numpy()[first]
+    first_ts = table.column("ts_ns").take(first)
+    if first_ts.null_count:
+        order = np.argsort(first_event_id, kind="stable")
+    else:
+        order = np.lexsort((first_event_id, first_ts.to_numpy()))
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    row_call = rank[row_call.ravel()]
+    calls = table.take(first[order])
+    call_sites = sites.ids(
+        np.stack([codes.encode(calls.column(name)) for name in _SITE_COLUMNS], axis=1)
+        if len(calls) else np.zeros((0, len(_SITE_COLUMNS)), dtype=np.int64)
+    )
+    occurrence = calls.column("occurrence").to_numpy()
+    if len(occurrence) and (occurrence.min() < 0 or occurrence.max() >> _OCCURRENCE_BITS):
+        raise ColumnarUnsupported(f"{run_dir.name}: occurrence out of range")
+    call_keys = (call_sites << _OCCURRENCE_BITS) | occurrence
+    call_tiers = codes.encode(calls.column("tier"))
+    call_regions = codes.encode(calls.column("region"))
+
+    # a key seen twice keeps its last call, at its first position
+    unique, first_pos = np.unique(call_keys, return_index=True)
+    _, last_reversed = np.unique(call_keys[::-1], return_index=True)
+    by_position = np.argsort(first_pos, kind="stable")
+    keys = unique[by_position]
+    chosen = (len(call_keys) - 1 - last_reversed)[by_position]
+    slot_of_call = np.full(len(call_keys), -1, dtype=np.int64)
+    slot_of_call[chosen] = np.arange(len(keys))
+
+    # arguments: the last row of each (call, side, name), as assemble_calls
+    is_input = pc.equal(table.column("phase"), "input").to_numpy(zero_copy_only=False)
+    is_output = pc.equal(table.column("phase"), "output").to_numpy(zero_copy_only=False)
+    named = pc.is_valid(table.column("arg_name")).to_numpy(zero_copy_only=False)
+    summarized = pc.is_valid(table.column("dtype")).to_numpy(zero_copy_only=False)
+    side = is_input | is_output
+    if np.any(side & ~named & summarized):
+        raise ColumnarUnsupported(f"{run_dir.name}: unnamed per-argument events")
+    rows = np.flatnonzero(side & named)
+    names = codes.encode(table.column("arg_name").take(rows))
+    phases = is_output[rows].astype(np.int64)
+    last = _last_of_each(row_call[rows], phases, names)
+    keep = last[summarized[rows[last]] & (slot_of_call[row_call[rows[last]]] >= 0)]
+    rows, names, phases = rows[keep], names[keep], phases[keep]
+    args = table.take(rows)
+    arg_slot = slot_of_call[row_call[rows]]
+    arg_sampled = pc.is_valid(args.column("sample_ratio")).to_numpy(zero_copy_only=False)
+    sampled = np.zeros(len(keys), dtype=bool)
+    sampled[arg_slot[arg_sampled]] = True
+    return _Run(
+        truncated=truncated,
+        call_sites=call_sites,
+        call_tiers=call_tiers,
+        call_regions=call_regions,
+        keys=keys,
+        tiers=call_tiers[chosen],
+        regions=call_regions[chosen],
+        sampled=sampled,
+        arg_slot=arg_slot,
+        arg_phase=phases,
+        arg_name=names,
+        arg_mean=pc.fill_null(args.column("mean"), math.nan).to_numpy(),
+        arg_nan=pc.fill_null(args.column("nan_count"), -1).to_numpy(),
+        arg_inf=pc.fill_null(args.column("inf_count"), -1).to_numpy(),
+        arg_sampled=arg_sampled,
+    )
+
+
+def _counts_in_order(values: np.ndarray) -> list[tuple[int, int]]:
+    """(value, count) pairs in first-seen order."""
+    unique, first, counts = np.unique(values, return_index=True, return_counts=True)
+    order = np.argsort(first, kind="stable")
+    return list(zip(unique[order].tolist(), counts[order].tolist(), strict=True))
+
+
+@dataclass(slots=True)
+class ColumnarAnalysis:
+    run_ids: list[str]
+    truncated_runs: list[str]
+    groups: list[tuple[str, list[int], bool]]  # alignment_summary's groups
+    aggregation: AggregationResult
+    tally: CallTally
+    recorded: list[Counter]  # per run: SiteKey -> recorded calls
+
+
+def analyze_runs(run_dirs: list[Path], alignment_mode: str = "callsite") -> ColumnarAnalysis:
+    """Align and aggregate *run_dirs* from their Parquet tables.
+
+    Raises ColumnarUnsupported when the runs need the record engine.
+    """
+    reason = columnar_unsupported(run_dirs, alignment_mode)
+    if reason is not None:
+        raise ColumnarUnsupported(reason)
+    codes = _Codes()
+    sites = _Sites(codes)
+    runs = [_load_run(run_dir, codes, sites) for run_dir in run_dirs]
+    run_ids = [run_dir.name for run_dir in run_dirs]
+    n_runs = len(runs)
+
+    # groups: keys in first-seen order across runs
+    unique, first = np.unique(np.concatenate([run.keys for run in runs]), return_index=True)
+    group_order = np.argsort(first, kind="stable")
+    n_groups = len(unique)
+    rank = np.empty(n_groups, dtype=np.int64)
+    rank[group_order] = np.arange(n_groups)
+    group_keys = unique[group_order]
+    present = np.zeros((n_groups, n_runs), dtype=bool)
+    tiers = np.full((n_groups, n_runs), -1, dtype=np.int64)
+    regions = np.full((n_groups, n_runs), -1, dtype=np.int64)
+    sampled = np.zeros(n_groups, dtype=bool)
+    run_groups = []
+    for j, run in enumerate(runs):
+        g = rank[np.searchsorted(unique, run.keys)]
+        run_groups.append(g)
+        present[g, j] = True
+        tiers[g, j] = run.tiers
+        regions[g, j] = run.regions
+        sampled[g[run.sampled]] = True
+    complete = present.all(axis=1)
+    group_sites = group_keys >> _OCCURRENCE_BITS
+    group_function = np.array(sites.function, dtype=np.int64)[group_sites]
+    names = sites.function_names
+
+    if alignment_mode == "strict" and not complete.all():
+        failed = int(np.argmin(complete))
+        site = sites.keys[group_sites[failed]]
+        missing = [run_ids[j] for j in np.flatnonzero(~present[failed])]
+        raise AlignmentError(
+            f"strict alignment failed: call {names[group_function[failed]]} "
+            f"(source {site[3]}:{site[4]}, occurrence "
+            f"{group_keys[failed] & ((1 << _OCCURRENCE_BITS) - 1)}) missing in runs {missing}"
+        )
+    groups = [
+        (names[f], [] if done else np.flatnonzero(~row).tolist(), s)
+        for f, done, row, s in zip(
+            group_function.tolist(), complete.tolist(), present, sampled.tolist(), strict=True
+        )
+    ]
+
+    # observations: (group, side, argument) present in every run of a complete group
+    parts = []
+    for j, (run, g) in enumerate(zip(runs, run_groups, strict=True)):
+        ag = g[run.arg_slot]
+        keep = complete[ag]
+        parts.append((
+            ag[keep], run.arg_phase[keep], run.arg_name[keep], np.full(keep.sum(), j),
+            run.arg_mean[keep], run.arg_nan[keep], run.arg_inf[keep], run.arg_sampled[keep],
+        ))
+    o_group, o_phase, o_name, o_run, o_mean, o_nan, o_inf, o_sampled = (
+        np.concatenate(column) for column in zip(*parts, strict=True)
+    )
+    order = np.lexsort((o_run, o_name, o_phase, o_group))
+    o_group, o_phase, o_name = o_group[order], o_phase[order], o_name[order]
+    bounds = _segments(o_group, o_phase, o_name)
+    starts, counts = bounds[:-1], np.diff(bounds)
+    full = counts == n_runs
+    rows = order[np.repeat(full, counts)]
+    obs_group, obs_phase, obs_name = (c[starts[full]] for c in (o_group, o_phase, o_name))
+    obs = observations(
+        group=obs_group,
+        phase=obs_phase,
+        name=obs_name,
+        means=o_mean[rows].reshape(-1, n_runs),
+        nans=o_nan[rows].reshape(-1, n_runs),
+        infs=o_inf[rows].reshape(-1, n_runs),
+        sampled=o_sampled[rows].reshape(-1, n_runs).any(axis=1),
+    )
+
+    function_tiers: dict[int, set[str]] = {}
+    function_regions: dict[int, set[str]] = {}
+    none = codes.code(None)
+    repeated = np.repeat(group_function[complete], n_runs)
+    for target, values in ((function_tiers, tiers), (function_regions, regions)):
+        pairs = np.unique(np.stack((repeated, values[complete].ravel())), axis=1)
+        for f, code in pairs.T.tolist():
+            if code != none:
+                target.setdefault(f, set()).add(codes.values[code])
+    aggregation = reduce_observations(
+        obs,
+        n_runs,
+        function_names=names,
+        group_function=group_function,
+        complete=complete,
+        function_tiers=function_tiers,
+        function_regions=function_regions,
+        arg_names=codes.values,
+    )
+
+    calls_per_tier: Counter = Counter()
+    calls_per_region: Counter = Counter()
+    traced: set[str] = set()
+    recorded = []
+    for run in runs:
+        for code, count in _counts_in_order(run.call_tiers):
+            calls_per_tier[codes.values[code]] += count
+        for code, count in _counts_in_order(run.call_regions):
+            if code != none:
+                calls_per_region[codes.values[code]] += count
+        site_counts = _counts_in_order(run.call_sites)
+        traced.update(sites.traced[sid] for sid, _ in site_counts)
+        recorded.append(Counter({sites.keys[sid]: n for sid, n in site_counts}))
+
+    return ColumnarAnalysis(
+        run_ids=run_ids,
+        truncated_runs=[rid for rid, run in zip(run_ids, runs, strict=True) if run.truncated],
+        groups=groups,
+        aggregation=aggregation,
+        tally=(calls_per_tier, calls_per_region, traced),
+        recorded=recorded,
+    )
@@ -14,22 +14,39 @@ from pathlib import Path
 
 from pytracer.instrumentation.monitor import MONITOR_FILENAME
 from pytracer.instrumentation.native import NATIVE_LOG_FILENAME, parse_native_log
-from pytracer.trace.reader import CallRecord
+from pytracer.trace.reader import CallRecord, load_call_sampling
 
 _SUGGESTION_MODULE_PREFIXES = ("numpy", "scipy", "sklearn", "pandas", "torch", "jax")
 
 
+CallTally = tuple[Counter, Counter, set]  # calls per tier, calls per region, traced functions
+
+
+def tally_calls(
+    calls_per_run: list[list[CallRecord]], tally: CallTally | None = None
+) -> CallTally:
+    """Count calls per tier and region; adds to *tally* when given."""
+    events_per_tier, calls_per_region, traced_functions = tally or (Counter(), Counter(), set())
+    for calls in calls_per_run:
+        for call in calls:
+            events_per_tier[call.tier] += 1
+            if call.region is not None:
+                calls_per_region[call.region] += 1
+            traced_functions.add(f"{call.module}.{call.qualname}")
+    return events_per_tier, calls_per_region, traced_functions
+
+
 def build_coverage(
     experiment_dir: str | Path,
     calls_per_run: list[list[CallRecord]],
     target_specs: list[str],
+    tally: CallTally | None = None,
 ) -> dict:
-    events_per_tier: Counter[str] = Counter()
-    traced_functions: set[str] = set()
-    for calls in calls_per_run:
-        for call in calls:
-            events_per_tier[call.tier] += 1
-            traced_functions.add(f"{call.module}.{call.qualname}")
+    """*tally*: a running ``tally_calls`` result used instead of *calls_per_run*
+    (incremental analysis)."""
+    if tally is None:
+        tally = tally_calls(calls_per_run)
+    events_per_tier, calls_per_region, traced_functions = tally
 
     c_calls: Counter[str] = Counter()
     monitor_available = False
@@ -52,6 +69,12 @@ def build_coverage(
                 agg["calls"] += entry["calls"]
                 agg["volume"] += entry["volume"]
 
+    skipped: Counter[str] = Counter()
+    if runs_dir.is_dir():
+        for run_dir in sorted(runs_dir.iterdir()):
+            for site, count in (load_call_sampling(run_dir) or {}).items():
+                skipped[f"{site[0]}.{site[1]}"] += count
+
     untraced = [
         {"function": name, "calls": count}
         for name, count in c_calls.most_common()
@@ -62,17 +85,25 @@ def build_coverage(
 
     return {
         "calls_per_tier": dict(events_per_tier),
+        "calls_per_region": dict(calls_per_region.most_common()),
         "native_kernels": native_kernels,
         "traced_functions": sorted(traced_functions),
         "targets_configured": target_specs,
         "monitor_available": monitor_available,
         "untraced_numerical_callables": untraced[:50],
+        "calls_skipped_by_sampling": dict(skipped.most_common()),
         "notes": [
             "Operator dispatch on ndarrays (a + b) is not observable at tiers t1/t2.",
             "Calls made inside compiled extensions (C/Cython) are not observable "
             "at any Python tier.",
         ]
-        + ([] if monitor_available else ["sys.monitoring unavailable: C-call census empty."]),
+        + ([] if monitor_available else ["sys.monitoring unavailable: C-call census empty."])
+        + (
+            ["Call sampling skipped some calls (counted, not summarized): stability "
+             "figures describe the recorded calls only."]
+            if skipped
+            else []
+        ),
     }
 
 
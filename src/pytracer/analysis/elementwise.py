@@ -26,10 +26,38 @@ def elementwise_sig(stack: np.ndarray) -> dict | None:
     if stack.ndim < 1 or stack.shape[0] < 2:
         return None
     runs = np.atleast_2d(stack.reshape(stack.shape[0], -1)).astype(np.float64, copy=False)
+    first = runs[0]
+    total, total_sq = np.zeros_like(first), np.zeros_like(first)
+    with np.errstate(all="ignore"):
+        for x in runs[1:]:  # run by run, as the incremental analysis folds them
+            delta = x - first
+            total += delta
+            total_sq += delta * delta
+    return elementwise_sig_from_sums(first, total, total_sq, len(runs))
+
+
+def elementwise_sig_from_sums(
+    first: np.ndarray, total: np.ndarray, total_sq: np.ndarray, n: int
+) -> dict | None:
+    """``elementwise_sig`` from the first run's array and the sum and sum of
+    squares of the *n* runs' differences to it.
+
+    Runs that agree to many bits differ from the first by exactly
+    representable amounts, so these sums keep a spread that the moments
+    of the raw values would round away. The incremental analysis keeps
+    them instead of every run's array.
+    """
+    with np.errstate(all="ignore"):
+        shift = total / n
+        var = np.maximum(total_sq / n - shift * shift, 0.0)
+        return elementwise_sig_from_moments(first + shift, np.sqrt(var))
+
 
+def elementwise_sig_from_moments(mean: np.ndarray, std: np.ndarray) -> dict | None:
+    """``elementwise_sig`` from per-element cross-run mean and (population) std."""
+    mean = np.ravel(mean)
+    std = np.ravel(std)
     with np.errstate(all="ignore"):
-        mean = runs.mean(axis=0)
-        std = runs.std(axis=0)
         sig = np.full(mean.shape, np.nan)
 
         finite = np.isfinite(mean) & np.isfinite(std)
@@ -0,0 +1,344 @@
+"""Incremental analysis: fold new runs into an analyzed experiment.
+
+A full analysis re-reads, re-aligns and re-aggregates every run. The
+incremental path keeps the alignment state in ``analysis/state.msgpack``
+instead:
+
+- the experiment-wide callsite index (the ``SiteKey`` list of
+  ``align._site_indexes``),
+- the group table in alignment order: per ``(site index, occurrence)`` the
+  function, the runs missing the call, tiers, regions and a sampled flag,
+- per group argument, across runs: every run's summary mean (``sig(mean)``,
+  one float per run), the first NaN/Inf counts and whether they varied,
+  and, for arguments whose payload every run stored (``elementwise_sig``),
+  the first run's array with the sum and sum of squares of every later
+  run's difference to it,
+- per-run recorded calls per site (for ``call_count_divergence``) and the
+  coverage tally.
+
+Adding a run decodes and folds only that run's calls; the outputs
+(alignment.json, aggregation, coverage.json) are then rebuilt from the
+state, which costs O(groups) rather than O(events of every run). Pause
+windows, call-sampling counts and the monitor census are small per-run
+side files and are re-read as in a full analysis.
+
+Only the callsite and strict modes can be folded run by run: fuzzy
+alignment matches each run against the longest one, so it runs the full
+analysis. Results equal a full analysis exactly: the summary means are
+reduced by ``sig_bits_matrix`` as ``aggregate`` does, and element-wise sig
+comes from the same shifted sums (``elementwise_sig_from_sums``), added
+run by run in both. A call key seen twice in one run keeps its last call,
+as in ``align``.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from pathlib import Path
+
+import msgspec
+import numpy as np
+
+from pytracer._errors import AlignmentError
+from pytracer.analysis.aggregate import (
+    AggregationResult,
+    ArgObservation,
+    GroupAccumulator,
+    sig_bits_matrix,
+)
+from pytracer.analysis.align import SiteKey, alignment_summary
+from pytracer.analysis.elementwise import elementwise_sig_from_sums
+from pytracer.storage.arrays import load_array
+from pytracer.trace.event import NumericSummary
+from pytracer.trace.reader import CallRecord
+
+STATE_FILENAME = "state.msgpack"
+STATE_VERSION = 2
+INCREMENTAL_MODES = ("callsite", "strict")
+
+
+class ArgState(msgspec.Struct):
+    """One argument of one aligned group, folded across runs."""
+
+    means: list[float] = []  # per run that recorded a summary: its mean, NaN if absent
+    nan_count: int | None = None  # first run's count
+    nan_varies: bool = False
+    inf_count: int | None = None
+    inf_varies: bool = False
+    sampled: bool = False
+    # element-wise sums; dropped once a run lacks the payload or its shape differs
+    n_elements: int = 0  # runs folded into the arrays
+    element_ok: bool = True
+    shape: list[int] | None = None
+    element_first: bytes | None = None  # float64: the first run's array
+    element_sum: bytes | None = None  # of (x - first) over runs
+    element_sum_sq: bytes | None = None  # of (x - first)**2 over runs
+
+    def add(self, summary: NumericSummary, array: np.ndarray | None) -> None:
+        if not self.means:
+            self.nan_count, self.inf_count = summary.nan_count, summary.inf_count
+        else:
+            self.nan_varies |= summary.nan_count != self.nan_count
+            self.inf_varies |= summary.inf_count != self.inf_count
+        self.means.append(math.nan if summary.mean is None else summary.mean)
+        self.sampled |= summary.sample_ratio is not None
+        self._add_elements(array)
+
+    def _add_elements(self, array: np.ndarray | None) -> None:
+        if not self.element_ok:
+            return
+        if array is None or (self.shape is not None and list(array.shape) != self.shape):
+            self.element_ok = False
+            self.shape = self.element_first = self.element_sum = self.element_sum_sq = None
+            return
+        if array.dtype.kind == "c":
+            array = np.abs(array)
+        try:
+            x = np.asarray(array, dtype=np.float64).ravel()
+        except (ValueError, TypeError):
+            self.element_ok = False
+            return
+        if (
+            self.shape is None
+            or self.element_first is None
+            or self.element_sum is None
+            or self.element_sum_sq is None
+        ):
+            self.shape = list(array.shape)
+            self.element_first = x.tobytes()
+            total, total_sq = np.zeros_like(x), np.zeros_like(x)
+        else:
+            first = np.frombuffer(self.element_first, dtype=np.float64)
+            total = np.frombuffer(self.element_sum, dtype=np.float64).copy()
+            total_sq = np.frombuffer(self.element_sum_sq, dtype=np.float64).copy()
+            with np.errstate(all="ignore"):
+                delta = x - first
+                total += delta
+                total_sq += delta * delta
+        self.n_elements += 1
+        self.element_sum, self.element_sum_sq = total.tobytes(), total_sq.tobytes()
+
+    def observe(self, phase: str, arg_name: str, proxy_sig: float, mean: float) -> ArgObservation:
+        """This argument as an observation, given its ``sig_bits_matrix``
+        results (NaN when undefined)."""
+        n = self.n_elements
+        element = None
+        if (
+            self.element_ok
+            and self.element_first is not None
+            and self.element_sum is not None
+            and self.element_sum_sq is not None
+            and n == len(self.means)
+            and n >= 2
+        ):
+            element = elementwise_sig_from_sums(
+                np.frombuffer(self.element_first, dtype=np.float64),
+                np.frombuffer(self.element_sum, dtype=np.float64),
+                np.frombuffer(self.element_sum_sq, dtype=np.float64),
+                n,
+            )
+        return ArgObservation(
+            phase=phase,
+            arg_name=arg_name,
+            proxy_sig=None if math.isnan(proxy_sig) else proxy_sig,
+            element=element,
+            sampled=self.sampled,
+            nan_varies=self.nan_varies,
+            inf_varies=self.inf_varies,
+            mean=None if math.isnan(mean) else mean,
+            run_means=self.means,
+        )
+
+
+class GroupState(msgspec.Struct):
+    site: int
+    occurrence: int
+    function: str
+    missing: list[int]  # run indexes without this call
+    tiers: list[str] = []
+    regions: list[str] = []
+    sampled: bool = False
+    inputs: dict[str, ArgState] = {}
+    outputs: dict[str, ArgState] = {}
+
+
+class AnalysisState(msgspec.Struct):
+    mode: str
+    version: int = STATE_VERSION
+    run_ids: list[str] = []
+    truncated_runs: list[str] = []
+    sites: list[SiteKey] = []
+    groups: list[GroupState] = []
+    site_calls: list[dict[int, int]] = []  # per run: site index -> recorded calls
+    calls_per_tier: dict[str, int] = {}
+    calls_per_region: dict[str, int] = {}
+    traced_functions: list[str] = []
+
+    def add_run(
+        self,
+        run_id: str,
+        calls: list[CallRecord],
+        run_dir: Path,
+        truncated: bool = False,
+    ) -> None:
+        """Fold one run's calls into the state: O(calls) plus one pass over groups."""
+        site_index = {site: i for i, site in enumerate(self.sites)}
+        group_index = {(g.site, g.occurrence): i for i, g in enumerate(self.groups)}
+        run_index = len(self.run_ids)
+        self.run_ids.append(run_id)
+        if truncated:
+            self.truncated_runs.append(run_id)
+
+        local: dict[int, int] = {}
+        by_key: dict[tuple[int, int], CallRecord] = {}
+        site_calls: Counter[int] = Counter()
+        for call in calls:
+            sid = local.get(call.callsite_id) if call.callsite_id is not None else None
+            if sid is None:
+                site = call.site
+                sid = site_index.get(site)
+                if sid is None:
+                    sid = site_index[site] = len(self.sites)
+                    self.sites.append(site)
+                if call.callsite_id is not None:
+                    local[call.callsite_id] = sid
+            by_key[(sid, call.occurrence)] = call
+            site_calls[sid] += 1
+        self.site_calls.append(dict(site_calls))
+
+        present: set[int] = set()
+        for key, call in by_key.items():
+            gi = group_index.get(key)
+            if gi is None:
+                gi = group_index[key] = len(self.groups)
+                self.groups.append(
+                    GroupState(
+                        site=key[0],
+                        occurrence=key[1],
+                        function=call.function,
+                        missing=list(range(run_index)),
+                    )
+                )
+            present.add(gi)
+            self._fold_call(self.groups[gi], call, run_dir)
+        for gi, group in enumerate(self.groups):
+            if gi not in present:
+                group.missing.append(run_index)
+
+        tiers = Counter(self.calls_per_tier)
+        regions = Counter(self.calls_per_region)
+        traced = set(self.traced_functions)
+        for call in calls:
+            tiers[call.tier] += 1
+            if call.region is not None:
+                regions[call.region] += 1
+            traced.add(f"{call.module}.{call.qualname}")
+        self.calls_per_tier = dict(tiers)
+        self.calls_per_region = dict(regions)
+        self.traced_functions = sorted(traced)
+
+    @staticmethod
+    def _fold_call(group: GroupState, call: CallRecord, run_dir: Path) -> None:
+        if call.tier not in group.tiers:
+            group.tiers.append(call.tier)
+        if call.region is not None and call.region not in group.regions:
+            group.regions.append(call.region)
+        group.sampled |= call.sampled
+        for args, refs, states in (
+            (call.inputs, call.input_refs, group.inputs),
+            (call.outputs, call.output_refs, group.outputs),
+        ):
+            for arg_name, summary in args.items():
+                if summary is None:
+                    continue
+                ref = refs.get(arg_name)
+                array = load_array(run_dir, ref) if ref is not None else None
+                states.setdefault(arg_name, ArgState()).add(summary, array)
+
+    def check_strict(self) -> None:
+        for group in self.groups:
+            if group.missing:
+                site = self.sites[group.site]
+                raise AlignmentError(
+                    f"strict alignment failed: call {group.function} "
+                    f"(source {site[3]}:{site[4]}, occurrence {group.occurrence}) "
+                    f"missing in runs {[self.run_ids[i] for i in group.missing]}"
+                )
+
+    def aggregation(self) -> AggregationResult:
+        n_runs = len(self.run_ids)
+        observed = [
+            []
+            if group.missing
+            else [
+                (phase, arg_name, state)
+                for phase, states in (("input", group.inputs), ("output", group.outputs))
+                for arg_name, state in states.items()
+                if len(state.means) == n_runs
+            ]
+            for group in self.groups
+        ]
+        means = [state.means for per_group in observed for _, _, state in per_group]
+        proxy, mean = sig_bits_matrix(np.array(means, dtype=np.float64).reshape(len(means), n_runs))
+        k = 0
+        accumulator = GroupAccumulator()
+        for group, per_group in zip(self.groups, observed, strict=True):
+            if group.missing:
+                accumulator.add_group(group.function, complete=False)
+                continue
+            observations = []
+            for phase, arg_name, state in per_group:
+                observations.append(
+                    state.observe(phase, arg_name, proxy[k].item(), mean[k].item())
+                )
+                k += 1
+            accumulator.add_group(
+                group.function,
+                complete=True,
+                tiers=group.tiers,
+                regions=group.regions,
+                observations=observations,
+            )
+        return accumulator.result(n_runs)
+
+    def alignment_summary(
+        self, count_divergence: list[dict], pause_windows: dict[str, int]
+    ) -> dict:
+        return alignment_summary(
+            mode=self.mode,
+            run_ids=self.run_ids,
+            groups=[(g.function, g.missing, g.sampled) for g in self.groups],
+            truncated_runs=self.truncated_runs,
+            count_divergence=count_divergence,
+            pause_windows=pause_windows,
+        )
+
+    def recorded_counts(self) -> list[Counter]:
+        """Per run: SiteKey -> recorded calls (see align.count_divergence_from_counts)."""
+        return [
+            Counter({self.sites[sid]: n for sid, n in counts.items()})
+            for counts in self.site_calls
+        ]
+
+
+def load_state(experiment_dir: str | Path, mode: str) -> AnalysisState | None:
+    """The saved state, or None when absent, unreadable, or built for another mode."""
+    path = Path(experiment_dir) / "analysis" / STATE_FILENAME
+    try:
+        state = msgspec.msgpack.decode(path.read_bytes(), type=AnalysisState)
+    except (OSError, msgspec.DecodeError, msgspec.ValidationError):
+        return None
+    if state.version != STATE_VERSION or state.mode != mode:
+        return None
+    return state
+
+
+def save_state(experiment_dir: str | Path, state: AnalysisState) -> Path:
+    analysis_dir = Path(experiment_dir) / "analysis"
+    analysis_dir.mkdir(exist_ok=True)
+    path = analysis_dir / STATE_FILENAME
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(msgspec.msgpack.encode(state))
+    tmp.replace(path)
+    return path
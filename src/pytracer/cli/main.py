@@ -28,6 +28,10 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_run.add_argument("script", help="Python script to trace")
     p_run.add_argument("--repeat", type=int, default=1, help="number of independent runs")
+    p_run.add_argument(
+        "-j", "--jobs", type=int, default=None, metavar="N",
+        help="runs executed concurrently (default from config: 1)",
+    )
     p_run.add_argument(
         "--target", action="append", default=[], metavar="PATH",
         help="extra target (repeatable), e.g. numpy.linalg.solve or numpy.linalg.*",
@@ -48,15 +52,60 @@ def build_parser() -> argparse.ArgumentParser:
         "--native", action="store_true",
         help="enable the native BLAS kernel census (T5; Linux + C compiler)",
     )
+    p_run.add_argument(
+        "--until-converged", action="store_true",
+        help="run in waves until sig estimates converge; --repeat is the budget",
+    )
+    p_run.add_argument(
+        "--target-ci-bits", type=float, default=None, metavar="BITS",
+        help="with --until-converged: 95%% CI width to reach (default from config: 1.0)",
+    )
+    p_run.add_argument(
+        "--executor", choices=["local", "ssh", "batch"], default=None,
+        help="where runs execute (default from config: local)",
+    )
+    p_run.add_argument(
+        "--extend", default=None, metavar="EXPERIMENT_DIR",
+        help="append the runs to an existing experiment of this script and "
+        "analyze incrementally",
+    )
     p_run.add_argument("--continue-on-error", action="store_true")
     p_run.add_argument("--no-report", action="store_true", help="skip analysis and report")
     # Script arguments are passed after a literal `--`; they are split off
     # before parsing (argparse.REMAINDER would swallow pytracer's own options).
 
+    p_ingest = sub.add_parser(
+        "ingest", help="collect the runs of a batch experiment, then analyze and report"
+    )
+    p_ingest.add_argument("experiment_dir")
+    p_ingest.add_argument("--no-report", action="store_true", help="skip analysis and report")
+
+    p_finalize = sub.add_parser(
+        "finalize", help="build the Parquet tables and trace indexes of an experiment's runs"
+    )
+    p_finalize.add_argument("experiment_dir")
+    p_finalize.add_argument(
+        "-j", "--jobs", type=int, default=None, metavar="N",
+        help="runs converted in parallel (default: one per CPU)",
+    )
+    p_finalize.add_argument(
+        "--force", action="store_true", help="also rebuild runs that are up to date"
+    )
+
     p_analyze = sub.add_parser("analyze", help="align and aggregate an experiment")
     p_analyze.add_argument("experiment_dir")
     p_analyze.add_argument("--alignment", choices=["strict", "callsite", "fuzzy"],
                            default="callsite")
+    p_analyze.add_argument(
+        "--incremental", action="store_true",
+        help="fold only runs added since the last incremental analysis "
+        "(state in analysis/state.msgpack)",
+    )
+    p_analyze.add_argument(
+        "--engine", choices=["auto", "records", "columnar"], default=None,
+        help="records (CallRecord objects) or columnar (array operations over "
+        "events.parquet); default from config: auto",
+    )
 
     p_report = sub.add_parser("report", help="generate reports for an analyzed experiment")
     p_report.add_argument("experiment_dir")
@@ -137,12 +186,14 @@ def cmd_init(args) -> int:
     return 0
 
 
+def _print_progress(run_id: str, progress: dict) -> None:
+    """Live counts from a streamed run (trace.transport = "pipe")."""
+    print(f"\r{run_id}: {progress['calls']} calls traced", end="", file=sys.stderr, flush=True)
+
+
 def cmd_run(args) -> int:
-    from pytracer.analysis import analyze_experiment
     from pytracer.experiment import run_experiment
     from pytracer.plugins.registry import targets_for
-    from pytracer.report.model import build_report_data
-    from pytracer.report.render import terminal_summary, write_reports
 
     config = _load_config()
     if args.plugins is not None:
@@ -159,6 +210,14 @@ def cmd_run(args) -> int:
         config.trace.store_arrays = args.store_arrays
     if args.native:
         config.trace.native_census = True
+    if args.jobs is not None:
+        config.run.jobs = args.jobs
+    if args.executor:
+        config.run.executor = args.executor
+    if args.until_converged:
+        config.run.adaptive = True
+    if args.target_ci_bits is not None:
+        config.run.target_ci_bits = args.target_ci_bits
     config.validate()
 
     script_args = args.script_args
@@ -180,23 +239,48 @@ def cmd_run(args) -> int:
         target_specs=specs,
         repeat=args.repeat,
         continue_on_error=args.continue_on_error,
+        on_progress=_print_progress if sys.stderr.isatty() else None,
+        extend=args.extend,
     )
+    if config.trace.transport == "pipe" and sys.stderr.isatty():
+        print(file=sys.stderr)  # end the live progress line
     for warning in result.warnings:
         print(f"warning: {warning}", file=sys.stderr)
 
+    if result.submit_script is not None:
+        print(f"Job array written: {result.submit_script}")
+        print(f"Submit it (e.g. sbatch {result.submit_script}), then run: "
+              f"pytracer ingest {result.experiment_dir}")
+        return 0
+    return _analyze_and_report(
+        result, config, specs, args.no_report, incremental=args.extend is not None
+    )
+
+
+def _analyze_and_report(
+    result, config, specs: list[str] | None, no_report: bool, incremental: bool = False
+) -> int:
+    from pytracer.analysis import analyze
+    from pytracer.report.model import build_report_data
+    from pytracer.report.render import terminal_summary, write_reports
+
     status = max((r.exit_code for r in result.runs), default=0)
 
     completed = [r for r in result.runs if r.exit_code == 0]
-    if args.no_report or not completed:
+    if no_report or not completed:
         if not completed:
             print("error: no run completed successfully; skipping analysis", file=sys.stderr)
         print(f"Experiment: {result.experiment_dir}")
         return status or (1 if not completed else 0)
 
-    analyze_experiment(
+    _finalize_deferred(result.experiment_dir, config)
+    analyze(
         result.experiment_dir,
         alignment_mode=config.analysis.alignment,
         target_specs=specs,
+        streamed_calls=result.streamed_calls,
+        engine=config.analysis.engine,
+        incremental=incremental,
     )
     data = build_report_data(result.experiment_dir)
     written = write_reports(result.experiment_dir, data, config.report.formats)
@@ -206,13 +290,64 @@ def cmd_run(args) -> int:
     return status
 
 
+def cmd_ingest(args) -> int:
+    from pytracer.experiment import ingest_experiment
+
+    config = _load_config()
+    result = ingest_experiment(args.experiment_dir)
+    for warning in result.warnings:
+        print(f"warning: {warning}", file=sys.stderr)
+    print(f"ingested {len(result.runs)} finished run(s)")
+    return _analyze_and_report(result, config, None, args.no_report)
+
+
+def _finalize_deferred(experiment_dir, config) -> None:
+    """Finalize the pending runs of a ``storage.finalize = "deferred"`` experiment."""
+    from pytracer.storage.finalize import finalize_experiment
+
+    try:
+        meta = json.loads((Path(experiment_dir) / "experiment.json").read_text())
+    except (OSError, ValueError):
+        return
+    if meta.get("finalize") != "deferred":
+        return
+    result = finalize_experiment(
+        experiment_dir, row_group_size=config.storage.parquet_row_group_size
+    )
+    for warning in result.warnings:
+        print(f"warning: {warning}", file=sys.stderr)
+
+
+def cmd_finalize(args) -> int:
+    from pytracer.storage.finalize import finalize_experiment
+
+    config = _load_config()
+    result = finalize_experiment(
+        args.experiment_dir,
+        jobs=args.jobs,
+        force=args.force,
+        row_group_size=config.storage.parquet_row_group_size,
+    )
+    for warning in result.warnings:
+        print(f"warning: {warning}", file=sys.stderr)
+    print(
+        f"finalized {len(result.finalized)} run(s), "
+        f"{len(result.skipped)} already up to date"
+    )
+    return 0
+
+
 def cmd_analyze(args) -> int:
-    from pytracer.analysis import analyze_experiment
+    from pytracer.analysis import analyze
 
-    alignment, aggregation, _coverage = analyze_experiment(
-        args.experiment_dir, alignment_mode=args.alignment
+    config = _load_config()
+    _finalize_deferred(args.experiment_dir, config)
+    summary, _aggregation, _coverage = analyze(
+        args.experiment_dir,
+        alignment_mode=args.alignment,
+        engine=args.engine or config.analysis.engine,
+        incremental=args.incremental,
     )
-    summary = alignment.summary_dict()
     print(
         f"aligned {summary['matched_call_groups']}/{summary['total_call_groups']} "
         f"call groups across {summary['runs']} runs "
@@ -408,6 +543,8 @@ def cmd_export(args) -> int:
 _COMMANDS = {
     "init": cmd_init,
     "run": cmd_run,
+    "ingest": cmd_ingest,
+    "finalize": cmd_finalize,
     "analyze": cmd_analyze,
     "report": cmd_report,
     "config": cmd_config,
@@ -21,17 +21,46 @@ DEFAULT_TOML = """\
 plugins = ["numpy"]
 targets = []                    # extra targets, e.g. ["numpy.linalg.*", "mymodule.solver"]
 instrumentation = "hybrid"      # hybrid (patch+monitor) | patch | monitor | taint (hybrid+T3)
-mode = "summary"                # summary | metadata
+mode = "summary"                # summary | sampled (estimates for large arrays) | metadata
+scope = "all"                   # all | regions (record only inside pytracer.region blocks)
+sample_threshold = 1000000      # sampled: arrays with more elements are summarized from a sample
+sample_size = 65536             # sampled: elements in that sample
+summary_cache = 256             # summaries memoized for arrays passed again unchanged; 0 = off
+summary_cache_validate = "exact"  # exact (content-checked) | sampled (off after in-place writes)
+call_sampling = "all"           # all | every (1-in-K after the first N) | backoff (exponential)
+call_sampling_first = 1000      # calls recorded in full per callsite before sampling starts
+call_sampling_every = 100       # every: then record 1 call in this many
 capture_backtrace = true
 store_arrays = "auto"          # auto | always | never; enables element-wise sig
 array_store_threshold = 100000 # max elements per stored array in auto mode
 array_backend = "auto"         # auto | npy | zarr (compressed; pip install pytracer[arrays])
+capture_format = "jsonl"       # jsonl | binary (interned, checksummed records; smaller)
+writer = "sync"                # sync | async (background writer thread)
+writer_queue_size = 65536      # async: events buffered before backpressure applies
+writer_backpressure = "block"  # async: block | drop (counted) | spill (write inline)
+transport = "file"             # file | pipe (also stream events live to the orchestrator)
+
+[run]
+executor = "local"              # local | ssh (run.hosts, shared filesystem) | batch (job array)
+start_method = "spawn"          # spawn (fresh interpreter per run) | forkserver (warm zygote)
+jobs = 1                        # repetitions run concurrently
+pin_cpus = false                # jobs > 1: pin each job to its own share of the CPUs
+partition_threads = true        # jobs > 1: OMP/OPENBLAS/MKL_NUM_THREADS = CPUs per job
+hosts = []                      # ssh: job slot j runs on hosts[j % len(hosts)]
+ssh_command = ["ssh"]           # ssh: command prefix; the host and remote command follow
+python = ""                     # ssh / batch: interpreter on the nodes (default: this one)
+adaptive = false                # run in waves until sig estimates converge (--repeat = budget)
+wave_size = 5                   # adaptive: runs per wave
+target_ci_bits = 1.0            # adaptive: stop once every 95% CI of min sig is this narrow
 
 [storage]
 output_dir = ".pytracer/runs"
+parquet_row_group_size = 65536  # events.parquet is written in batches of this many rows
+finalize = "background"         # background (process pool, overlaps later runs) | inline | deferred
 
 [analysis]
 alignment = "callsite"          # strict | callsite | fuzzy
+engine = "auto"                 # auto (columnar when the runs allow it) | records | columnar
 
 # Per-run environment for an external perturbation backend; values may use
 # {run_index} and {run_id}. Example:
@@ -12,15 +12,26 @@ from typing import Any, Literal
 from pytracer._errors import ConfigError
 
 Instrumentation = Literal["hybrid", "patch", "monitor", "taint"]
-TraceMode = Literal["summary", "metadata"]
+TraceMode = Literal["summary", "sampled", "metadata"]
 AlignmentMode = Literal["strict", "callsite", "fuzzy"]
 ReportFormat = Literal["markdown", "html", "json"]
 
 _VALID_INSTRUMENTATION = ("hybrid", "patch", "monitor", "taint")
-_VALID_MODES = ("summary", "metadata")
+_VALID_MODES = ("summary", "sampled", "metadata")
 _VALID_ALIGNMENT = ("strict", "callsite", "fuzzy")
 _VALID_FORMATS = ("markdown", "html", "json")
 _VALID_STORE_ARRAYS = ("auto", "always", "never")
+_VALID_CAPTURE_FORMATS = ("jsonl", "binary")
+_VALID_WRITERS = ("sync", "async")
+_VALID_BACKPRESSURE = ("block", "drop", "spill")
+_VALID_TRANSPORTS = ("file", "pipe")
+_VALID_CACHE_VALIDATORS = ("exact", "sampled")
+_VALID_CALL_SAMPLING = ("all", "every", "backoff")
+_VALID_SCOPES = ("all", "regions")
+_VALID_START_METHODS = ("spawn", "forkserver")
+_VALID_EXECUTORS = ("local", "ssh", "batch")
+_VALID_FINALIZE = ("background", "inline", "deferred")
+_VALID_ENGINES = ("auto", "records", "columnar")
 
 
 @dataclass(slots=True)
@@ -29,21 +40,52 @@ class TraceConfig:
     targets: list[str] = field(default_factory=list)
     instrumentation: str = "hybrid"
     mode: str = "summary"
+    scope: str = "all"
+    sample_threshold: int = 1_000_000
+    sample_size: int = 65_536
+    summary_cache: int = 256
+    summary_cache_validate: str = "exact"
+    call_sampling: str = "all"
+    call_sampling_first: int = 1000
+    call_sampling_every: int = 100
     capture_backtrace: bool = True
     store_arrays: str = "auto"
     array_store_threshold: int = 100_000
     array_backend: str = "auto"
     native_census: bool = False
+    capture_format: str = "jsonl"
+    writer: str = "sync"
+    writer_queue_size: int = 65_536
+    writer_backpressure: str = "block"
+    transport: str = "file"
+
+
+@dataclass(slots=True)
+class RunConfig:
+    executor: str = "local"
+    start_method: str = "spawn"
+    jobs: int = 1
+    pin_cpus: bool = False
+    partition_threads: bool = True
+    hosts: list[str] = field(default_factory=list)
+    ssh_command: list[str] = field(default_factory=lambda: ["ssh"])
+    python: str = ""
+    adaptive: bool = False
+    wave_size: int = 5
+    target_ci_bits: float = 1.0
 
 
 @dataclass(slots=True)
 class StorageConfig:
     output_dir: str = ".pytracer/runs"
+    parquet_row_group_size: int = 65536  # events.parquet rows per row group (and per batch)
+    finalize: str = "background"  # background | inline | deferred (see storage.finalize)
 
 
 @dataclass(slots=True)
 class AnalysisConfig:
     alignment: str = "callsite"
+    engine: str = "auto"  # auto | records | columnar (see analysis.columnar)
 
 
 @dataclass(slots=True)
@@ -67,6 +109,7 @@ class ReportConfig:
 @dataclass(slots=True)
 class PytracerConfig:
     trace: TraceConfig = field(default_factory=TraceConfig)
+    run: RunConfig = field(default_factory=RunConfig)
     storage: StorageConfig = field(default_factory=StorageConfig)
     analysis: AnalysisConfig = field(default_factory=AnalysisConfig)
     perturb: PerturbConfig = field(default_factory=PerturbConfig)
@@ -88,6 +131,29 @@ class PytracerConfig:
                 "trace.array_backend must be one of ('auto', 'npy', 'zarr'), "
                 f"got {self.trace.array_backend!r}"
             )
+        if self.trace.capture_format not in _VALID_CAPTURE_FORMATS:
+            raise ConfigError(
+                f"trace.capture_format must be one of {_VALID_CAPTURE_FORMATS}, "
+                f"got {self.trace.capture_format!r}"
+            )
+        if self.trace.writer not in _VALID_WRITERS:
+            raise ConfigError(
+                f"trace.writer must be one of {_VALID_WRITERS}, got {self.trace.writer!r}"
+            )
+        if self.trace.transport not in _VALID_TRANSPORTS:
+            raise ConfigError(
+                f"trace.transport must be one of {_VALID_TRANSPORTS}, "
+                f"got {self.trace.transport!r}"
+            )
+        if self.trace.writer_backpressure not in _VALID_BACKPRESSURE:
+            raise ConfigError(
+                f"trace.writer_backpressure must be one of {_VALID_BACKPRESSURE}, "
+                f"got {self.trace.writer_backpressure!r}"
+            )
+        if not isinstance(self.trace.writer_queue_size, int) or (
+            self.trace.writer_queue_size < 1
+        ):
+            raise ConfigError("trace.writer_queue_size must be a positive integer")
         if not isinstance(self.trace.array_store_threshold, int) or (
             self.trace.array_store_threshold < 0
         ):
@@ -96,11 +162,75 @@ class PytracerConfig:
             raise ConfigError(
                 f"trace.mode must be one of {_VALID_MODES}, got {self.trace.mode!r}"
             )
+        for name, count in (
+            ("trace.sample_threshold", self.trace.sample_threshold),
+            ("trace.sample_size", self.trace.sample_size),
+        ):
+            if not isinstance(count, int) or count < 1:
+                raise ConfigError(f"{name} must be a positive integer")
+        if not isinstance(self.trace.summary_cache, int) or self.trace.summary_cache < 0:
+            raise ConfigError("trace.summary_cache must be a non-negative integer")
+        if self.trace.summary_cache_validate not in _VALID_CACHE_VALIDATORS:
+            raise ConfigError(
+                f"trace.summary_cache_validate must be one of {_VALID_CACHE_VALIDATORS}, "
+                f"got {self.trace.summary_cache_validate!r}"
+            )
+        if self.trace.scope not in _VALID_SCOPES:
+            raise ConfigError(
+                f"trace.scope must be one of {_VALID_SCOPES}, got {self.trace.scope!r}"
+            )
+        if self.trace.call_sampling not in _VALID_CALL_SAMPLING:
+            raise ConfigError(
+                f"trace.call_sampling must be one of {_VALID_CALL_SAMPLING}, "
+                f"got {self.trace.call_sampling!r}"
+            )
+        if not isinstance(self.trace.call_sampling_first, int) or (
+            self.trace.call_sampling_first < 0
+        ):
+            raise ConfigError("trace.call_sampling_first must be a non-negative integer")
+        if not isinstance(self.trace.call_sampling_every, int) or (
+            self.trace.call_sampling_every < 1
+        ):
+            raise ConfigError("trace.call_sampling_every must be a positive integer")
+        if self.run.start_method not in _VALID_START_METHODS:
+            raise ConfigError(
+                f"run.start_method must be one of {_VALID_START_METHODS}, "
+                f"got {self.run.start_method!r}"
+            )
+        if not isinstance(self.run.jobs, int) or self.run.jobs < 1:
+            raise ConfigError("run.jobs must be a positive integer")
+        if self.run.executor not in _VALID_EXECUTORS:
+            raise ConfigError(
+                f"run.executor must be one of {_VALID_EXECUTORS}, got {self.run.executor!r}"
+            )
+        if self.run.executor == "ssh" and not self.run.hosts:
+            raise ConfigError("run.executor = 'ssh' needs at least one entry in run.hosts")
+        if not isinstance(self.run.wave_size, int) or self.run.wave_size < 2:
+            raise ConfigError("run.wave_size must be an integer >= 2")
+        if not isinstance(self.run.target_ci_bits, (int, float)) or (
+            self.run.target_ci_bits <= 0
+        ):
+            raise ConfigError("run.target_ci_bits must be a positive number")
+        if not self.run.ssh_command:
+            raise ConfigError("run.ssh_command must not be empty")
+        if not isinstance(self.storage.parquet_row_group_size, int) or (
+            self.storage.parquet_row_group_size < 1
+        ):
+            raise ConfigError("storage.parquet_row_group_size must be a positive integer")
+        if self.storage.finalize not in _VALID_FINALIZE:
+            raise ConfigError(
+                f"storage.finalize must be one of {_VALID_FINALIZE}, "
+                f"got {self.storage.finalize!r}"
+            )
         if self.analysis.alignment not in _VALID_ALIGNMENT:
             raise ConfigError(
                 f"analysis.alignment must be one of {_VALID_ALIGNMENT}, "
                 f"got {self.analysis.alignment!r}"
             )
+        if self.analysis.engine not in _VALID_ENGINES:
+            raise ConfigError(
+                f"analysis.engine must be one of {_VALID_ENGINES}, got {self.analysis.engine!r}"
+            )
         for fmt in self.report.formats:
             if fmt not in _VALID_FORMATS:
                 raise ConfigError(
@@ -109,6 +239,8 @@ class PytracerConfig:
         for name, value in (
             ("trace.plugins", self.trace.plugins),
             ("trace.targets", self.trace.targets),
+            ("run.hosts", self.run.hosts),
+            ("run.ssh_command", self.run.ssh_command),
         ):
             if not isinstance(value, list) or not all(isinstance(x, str) for x in value):
                 raise ConfigError(f"{name} must be a list of strings")
@@ -131,6 +263,7 @@ class PytracerConfig:
 
 _SECTIONS = {
     "trace": TraceConfig,
+    "run": RunConfig,
     "storage": StorageConfig,
     "analysis": AnalysisConfig,
     "perturb": PerturbConfig,
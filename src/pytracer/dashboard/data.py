@@ -5,6 +5,11 @@ aggregates (never recomputed) plus the raw per-call records, re-aligned
 in memory so the dashboard can offer call-level drill-down that the JSON
 summaries do not carry. Array payloads and event timelines are loaded
 lazily and cached.
+
+When every run has a trace index (trace.index; built on first open when
+missing), startup aligns call stubs read from the indexes without decoding
+any event; a group's full calls are decoded when first needed, and the
+timeline rows of a function when it is first displayed.
 """
 
 from __future__ import annotations
@@ -15,13 +20,13 @@ from typing import Any
 
 import numpy as np
 
-from pytracer._errors import AlignmentError
+from pytracer._errors import AlignmentError, PytracerError
 from pytracer.analysis.aggregate import SIG_CAP_BITS, sig_bits
 from pytracer.analysis.align import align, load_experiment_calls
 from pytracer.report.model import build_report_data
 from pytracer.storage.arrays import load_array
+from pytracer.trace.index import TraceIndex, open_index
 from pytracer.trace.reader import CallRecord
-from pytracer.trace.writer import EVENTS_FILENAME
 
 MAX_TIMELINE_POINTS_WEBGL = 5_000
 MAX_GANTT_SPANS = 400
@@ -67,7 +72,13 @@ class ExperimentData:
         self.experiment_dir = Path(experiment_dir)
         self.report = build_report_data(self.experiment_dir)
 
-        run_ids, calls_per_run, truncated = load_experiment_calls(self.experiment_dir)
+        self.indexes: list[TraceIndex] | None = self._open_indexes()
+        if self.indexes is not None:
+            run_ids = [index.run_dir.name for index in self.indexes]
+            calls_per_run = [index.call_stubs() for index in self.indexes]
+            truncated = [index.run_dir.name for index in self.indexes if index.truncated]
+        else:
+            run_ids, calls_per_run, truncated = load_experiment_calls(self.experiment_dir)
         self.run_ids: list[str] = run_ids
         self.run_dirs = [self.experiment_dir / "runs" / run_id for run_id in run_ids]
         mode = self.report.get("alignment", {}).get("alignment_mode", "callsite")
@@ -81,26 +92,62 @@ class ExperimentData:
                                    truncated_runs=truncated)
 
         self.functions: list[str] = [r["function"] for r in self.report.get("functions", [])]
-        self.timeline_rows: list[dict] = self._build_timeline_rows()
+        self._timeline_rows: list[dict] | None = None
+        self._function_rows: dict[str, list[dict]] = {}
+        self._group_calls: dict[int, list[CallRecord | None]] = {}
         self._element_cache: dict[tuple[int, str, str], tuple | None] = {}
         self._source_cache: dict[tuple[str | None, int | None], dict | None] = {}
         self._spans_cache: dict[str, tuple[list[dict], int]] = {}
 
+    def _open_indexes(self) -> list[TraceIndex] | None:
+        runs_dir = self.experiment_dir / "runs"
+        if not runs_dir.is_dir():
+            return None
+        indexes: list[TraceIndex] = []
+        for run_dir in sorted(p for p in runs_dir.iterdir() if p.is_dir()):
+            try:
+                index = open_index(run_dir, build=True)
+            except (OSError, PytracerError):
+                index = None
+            if index is None:
+                for opened in indexes:
+                    opened.close()
+                return None
+            indexes.append(index)
+        return indexes or None
+
     # ---------------------------------------------------------------- timeline
 
-    def _build_timeline_rows(self) -> list[dict]:
-        """One row per (aligned call group, argument, phase).
+    @property
+    def timeline_rows(self) -> list[dict]:
+        if self._timeline_rows is None:
+            self._timeline_rows = self._build_timeline_rows(range(len(self.alignment.groups)))
+        return self._timeline_rows
+
+    @property
+    def has_arrays(self) -> bool:
+        """Some complete group stored array payloads in every run."""
+        return any(
+            group.complete
+            and all(c.input_refs or c.output_refs for c in group.calls if c is not None)
+            for group in self.alignment.groups
+        )
+
+    def _build_timeline_rows(self, gidxs) -> list[dict]:
+        """One row per (aligned call group, argument, phase), for *gidxs*.
 
         ``x`` is the per-function invocation index in program order, the
-        cross-run equivalent of pytracer 1's per-call timeline axis.
+        cross-run equivalent of pytracer 1's per-call timeline axis; it is
+        only right when *gidxs* holds every group of the functions involved.
         """
         rows: list[dict] = []
         counters: dict[str, int] = {}
-        for gidx, group in enumerate(self.alignment.groups):
+        for gidx in gidxs:
+            group = self.alignment.groups[gidx]
             function = group.function
             x = counters.get(function, 0)
             counters[function] = x + 1
-            calls = [c for c in group.calls if c is not None]
+            calls = [c for c in self.group_calls(gidx) if c is not None]
             file, lineno = group.key[3], group.key[4]
             exception = next((c.exception for c in calls if c.exception), None)
             tier = calls[0].tier if calls else ""
@@ -160,8 +207,23 @@ class ExperimentData:
     def timeline_for(self, functions: list[str], phases: list[str]) -> list[dict]:
         wanted = set(functions)
         phase_set = set(phases)
+        if self._timeline_rows is not None:
+            rows = self._timeline_rows
+        else:  # only decode the calls of the functions on display
+            missing = wanted - set(self._function_rows)
+            if missing:
+                for function in missing:
+                    self._function_rows[function] = []
+                gidxs = [
+                    i for i, g in enumerate(self.alignment.groups) if g.function in missing
+                ]
+                for row in self._build_timeline_rows(gidxs):
+                    self._function_rows[row["function"]].append(row)
+            rows = sorted(
+                (r for f in wanted for r in self._function_rows[f]), key=lambda r: r["gidx"]
+            )
         return [
-            r for r in self.timeline_rows
+            r for r in rows
             if r["function"] in wanted and r["phase"] in phase_set
         ]
 
@@ -257,7 +319,17 @@ class ExperimentData:
     # ------------------------------------------------------------- drill-down
 
     def group_calls(self, gidx: int) -> list[CallRecord | None]:
-        return self.alignment.groups[gidx].calls
+        """The group's calls with their argument summaries, one slot per run."""
+        calls = self.alignment.groups[gidx].calls
+        if self.indexes is None:
+            return calls
+        decoded = self._group_calls.get(gidx)
+        if decoded is None:
+            decoded = self._group_calls[gidx] = [
+                index.call(stub.call_id) if stub is not None else None
+                for index, stub in zip(self.indexes, calls, strict=True)
+            ]
+        return decoded
 
     def group_detail(self, gidx: int, phase: str, arg: str) -> list[dict[str, Any]]:
         """Per-run summary statistics for one argument of one aligned call."""
@@ -354,16 +426,15 @@ class ExperimentData:
         if run_id in self._spans_cache:
             return self._spans_cache[run_id]
 
-        from pytracer.trace.reader import iter_events
+        from pytracer.trace.reader import EventStream, find_events_file
 
         run_dir = self.experiment_dir / "runs" / run_id
-        events_path = run_dir / EVENTS_FILENAME
-        if not events_path.is_file():
+        events_path = find_events_file(run_dir)
+        if events_path is None:
             return [], 0
-        events, _ = iter_events(events_path)
         spans: dict[int, dict] = {}
         parents: dict[int, int | None] = {}
-        for ev in events:
+        for ev in EventStream(events_path):
             if ev.ts_ns is None:
                 continue
             span = spans.setdefault(ev.call_id, {
@@ -374,6 +445,7 @@ class ExperimentData:
                 "start": ev.ts_ns,
                 "end": ev.ts_ns,
                 "exception": None,
+                "region": ev.region,
             })
             parents.setdefault(ev.call_id, ev.parent_call_id)
             span["start"] = min(span["start"], ev.ts_ns)
@@ -401,6 +473,7 @@ class ExperimentData:
                 "dur_us": max((s["end"] - s["start"]) / 1_000, 0.001),
                 "depth": depth(call_id),
                 "exception": s["exception"],
+                "region": s["region"],
             })
         total = len(out)
         out.sort(key=lambda s: -s["dur_us"])
@@ -486,7 +486,8 @@ def callgraph_figure(graph: dict):
 # -------------------------------------------------------------------- gantt
 
 def gantt_figure(spans: list[dict], total: int, run_id: str):
-    """Horizontal call-span timeline for one run, colored by tier."""
+    """Horizontal call-span timeline for one run, colored by tier, or by
+    pytracer.region when the run used regions."""
     import plotly.graph_objects as go
 
     if not spans:
@@ -497,17 +498,32 @@ def gantt_figure(spans: list[dict], total: int, run_id: str):
     # sub-pixel spans stay clickable: enforce a minimum rendered duration
     t_max = max(s["start_us"] + s["dur_us"] for s in spans)
     min_dur = max(t_max, 1.0) * 0.004
-    for tier in sorted({s["tier"] for s in spans}):
-        idx = [i for i, s in enumerate(spans) if s["tier"] == tier]
+    by_region = any(s.get("region") for s in spans)
+    if by_region:
+        regions = sorted({s.get("region") or "" for s in spans})
+        groups = [
+            (region or "(no region)",
+             [i for i, s in enumerate(spans) if (s.get("region") or "") == region],
+             theme.CATEGORICAL[k % len(theme.CATEGORICAL)] if region else theme.MUTED)
+            for k, region in enumerate(regions)
+        ]
+    else:
+        groups = [
+            (f"tier {tier}",
+             [i for i, s in enumerate(spans) if s["tier"] == tier],
+             theme.TIER_COLORS.get(tier, theme.MUTED))
+            for tier in sorted({s["tier"] for s in spans})
+        ]
+    for name, idx, color in groups:
         fig.add_trace(go.Bar(
-            name=f"tier {tier}",
+            name=name,
             base=[spans[i]["start_us"] for i in idx],
             x=[max(spans[i]["dur_us"], min_dur) for i in idx],
             y=[lanes[i] for i in idx],
             orientation="h",
             width=0.72,
             marker={
-                "color": theme.TIER_COLORS.get(tier, theme.MUTED),
+                "color": color,
                 "cornerradius": 3,
                 "line": {"color": theme.SURFACE, "width": 1},
             },
@@ -177,7 +177,7 @@ def overview_tab(data: ExperimentData, dash_table):
         columns = ["function", "sig_basis", "min_output_sig_bits",
                    "median_output_sig_bits", "max_amplification_bits",
                    "divergence_score", "n_call_groups", "n_matched",
-                   "nan_instability", "inf_instability"]
+                   "nan_instability", "inf_instability", "sampled"]
         children += [
             html.H3("Functions"),
             html.Div(data_table(dash_table, functions, columns, "functions-table"),
@@ -186,7 +186,7 @@ def overview_tab(data: ExperimentData, dash_table):
     if arguments:
         columns = ["function", "arg_name", "phase", "sig_basis", "sig_min_bits",
                    "sig_p05_bits", "sig_median_bits", "sig_mean_bits",
-                   "mean_of_means", "std_of_means", "n_call_groups"]
+                   "mean_of_means", "std_of_means", "n_call_groups", "sampled"]
         children += [
             html.H3("Arguments & outputs"),
             html.Div(data_table(dash_table, arguments, columns, "arguments-table"),
@@ -217,7 +217,7 @@ def explorer_tab(data: ExperimentData):
     function_options = [{"label": f, "value": f} for f in data.functions]
     top = [r["function"] for r in data.report.get("top_unstable", [])]
     default = top[:3] if top else data.functions[:3]
-    any_arrays = any(r["has_arrays"] for r in data.timeline_rows)
+    any_arrays = data.has_arrays
 
     controls = html.Div([
         html.Div([
@@ -0,0 +1,217 @@
+"""Executor backends: where and how an experiment's runs execute.
+
+``run.executor`` selects one:
+
+- ``local``: subprocesses on this machine, spawned or forked from a warm
+  zygote (``run.start_method``, see pytracer._forkserver);
+- ``ssh``: ``python -m pytracer._bootstrap <spec.json>`` on ``run.hosts``
+  over ``run.ssh_command``, which assumes the experiment directory, the
+  script and the interpreter are at the same paths there (a shared
+  filesystem);
+- ``batch``: runs nothing. It writes each run's environment next to its
+  spec.json plus a job-array script (``submit.sh``: SLURM headers, also
+  runnable under PBS or by hand with the run index as argument); once the
+  jobs are done, ``pytracer ingest`` collects the run directories.
+
+Every run is described by its self-contained ``runs/run-NNN/spec.json``,
+so only the spec path and the run-specific environment variables
+(``RunLaunch.run_env``) cross the machine boundary. CPU pinning, thread
+partitioning, the native census and the pipe transport describe this
+machine's processes and apply to the local executor only.
+"""
+
+from __future__ import annotations
+
+import shlex
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pytracer._errors import ExperimentError
+
+if TYPE_CHECKING:
+    from pytracer._forkserver import ForkServer
+
+EXECUTORS = ("local", "ssh", "batch")
+BATCH_SCRIPT = "submit.sh"
+RUN_ENV_FILENAME = "run.env"
+
+
+@dataclass(slots=True)
+class RunLaunch:
+    """One run, ready to execute."""
+
+    index: int
+    run_id: str
+    run_dir: Path
+    spec_path: Path
+    cwd: Path
+    env: dict[str, str]  # complete environment of a local run
+    run_env: dict[str, str]  # run-specific variables only (remote executors)
+    slot: int = 0  # job slot (0 .. run.jobs - 1)
+    stream_fd: int | None = None
+
+
+class Executor:
+    """Base class: ``run`` is called from job threads, up to run.jobs at once."""
+
+    name = ""
+    local = False  # runs are processes of this machine
+    supports_stream = False  # can hand the trace.transport pipe to the run
+
+    def __init__(self) -> None:
+        self.warnings: list[str] = []
+
+    def start(self, base_env: dict[str, str], cwd: Path, target_specs: list[str]) -> dict:
+        """Prepare for the first run; returns entries for experiment.json."""
+        return {}
+
+    def run(self, launch: RunLaunch) -> int | None:
+        """Execute one run and return its exit code (None: submitted, not run)."""
+        raise NotImplementedError
+
+    def finish(self, experiment_dir: Path, n_runs: int, jobs: int, first_index: int = 0) -> dict:
+        """After the last launch of runs first_index .. first_index + n_runs - 1;
+        returns entries for experiment.json."""
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+def _bootstrap_command(python: str, spec_path: Path) -> list[str]:
+    return [python, "-m", "pytracer._bootstrap", str(spec_path)]
+
+
+class LocalExecutor(Executor):
+    name = "local"
+    local = True
+    supports_stream = True
+
+    def __init__(self, start_method: str = "spawn"):
+        super().__init__()
+        self.start_method = start_method
+        self._server: ForkServer | None = None
+
+    def start(self, base_env: dict[str, str], cwd: Path, target_specs: list[str]) -> dict:
+        if self.start_method != "forkserver":
+            return {"start_method": "spawn"}
+        from pytracer._forkserver import ForkServer
+
+        try:
+            server = ForkServer(target_specs, base_env, str(cwd))
+        except (ExperimentError, OSError) as e:
+            self.warnings.append(f"fork server failed to start ({e}); spawning runs")
+            return {"start_method": "spawn"}
+        self._server = server
+        return {"start_method": "forkserver", "forkserver_preload_s": server.preload_s}
+
+    def run(self, launch: RunLaunch) -> int:
+        server = self._server
+        if server is not None and server.alive:
+            try:
+                return server.run(launch.spec_path, launch.env, launch.stream_fd)
+            except ExperimentError as e:
+                # the zygote is gone: spawn this run afresh, and the rest too
+                self.warnings.append(f"{launch.run_id}: {e}; spawning the remaining runs")
+        proc = subprocess.run(
+            _bootstrap_command(sys.executable, launch.spec_path),
+            env=launch.env,
+            cwd=str(launch.cwd),
+            pass_fds=(launch.stream_fd,) if launch.stream_fd is not None else (),
+        )
+        return proc.returncode
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+
+
+class SSHExecutor(Executor):
+    """Job slot j runs on ``hosts[j % len(hosts)]``; list a host twice for two slots."""
+
+    name = "ssh"
+
+    def __init__(self, hosts: list[str], ssh_command: list[str], python: str = ""):
+        super().__init__()
+        if not hosts:
+            raise ExperimentError("run.executor = 'ssh' needs run.hosts")
+        self.hosts = hosts
+        self.ssh_command = ssh_command
+        self.python = python or sys.executable
+
+    def start(self, base_env: dict[str, str], cwd: Path, target_specs: list[str]) -> dict:
+        return {"hosts": self.hosts}
+
+    def run(self, launch: RunLaunch) -> int:
+        host = self.hosts[launch.slot % len(self.hosts)]
+        assignments = [f"{k}={v}" for k, v in launch.run_env.items()]
+        remote = (
+            f"cd {shlex.quote(str(launch.cwd))} && "
+            + shlex.join(["env", *assignments, *_bootstrap_command(self.python, launch.spec_path)])
+        )
+        try:
+            proc = subprocess.run([*self.ssh_command, host, remote], stdin=subprocess.DEVNULL)
+        except OSError as e:
+            self.warnings.append(f"{launch.run_id}: cannot run {self.ssh_command[0]!r}: {e}")
+            return 1
+        return proc.returncode
+
+
+class BatchExecutor(Executor):
+    name = "batch"
+
+    def __init__(self, python: str = ""):
+        super().__init__()
+        self.python = python or sys.executable
+        self._cwd: Path | None = None
+
+    def start(self, base_env: dict[str, str], cwd: Path, target_specs: list[str]) -> dict:
+        self._cwd = cwd
+        return {}
+
+    def run(self, launch: RunLaunch) -> None:
+        lines = [f"{k}={shlex.quote(v)}" for k, v in launch.run_env.items()]
+        (launch.run_dir / RUN_ENV_FILENAME).write_text("\n".join(lines) + "\n")
+        return None
+
+    def finish(self, experiment_dir: Path, n_runs: int, jobs: int, first_index: int = 0) -> dict:
+        runs = (experiment_dir / "runs").resolve()
+        limit = f"%{jobs}" if jobs > 1 else ""
+        script = experiment_dir / BATCH_SCRIPT
+        script.write_text(
+            "#!/bin/bash\n"
+            f"#SBATCH --job-name=pytracer-{experiment_dir.name}\n"
+            f"#SBATCH --array={first_index}-{first_index + n_runs - 1}{limit}\n"
+            f"#SBATCH --output={runs}/slurm-%A_%a.out\n"
+            "# Job array of pytracer runs; afterwards: pytracer ingest "
+            f"{shlex.quote(str(experiment_dir.resolve()))}\n"
+            "set -euo pipefail\n"
+            'INDEX="${SLURM_ARRAY_TASK_ID:-${PBS_ARRAY_INDEX:-$1}}"\n'
+            f'RUN_DIR="$(printf "%s/run-%03d" {shlex.quote(str(runs))} "$INDEX")"\n'
+            f'set -a; source "$RUN_DIR/{RUN_ENV_FILENAME}"; set +a\n'
+            f"cd {shlex.quote(str(self._cwd))}\n"
+            f'exec {shlex.quote(self.python)} -m pytracer._bootstrap "$RUN_DIR/spec.json"\n'
+        )
+        script.chmod(0o755)
+        return {"submit_script": str(script)}
+
+
+def make_executor(
+    name: str,
+    *,
+    start_method: str = "spawn",
+    hosts: list[str] | None = None,
+    ssh_command: list[str] | None = None,
+    python: str = "",
+) -> Executor:
+    if name == "local":
+        return LocalExecutor(start_method)
+    if name == "ssh":
+        return SSHExecutor(hosts or [], ssh_command or ["ssh"], python)
+    if name == "batch":
+        return BatchExecutor(python)
+    raise ExperimentError(f"executor must be one of {EXECUTORS}, got {name!r}")
+
@@ -6,17 +6,51 @@ Directory layout:
       .pytracer-experiment          # ownership marker (clean only deletes marked dirs)
       config.toml                   # resolved config snapshot
       experiment.json               # experiment-level metadata
-      runs/run-000/{metadata.json, events.jsonl, events.parquet, monitor.json}
+      runs/run-000/{metadata.json, events.jsonl|events.ptb, events.parquet, monitor.json}
       analysis/                     # written by pytracer analyze / run
       report/                       # written by pytracer report / run
     <output_dir>/latest -> <experiment_id>
+
+With ``trace.transport = "pipe"`` each run also streams its events back
+(see trace.stream); a completely streamed run carries its assembled calls
+on ``RunResult.calls`` so analysis can skip re-reading its capture file.
+
+With ``run.start_method = "forkserver"`` runs are forked from one warm
+zygote per experiment instead of spawned (see pytracer._forkserver).
+Either way each run's startup time (launch request -> script start) is
+recorded in experiment.json.
+
+``run.jobs`` runs up to N repetitions concurrently. Run ids and perturb.env
+templating still follow the run index, whatever order runs finish in;
+``run.pin_cpus`` and ``run.partition_threads`` split this process's CPUs
+between jobs so concurrent runs do not oversubscribe them.
+
+``extend=<experiment dir>`` (``pytracer run --extend``) appends runs to an
+existing experiment of the same script, numbered after the runs already
+there; ``pytracer analyze --incremental`` then folds only the new runs into
+the saved analysis state (see analysis.incremental).
+
+Each run's events.parquet and trace index are built in a process pool
+that overlaps with the runs still to come (``storage.finalize``, see
+storage.finalize).
+
+``run.adaptive`` treats ``repeat`` as a budget: runs go in waves, and
+after each wave its runs are folded into an in-memory analysis state
+(analysis.incremental) and aggregated; the experiment stops once every
+function's ``min_output_sig_bits`` has a 95% bootstrap confidence interval
+narrower than ``run.target_ci_bits`` (see analysis.aggregate). Each
+wave is recorded in experiment.json, whose ``repeat`` counts the runs
+actually launched and ``repeat_budget`` the runs asked for.
 """
 
 from __future__ import annotations
 
 import json
-import subprocess
-import sys
+import os
+import queue
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
@@ -25,6 +59,9 @@ import tomli_w
 
 from pytracer._errors import ExperimentError
 from pytracer.config.schema import PytracerConfig
+from pytracer.executors import LocalExecutor, RunLaunch, make_executor
+from pytracer.storage.finalize import BackgroundFinalizer
+from pytracer.trace.reader import CallRecord
 
 MARKER = ".pytracer-experiment"
 
@@ -34,6 +71,8 @@ class RunResult:
     run_id: str
     run_dir: Path
     exit_code: int
+    calls: list[CallRecord] | None = None  # streamed (transport = "pipe") and complete
+    startup_s: float | None = None
 
 
 @dataclass(slots=True)
@@ -42,11 +81,17 @@ class ExperimentResult:
     experiment_dir: Path
     runs: list[RunResult] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
+    submit_script: Path | None = None  # run.executor = "batch": runs are queued, not run
 
     @property
     def failed_runs(self) -> list[RunResult]:
         return [r for r in self.runs if r.exit_code != 0]
 
+    @property
+    def streamed_calls(self) -> dict[str, list[CallRecord]]:
+        """Run id -> calls, for the runs whose event stream arrived complete."""
+        return {r.run_id: r.calls for r in self.runs if r.calls is not None}
+
 
 def create_experiment_dir(output_dir: str | Path, config: PytracerConfig) -> tuple[str, Path]:
     experiment_id = datetime.now(UTC).strftime("%Y-%m-%dT%H-%M-%S.%f")[:-3] + "Z"
@@ -68,6 +113,44 @@ def _update_latest(output_dir: Path, experiment_id: str) -> None:
         pass  # symlinks may be unsupported; "latest" is a convenience only
 
 
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+@dataclass(slots=True)
+class JobSlot:
+    """Resources of one concurrent job (``run.jobs``); reused run after run."""
+
+    index: int
+    cpus: list[int] | None = None  # run.pin_cpus
+    threads: int | None = None  # run.partition_threads: BLAS/OpenMP threads per run
+
+
+def _job_slots(jobs: int, pin_cpus: bool, partition_threads: bool) -> list[JobSlot]:
+    """Split the CPUs available to this process evenly across *jobs* slots."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    per_job = max(1, len(cpus) // jobs)
+    slots = []
+    for j in range(jobs):
+        slot = JobSlot(index=j)
+        if pin_cpus and hasattr(os, "sched_setaffinity"):
+            start = (j * per_job) % len(cpus)
+            slot.cpus = cpus[start:start + per_job]
+        if partition_threads and jobs > 1:
+            slot.threads = per_job
+        slots.append(slot)
+    return slots
+
+
+def _run_startup(run_dir: Path) -> float | None:
+    try:
+        return json.loads((run_dir / "metadata.json").read_text()).get("startup_s")
+    except (OSError, ValueError):
+        return None
+
+
 def run_experiment(
     *,
     config: PytracerConfig,
@@ -77,19 +160,48 @@ def run_experiment(
     repeat: int,
     continue_on_error: bool = False,
     env_overrides: dict[str, str] | None = None,
+    on_progress: Callable[[str, dict], None] | None = None,
+    extend: str | Path | None = None,
 ) -> ExperimentResult:
+    """Run *repeat* repetitions of *script* in a new experiment directory,
+    or appended to the experiment at *extend*."""
     script_path = Path(script).resolve()
     if not script_path.is_file():
         raise ExperimentError(f"script not found: {script}")
     if repeat < 1:
         raise ExperimentError(f"--repeat must be >= 1, got {repeat}")
 
-    experiment_id, experiment_dir = create_experiment_dir(config.storage.output_dir, config)
+    previous: dict = {}
+    first_index = 0
+    if extend is not None:
+        experiment_dir = Path(extend)
+        previous = _load_experiment_meta(experiment_dir)
+        if previous.get("script") != str(script_path):
+            raise ExperimentError(
+                f"cannot extend {experiment_dir}: it traced {previous.get('script')}, "
+                f"not {script_path}"
+            )
+        experiment_id = previous["experiment_id"]
+        first_index = _next_run_index(experiment_dir)
+    else:
+        experiment_id, experiment_dir = create_experiment_dir(config.storage.output_dir, config)
     result = ExperimentResult(experiment_id=experiment_id, experiment_dir=experiment_dir)
 
+    executor = make_executor(
+        config.run.executor,
+        start_method=config.run.start_method,
+        hosts=config.run.hosts,
+        ssh_command=config.run.ssh_command,
+        python=config.run.python,
+    )
+
     native_shim = None
     native_libs: list[str] = []
-    if config.trace.native_census:
+    if config.trace.native_census and not executor.local:
+        result.warnings.append(
+            f"native census disabled: not available with the {executor.name} executor"
+        )
+    elif config.trace.native_census:
         from pytracer.instrumentation.native import ensure_shim, find_real_blas_libs
 
         native_shim, reason = ensure_shim()
@@ -98,23 +210,91 @@ def run_experiment(
         else:
             native_libs = find_real_blas_libs()
 
-    (experiment_dir / "experiment.json").write_text(
-        json.dumps(
-            {
-                "experiment_id": experiment_id,
-                "script": str(script_path),
-                "script_args": script_args,
-                "repeat": repeat,
-                "targets": target_specs,
-                "instrumentation": config.trace.instrumentation,
-            },
-            indent=2,
+    if isinstance(executor, LocalExecutor) and executor.start_method == "forkserver":
+        from pytracer._forkserver import forkserver_supported
+
+        unsupported = forkserver_supported()
+        if unsupported is None and native_shim is not None:
+            unsupported = "the native census needs LD_PRELOAD set per run"
+        if unsupported is not None:
+            result.warnings.append(f"fork server disabled: {unsupported}; spawning runs")
+            executor.start_method = "spawn"
+        elif config.perturb.env:
+            result.warnings.append(
+                "forkserver: perturb.env is applied after fork; libraries already "
+                "loaded by the zygote do not see it"
+            )
+
+    stream = config.trace.transport == "pipe"
+    if stream and not executor.supports_stream:
+        result.warnings.append(
+            f"trace.transport = 'pipe' is not available with the {executor.name} "
+            "executor; analysis reads the capture files"
         )
+        stream = False
+
+    finalize_mode = config.storage.finalize
+    if finalize_mode == "background" and executor.name == "batch":
+        finalize_mode = "inline"  # no orchestrator outlives the queued runs
+
+    jobs = config.run.jobs
+    slots = _job_slots(
+        jobs,
+        pin_cpus=config.run.pin_cpus and executor.local,
+        partition_threads=config.run.partition_threads and executor.local,
+    )
+    if config.run.pin_cpus and executor.local and not hasattr(os, "sched_setaffinity"):
+        result.warnings.append("run.pin_cpus: CPU affinity is unavailable on this platform")
+
+    # Thread partitioning goes into the base environment: libraries read it
+    # when they load, which for fork-server runs happens in the zygote.
+    base_env = dict(os.environ)
+    if slots[0].threads is not None:
+        for var in THREAD_ENV_VARS:
+            base_env.setdefault(var, str(slots[0].threads))
+    if env_overrides:
+        base_env.update(env_overrides)
+
+    experiment_meta: dict = {
+        **previous,
+        "experiment_id": experiment_id,
+        "script": str(script_path),
+        "script_args": script_args,
+        "repeat": previous.get("repeat", 0),  # runs launched; updated at the end
+        "repeat_budget": previous.get("repeat_budget", previous.get("repeat", 0)) + repeat,
+        "targets": target_specs,
+        "instrumentation": config.trace.instrumentation,
+        "executor": executor.name,
+        "jobs": jobs,
+        "finalize": finalize_mode,
+    }
+    experiment_json = experiment_dir / "experiment.json"
+    finalizer = (
+        BackgroundFinalizer(jobs, config.storage.parquet_row_group_size)
+        if finalize_mode == "background"
+        else None
     )
+    try:
+        experiment_meta.update(executor.start(base_env, script_path.parent, target_specs))
+    except BaseException:
+        executor.close()
+        if finalizer is not None:
+            finalizer.close()
+        raise
+    experiment_json.write_text(json.dumps(experiment_meta, indent=2))
+
+    free_slots: queue.SimpleQueue[JobSlot] = queue.SimpleQueue()
+    for slot in slots:
+        free_slots.put(slot)
 
-    import os
+    def launch(k: int) -> RunResult | None:
+        slot = free_slots.get()  # never blocks: at most `jobs` runs are in flight
+        try:
+            return run_in_slot(k, slot)
+        finally:
+            free_slots.put(slot)
 
-    for k in range(repeat):
+    def run_in_slot(k: int, slot: JobSlot) -> RunResult | None:
         run_id = f"run-{k:03d}"
         run_dir = (experiment_dir / "runs" / run_id).resolve()
         run_dir.mkdir(parents=True)
@@ -127,16 +307,33 @@ def run_experiment(
             "targets": target_specs,
             "instrumentation": config.trace.instrumentation,
             "mode": config.trace.mode,
+            "sample_threshold": config.trace.sample_threshold,
+            "sample_size": config.trace.sample_size,
+            "summary_cache": config.trace.summary_cache,
+            "summary_cache_validate": config.trace.summary_cache_validate,
+            "scope": config.trace.scope,
+            "call_sampling": config.trace.call_sampling,
+            "call_sampling_first": config.trace.call_sampling_first,
+            "call_sampling_every": config.trace.call_sampling_every,
             "capture_backtrace": config.trace.capture_backtrace,
             "store_arrays": config.trace.store_arrays,
             "array_store_threshold": config.trace.array_store_threshold,
             "array_backend": config.trace.array_backend,
+            "capture_format": config.trace.capture_format,
+            "writer": config.trace.writer,
+            "writer_queue_size": config.trace.writer_queue_size,
+            "writer_backpressure": config.trace.writer_backpressure,
+            "parquet_row_group_size": config.storage.parquet_row_group_size,
+            "finalize": finalize_mode == "inline",
         }
-        spec_path = (run_dir / "spec.json").resolve()
-        spec_path.write_text(json.dumps(spec, indent=2))
-
-        env = dict(os.environ)
-        env["PYTRACER_RUN_ID"] = run_id
+        if slot.cpus is not None:
+            spec["cpus"] = slot.cpus
+        run_env = {"PYTRACER_RUN_ID": run_id}
+        for key, template in config.perturb.env.items():
+            run_env[key] = template.format(run_index=k, run_id=run_id)
+        if env_overrides:
+            run_env.update(env_overrides)
+        env = dict(base_env)
         if native_shim is not None:
             preload = str(native_shim)
             if env.get("LD_PRELOAD"):
@@ -145,24 +342,199 @@ def run_experiment(
             env["PYTRACER_NATIVE_LOG"] = str(run_dir / "native_kernels.log")
             if native_libs:
                 env["PYTRACER_NATIVE_REAL_LIBS"] = ":".join(native_libs)
-        for key, template in config.perturb.env.items():
-            env[key] = template.format(run_index=k, run_id=run_id)
-        if env_overrides:
-            env.update(env_overrides)
+        env.update(run_env)
+
+        receiver = None
+        write_fd = None
+        if stream:
+            from pytracer.trace.stream import StreamReceiver
+
+            read_fd, write_fd = os.pipe()
+            spec["stream_fd"] = write_fd
+            receiver = StreamReceiver(read_fd, run_id, on_progress)
+            receiver.start()
+        spec_path = (run_dir / "spec.json").resolve()
+        if executor.name != "batch":  # a queued job's startup is its queue wait
+            spec["launched_at"] = time.time()
+        spec_path.write_text(json.dumps(spec, indent=2))
 
-        proc = subprocess.run(
-            [sys.executable, "-m", "pytracer._bootstrap", str(spec_path)],
+        run_launch = RunLaunch(
+            index=k,
+            run_id=run_id,
+            run_dir=run_dir,
+            spec_path=spec_path,
+            cwd=script_path.parent,
             env=env,
-            cwd=str(script_path.parent),
+            run_env=run_env,
+            slot=slot.index,
+            stream_fd=write_fd,
+        )
+        try:
+            returncode = executor.run(run_launch)
+        finally:
+            if write_fd is not None:
+                os.close(write_fd)  # the child's copy is the stream's only writer now
+        if returncode is None:
+            return None
+        if finalizer is not None:
+            finalizer.submit(run_dir)
+        run = RunResult(
+            run_id=run_id,
+            run_dir=run_dir,
+            exit_code=returncode,
+            startup_s=_run_startup(run_dir),
         )
-        result.runs.append(RunResult(run_id=run_id, run_dir=run_dir, exit_code=proc.returncode))
-        if proc.returncode != 0 and not continue_on_error:
+        if receiver is not None:
+            receiver.join()
+            if receiver.complete:
+                run.calls = receiver.calls()
+            elif returncode == 0:
+                result.warnings.append(
+                    f"{run_id}: event stream incomplete "
+                    f"({receiver.error or 'ended early'}); analysis reads the capture file"
+                )
+        return run
+
+    adaptive = config.run.adaptive
+    if adaptive and executor.name == "batch":
+        result.warnings.append("run.adaptive: needs results between waves; ignored for batch")
+        adaptive = False
+    wave_size = max(2, config.run.wave_size)
+    waves: list[dict] = []
+    wave_state = None  # analysis state the waves fold their runs into
+
+    # Runs start in index order, at most `jobs` at a time. After a failure
+    # (without continue_on_error) no new run starts; runs already in flight
+    # finish and are kept. Adaptive experiments run in waves of wave_size and
+    # stop once every function's sig estimate is tight enough, --repeat being
+    # the budget.
+    runs: list[RunResult] = []
+    try:
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="pytracer-run") as pool:
+            pending: set[Future[RunResult | None]] = set()
+            next_k = 0
+            limit = min(repeat, wave_size) if adaptive else repeat
+            stopping = False
+            while True:
+                while not stopping and next_k < limit and len(pending) < jobs:
+                    pending.add(pool.submit(launch, first_index + next_k))
+                    next_k += 1
+                if not pending:
+                    if not adaptive or stopping:
+                        break
+                    from pytracer.analysis import sig_convergence
+
+                    wave, wave_state = sig_convergence(
+                        experiment_dir,
+                        config.run.target_ci_bits,
+                        alignment_mode=config.analysis.alignment,
+                        streamed_calls={r.run_id: r.calls for r in runs if r.calls is not None},
+                        state=wave_state,
+                    )
+                    waves.append(wave)
+                    if not wave["unconverged"] or next_k >= repeat:
+                        break
+                    limit = min(repeat, limit + wave_size)
+                    continue
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for run in sorted(
+                    (r for r in (f.result() for f in done) if r is not None),
+                    key=lambda r: r.run_id,
+                ):
+                    runs.append(run)
+                    if run.exit_code != 0 and not continue_on_error and not stopping:
+                        stopping = True
+                        result.warnings.append(
+                            f"{run.run_id} exited with code {run.exit_code}; stopping "
+                            f"(use --continue-on-error to keep going)"
+                        )
+        finish = executor.finish(experiment_dir, repeat, jobs, first_index=first_index)
+        if finalizer is not None:
+            result.warnings.extend(finalizer.wait())
+    finally:
+        executor.close()
+        if finalizer is not None:
+            finalizer.close()
+    result.runs = sorted(runs, key=lambda r: r.run_id)
+    result.warnings.extend(executor.warnings)
+    experiment_meta.update(finish)
+    if adaptive:
+        converged = bool(waves) and not waves[-1]["unconverged"]
+        experiment_meta["adaptive"] = {
+            "target_ci_bits": config.run.target_ci_bits,
+            "wave_size": wave_size,
+            "max_runs": repeat,
+            "converged": converged,
+            "waves": waves,
+        }
+        if waves and not converged and not result.failed_runs:
             result.warnings.append(
-                f"{run_id} exited with code {proc.returncode}; stopping "
-                f"(use --continue-on-error to keep going)"
+                f"run.adaptive: {len(waves[-1]['unconverged'])} function(s) still above "
+                f"{config.run.target_ci_bits} bits CI width after {len(runs)} runs"
             )
-            break
+    if "submit_script" in finish:
+        result.submit_script = Path(finish["submit_script"])
+
+    experiment_meta["repeat"] = previous.get("repeat", 0) + next_k
+    experiment_meta["runs"] = previous.get("runs", []) + _runs_summary(result.runs)
+    experiment_json.write_text(json.dumps(experiment_meta, indent=2))
+    return result
+
+
+def _load_experiment_meta(experiment_dir: Path) -> dict:
+    exp_path = experiment_dir / "experiment.json"
+    if not (experiment_dir / MARKER).is_file() or not exp_path.is_file():
+        raise ExperimentError(f"not a pytracer experiment directory: {experiment_dir}")
+    return json.loads(exp_path.read_text())
+
 
+def _next_run_index(experiment_dir: Path) -> int:
+    indexes = [
+        int(p.name.removeprefix("run-"))
+        for p in (experiment_dir / "runs").glob("run-*")
+        if p.name.removeprefix("run-").isdigit()
+    ]
+    return max(indexes, default=-1) + 1
+
+
+def _runs_summary(runs: list[RunResult]) -> list[dict]:
+    return [
+        {"run_id": r.run_id, "exit_code": r.exit_code, "startup_s": r.startup_s} for r in runs
+    ]
+
+
+def ingest_experiment(experiment_dir: str | Path) -> ExperimentResult:
+    """Collect the runs of an experiment executed elsewhere (``run.executor = "batch"``).
+
+    A run counts as finished once its metadata.json records an exit code;
+    the others are reported in warnings and left out.
+    """
+    experiment_dir = Path(experiment_dir)
+    exp_path = experiment_dir / "experiment.json"
+    experiment_meta = _load_experiment_meta(experiment_dir)
+    result = ExperimentResult(
+        experiment_id=experiment_meta["experiment_id"], experiment_dir=experiment_dir
+    )
+    for run_dir in sorted((experiment_dir / "runs").glob("run-*")):
+        if not (run_dir / "spec.json").is_file():
+            continue
+        try:
+            run_meta = json.loads((run_dir / "metadata.json").read_text())
+        except (OSError, ValueError):
+            run_meta = {}
+        if run_meta.get("exit_code") is None:
+            result.warnings.append(f"{run_dir.name}: not finished (no exit code recorded)")
+            continue
+        result.runs.append(
+            RunResult(
+                run_id=run_dir.name,
+                run_dir=run_dir,
+                exit_code=run_meta["exit_code"],
+                startup_s=run_meta.get("startup_s"),
+            )
+        )
+    experiment_meta["runs"] = _runs_summary(result.runs)
+    exp_path.write_text(json.dumps(experiment_meta, indent=2))
     return result
 
 
@@ -4,7 +4,18 @@ Provides:
 - thread-safe event/call id generation,
 - a contextvar call stack (parent linkage for nested traced calls),
 - deterministic per-callsite occurrence counters (the alignment key),
-- a reentrancy guard so pytracer's own numpy usage is never traced.
+- a reentrancy guard so pytracer's own numpy usage is never traced,
+- the contextvar of the innermost active pytracer.region (RegionScope).
+
+No lock is taken on the per-call path. Ids come from per-thread blocks of
+ID_BLOCK consecutive integers (one lock acquisition per block), so a
+single-threaded run still numbers events 0, 1, 2, ...; with several
+threads ids stay unique but are only ordered within each thread.
+Occurrences use one atomic counter per callsite, created under a lock on
+first sight: they keep the exact semantics of a single global table, which
+is what cross-run alignment keys on. (Thread identity is not folded into
+the key: which worker thread runs which task is not reproducible across
+runs, so per-thread numbering would misalign more, not less.)
 """
 
 from __future__ import annotations
@@ -15,36 +26,95 @@ import sys
 import threading
 from contextlib import contextmanager
 from contextvars import ContextVar
+from dataclasses import dataclass
 
 from pytracer.trace.event import SourceRef
 
 _PYTRACER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+# co_filename -> "is pytracer/wrapt/importlib machinery". Keyed on the
+# filename rather than the code object: the verdict depends only on the
+# filename, and a str caches its hash while a code object rehashes its
+# bytecode on every lookup.
+_MACHINERY: dict[str, bool] = {}
+
+
+def _is_machinery(filename: str) -> bool:
+    return (
+        filename.startswith(_PYTRACER_DIR)
+        or "wrapt" in filename
+        or filename.startswith("<frozen importlib")
+    )
+
+
 _stack: ContextVar[tuple[int, ...]] = ContextVar("pytracer_call_stack", default=())
 _inside: ContextVar[bool] = ContextVar("pytracer_inside", default=False)
 
 
+@dataclass(frozen=True, slots=True)
+class RegionScope:
+    """The innermost active region and its capture policy overrides.
+
+    ``name`` is the slash-joined path of nested region names; a None policy
+    field inherits from the enclosing region, then from the run's config.
+    """
+
+    name: str
+    mode: str | None = None
+    store_arrays: str | None = None
+    call_sampling: str | None = None
+
+
+_region: ContextVar[RegionScope | None] = ContextVar("pytracer_region", default=None)
+current_region = _region.get
+
+ID_BLOCK = 4096
+
+
+class IdBlocks:
+    """Unique ids handed out to each thread in blocks of ID_BLOCK."""
+
+    def __init__(self, block: int = ID_BLOCK):
+        self.block = block
+        self._next_block = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def next(self) -> int:
+        local = self._local
+        n = getattr(local, "next", 0)
+        if n < getattr(local, "limit", 0):
+            local.next = n + 1
+            return n
+        with self._lock:
+            start = self._next_block
+            self._next_block += self.block
+        local.next = start + 1
+        local.limit = start + self.block
+        return start
+
+
 class CallContext:
     def __init__(self, capture_backtrace: bool = True):
         self.capture_backtrace = capture_backtrace
-        self._event_ids = itertools.count()
-        self._call_ids = itertools.count()
+        self._event_ids = IdBlocks()
+        self._call_ids = IdBlocks()
         self._lock = threading.Lock()
-        self._occurrences: dict[tuple, int] = {}
+        self._occurrences: dict[tuple, itertools.count] = {}
 
     def next_event_id(self) -> int:
-        with self._lock:
-            return next(self._event_ids)
+        return self._event_ids.next()
 
     def next_call_id(self) -> int:
-        with self._lock:
-            return next(self._call_ids)
+        return self._call_ids.next()
 
     def next_occurrence(self, callsite_key: tuple) -> int:
-        with self._lock:
-            n = self._occurrences.get(callsite_key, 0)
-            self._occurrences[callsite_key] = n + 1
-            return n
+        counter = self._occurrences.get(callsite_key)
+        if counter is None:
+            with self._lock:
+                counter = self._occurrences.setdefault(callsite_key, itertools.count())
+        # next() on an itertools.count is a single C call: atomic under the GIL
+        return next(counter)
 
     def current_parent(self) -> int | None:
         stack = _stack.get()
@@ -73,15 +143,15 @@ class CallContext:
         """First frame outside pytracer/wrapt/importlib machinery."""
         if not self.capture_backtrace:
             return None
+        machinery = _MACHINERY
         frame = sys._getframe(1)
         try:
             while frame is not None:
                 filename = frame.f_code.co_filename
-                if (
-                    not filename.startswith(_PYTRACER_DIR)
-                    and "wrapt" not in filename
-                    and not filename.startswith("<frozen importlib")
-                ):
+                skip = machinery.get(filename)
+                if skip is None:
+                    skip = machinery[filename] = _is_machinery(filename)
+                if not skip:
                     return SourceRef(file=filename, lineno=frame.f_lineno)
                 frame = frame.f_back  # type: ignore[assignment]
         finally:
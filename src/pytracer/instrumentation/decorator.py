@@ -14,7 +14,7 @@ from pytracer.instrumentation.recorder import get_active_recorder
 @wrapt.decorator
 def trace_function(wrapped, instance, args, kwargs):
     recorder = get_active_recorder()
-    if recorder is None:
+    if recorder is None or recorder.paused:
         return wrapped(*args, **kwargs)
     module = getattr(wrapped, "__module__", "") or ""
     qualname = getattr(wrapped, "__qualname__", getattr(wrapped, "__name__", "?"))
@@ -19,7 +19,7 @@ from dataclasses import dataclass, field
 
 import wrapt
 
-from pytracer.instrumentation.recorder import Recorder
+from pytracer.instrumentation.recorder import Recorder, make_binder
 from pytracer.instrumentation.ufunc import TracedUfunc
 
 
@@ -167,6 +167,7 @@ class Patcher:
     def __init__(self, recorder: Recorder):
         self.recorder = recorder
         self._applied: list[ResolvedTarget] = []
+        self._suspended: list[tuple[ResolvedTarget, object]] = []
 
     @property
     def applied(self) -> list[ResolvedTarget]:
@@ -191,6 +192,21 @@ class Patcher:
                 pass
         self._applied.clear()
 
+    def suspend(self) -> None:
+        """Put the originals back until ``restore()`` (hard pause)."""
+        installed = [(t, getattr(t.parent, t.attr, None)) for t in self._applied]
+        self.unpatch()
+        self._suspended.extend(installed)
+
+    def restore(self) -> None:
+        """Reinstall the very wrappers ``suspend()`` removed."""
+        installed, self._suspended = self._suspended, []
+        for target, wrapper in installed:
+            if wrapper is None:
+                continue
+            setattr(target.parent, target.attr, wrapper)
+            self._applied.append(target)
+
     def __enter__(self):
         return self
 
@@ -202,6 +218,7 @@ class Patcher:
             return TracedUfunc(target.original, self.recorder, target.module, target.qualname)
         recorder = self.recorder
         module, qualname = target.module, target.qualname
+        binder = make_binder(target.original)
 
         def _traced(wrapped, instance, args, kwargs):
             return recorder.record_call(
@@ -211,6 +228,7 @@ class Patcher:
                 wrapped=wrapped,
                 args=args,
                 kwargs=kwargs,
+                binder=binder,
             )
 
         return wrapt.FunctionWrapper(typing.cast(typing.Any, target.original), _traced)
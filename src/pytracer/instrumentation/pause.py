@@ -0,0 +1,40 @@
+"""Pausing the active recording: pytracer.pause()/resume()/paused().
+
+Like ``trace_function``, these are no-ops outside a pytracer run, so code
+that marks its warm-up or data-loading phases runs unchanged without
+pytracer. ``hard=True`` also unpatches the traced callables for the
+duration of the pause (see Recorder.pause). The pause state is process-wide:
+pausing in one thread pauses recording in all of them.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+from pytracer.instrumentation.recorder import get_active_recorder
+
+
+def pause(hard: bool = False) -> None:
+    recorder = get_active_recorder()
+    if recorder is not None:
+        recorder.pause(hard=hard)
+
+
+def resume() -> None:
+    recorder = get_active_recorder()
+    if recorder is not None:
+        recorder.resume()
+
+
+@contextmanager
+def paused(hard: bool = False):
+    """``with pytracer.paused(): ...`` runs the block untraced."""
+    recorder = get_active_recorder()
+    if recorder is None:
+        yield
+        return
+    recorder.pause(hard=hard)
+    try:
+        yield
+    finally:
+        recorder.resume()
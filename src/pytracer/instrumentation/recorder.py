@@ -1,21 +1,65 @@
 """The shared recording engine used by all wrapper tiers.
 
-A recorded call: input events → original call → output events (or exception
-event + re-raise). The wrapped function's result is returned unchanged.
-Recording failures never propagate into the traced program.
+A recorded call: input record → original call → output record (or exception
+record + re-raise); each record carries all arguments of its side. The
+wrapped function's result is returned unchanged. Recording failures never
+propagate into the traced program.
+
+With ``intern_callsites`` (the default) each distinct callsite is written
+once to the run's callsite table and events carry only its id.
+
+With ``call_sampling`` other than "all", each callsite is recorded in full
+for its first ``call_sampling_first`` occurrences and then only every
+``call_sampling_every``-th ("every") or at exponentially spaced occurrences
+("backoff"). Skipped calls run untraced but keep their occurrence numbers,
+and their per-callsite counts go to ``call_sampling.json``.
+
+``pytracer.region`` scopes (see instrumentation.region) tag the calls made
+inside them and may override ``mode``, array storage and call sampling for
+those calls; with ``scope = "regions"`` calls outside every region pass
+through untraced.
+
+Argument names come from an ``ArgBinder`` compiled once per callable (by
+the Patcher when it wraps a target): the same names Signature.bind gives,
+without binding on every call.
 """
 
 from __future__ import annotations
 
 import functools
 import inspect
+import json
+import sys
+import threading
 import time
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pytracer.instrumentation.call_context import CallContext, RegionScope, current_region
+from pytracer.trace.event import (
+    SCHEMA_VERSION,
+    ArgRecord,
+    Callsite,
+    NumericSummary,
+    SourceRef,
+    TraceEvent,
+)
+from pytracer.trace.reader import CALL_SAMPLING_FILENAME, PAUSES_FILENAME, REGIONS_FILENAME
+from pytracer.trace.summary import (
+    DEFAULT_SAMPLE_SIZE,
+    DEFAULT_SUMMARY_CACHE_SIZE,
+    SUMMARIZABLE_TYPES,
+    SummaryCache,
+)
+from pytracer.trace.writer import EventWriter
 
-from pytracer.instrumentation.call_context import CallContext
-from pytracer.trace.event import SCHEMA_VERSION, NumericSummary, SourceRef, TraceEvent
-from pytracer.trace.summary import summarize_value
-from pytracer.trace.writer import TraceWriter
+if TYPE_CHECKING:
+    from pytracer.instrumentation.patcher import Patcher
+
+TRACE_MODES = ("summary", "sampled", "metadata")
+CALL_SAMPLING_POLICIES = ("all", "every", "backoff")
+TRACE_SCOPES = ("all", "regions")
+REGION_WINDOW_LIMIT = 10_000  # windows kept for regions.json; later ones are counted
 
 _active_recorder: Recorder | None = None
 
@@ -31,45 +75,359 @@ def set_active_recorder(recorder: Recorder | None) -> None:
     _active_recorder = recorder
 
 
-@functools.lru_cache(maxsize=2048)
-def _signature_of(fn):
-    return inspect.signature(fn)
+_POSITIONAL = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+_NO_SLOT = sys.maxsize  # keyword-only parameters have no positional slot
+
+
+class ArgBinder:
+    """``Signature.bind(...).arguments`` for one callable, precompiled.
+
+    Calls the fast path can prove valid become a zip of parameter names
+    with the positional arguments, plus keywords that name ordinary
+    parameters. Anything else (unknown, duplicate or positional-only
+    keywords, ``**kwargs``, missing required arguments) goes through
+    Signature.bind itself, so the names always match it.
+    """
+
+    __slots__ = ("signature", "names", "varargs", "required", "slots", "order")
 
+    def __init__(self, signature: inspect.Signature):
+        self.signature = signature
+        self.names: tuple[str, ...] = ()
+        self.varargs: str | None = None
+        self.required: list[tuple[int, str]] = []  # (positional slot, name)
+        self.slots: dict[str, int] = {}  # keyword-bindable name -> positional slot
+        self.order: dict[str, int] = {}  # name -> parameter index
+        names: list[str] = []
+        for index, p in enumerate(signature.parameters.values()):
+            self.order[p.name] = index
+            if p.kind in _POSITIONAL:
+                if p.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD:
+                    self.slots[p.name] = len(names)
+                if p.default is p.empty:
+                    self.required.append((len(names), p.name))
+                names.append(p.name)
+            elif p.kind is inspect.Parameter.VAR_POSITIONAL:
+                self.varargs = p.name
+            elif p.kind is inspect.Parameter.KEYWORD_ONLY:
+                self.slots[p.name] = _NO_SLOT
+                if p.default is p.empty:
+                    self.required.append((_NO_SLOT, p.name))
+        self.names = tuple(names)
 
-def _cached_signature(fn):
-    # inspect.signature is ~70us per call; hot wrappers call it per event.
+    def bind(self, args: tuple, kwargs: dict) -> dict[str, object] | None:
+        """Parameter name -> value, or None when the call does not bind."""
+        n = len(args)
+        names = self.names
+        fast = n <= len(names) or self.varargs is not None
+        if fast and kwargs:
+            slots = self.slots
+            for key in kwargs:
+                slot = slots.get(key)
+                if slot is None or slot < n:
+                    fast = False
+                    break
+        if fast:
+            for slot, name in self.required:
+                if slot >= n and name not in kwargs:
+                    fast = False
+                    break
+        if not fast:
+            try:
+                arguments = dict(self.signature.bind(*args, **kwargs).arguments)
+            except TypeError:
+                return None
+        else:
+            if n == 1 and names:  # the common f(x) call: skip building a zip
+                arguments = {names[0]: args[0]}
+            else:
+                arguments = dict(zip(names, args, strict=False))
+            if n > len(names):
+                arguments[self.varargs] = args[len(names):]  # type: ignore[index]
+            if kwargs:
+                for key in sorted(kwargs, key=self.order.__getitem__):
+                    arguments[key] = kwargs[key]
+        arguments.pop("self", None)
+        return arguments
+
+
+def make_binder(fn) -> ArgBinder | None:
+    """Compile the binder for *fn*; None when it has no introspectable signature."""
     try:
-        return _signature_of(fn)
-    except TypeError:  # unhashable callable: fall back uncached
-        return inspect.signature(fn)
+        return _binder_of(fn)
+    except TypeError:  # unhashable callable: compile uncached
+        return _compile_binder(fn)
+
+
+def _compile_binder(fn) -> ArgBinder | None:
+    try:
+        return ArgBinder(inspect.signature(fn))
+    except (ValueError, TypeError):
+        return None
+
+
+# inspect.signature is ~70us per call: compile at most once per callable.
+_binder_of = functools.lru_cache(maxsize=2048)(_compile_binder)
 
 
 class Recorder:
     def __init__(
         self,
-        writer: TraceWriter,
+        writer: EventWriter,
         run_id: str,
         *,
         capture_backtrace: bool = True,
         mode: str = "summary",
+        sample_threshold: int = 1_000_000,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        summary_cache: int = DEFAULT_SUMMARY_CACHE_SIZE,
+        summary_cache_validate: str = "exact",
+        call_sampling: str = "all",
+        call_sampling_first: int = 1000,
+        call_sampling_every: int = 100,
         array_store=None,
         taint_outputs: bool = False,
+        intern_callsites: bool = True,
+        scope: str = "all",
     ):
         self.writer = writer
         self.run_id = run_id
         self.mode = mode
+        self.sample_threshold = sample_threshold
+        # trace.mode = "sampled": arrays above the threshold get estimates
+        self.sample_above = sample_threshold if mode == "sampled" else None
+        self.sample_size = sample_size
+        self.summaries = SummaryCache(summary_cache, validate=summary_cache_validate)
+        if call_sampling not in CALL_SAMPLING_POLICIES:
+            raise ValueError(
+                f"call_sampling must be one of {CALL_SAMPLING_POLICIES}, got {call_sampling!r}"
+            )
+        self.call_sampling = call_sampling
+        self.call_sampling_first = call_sampling_first
+        self.call_sampling_every = max(1, call_sampling_every)
+        self._skipped: dict[tuple, int] = {}  # callsite key -> calls not recorded
+        self._skipped_lock = threading.Lock()
         self.array_store = array_store
         # When True (--instrument taint), outputs of traced calls are wrapped
         # as TracedArray so the T3 protocol re-seeds at every known boundary.
         self.taint_outputs = taint_outputs
         self.context = CallContext(capture_backtrace=capture_backtrace)
+        self.intern_callsites = intern_callsites
+        self._callsites: dict[tuple, int] = {}
+        self._callsites_lock = threading.Lock()
+        # pausing (see pause()): checked first thing in record_call
+        self.paused = False
+        self.patcher: Patcher | None = None  # set by whoever patched; hard pauses use it
+        self._pause_depth = 0
+        self._pause_windows: list[dict] = []
+        self._pause_lock = threading.Lock()
+        if scope not in TRACE_SCOPES:
+            raise ValueError(f"scope must be one of {TRACE_SCOPES}, got {scope!r}")
+        self.regions_only = scope == "regions"
+        self._region_windows: list[dict] = []
+        self._region_windows_dropped = 0
+        self._region_stores: dict[str, Any] = {}  # store_arrays override -> ArrayStore
 
     # -- event emission -----------------------------------------------------
 
-    def _summary(self, value: object) -> NumericSummary | None:
-        if self.mode == "metadata":
+    def _summary(self, value: object, mode: str | None = None) -> NumericSummary | None:
+        if mode is None or mode == self.mode:
+            mode, sample_above = self.mode, self.sample_above
+        else:  # a region's override
+            sample_above = self.sample_threshold if mode == "sampled" else None
+        if mode == "metadata":
+            return None
+        return self.summaries.summarize(value, sample_above, self.sample_size)
+
+    def _array_store_for(self, region: RegionScope | None):
+        if region is None or region.store_arrays is None:
+            return self.array_store
+        if region.store_arrays == "never":
+            return None
+        store = self._region_stores.get(region.store_arrays)
+        if store is None:
+            from pytracer.storage.arrays import DEFAULT_THRESHOLD, ArrayStore
+
+            base = self.array_store
+            store = self._region_stores.setdefault(
+                region.store_arrays,
+                ArrayStore(
+                    self.writer.path.parent,
+                    mode=region.store_arrays,
+                    threshold=base.threshold if base is not None else DEFAULT_THRESHOLD,
+                    backend=base.backend if base is not None else "auto",
+                ),
+            )
+        return store
+
+    def stats(self) -> dict[str, int]:
+        stats = self.summaries.stats()
+        if self.call_sampling != "all" or self._skipped:
+            stats["calls_skipped"] = sum(self._skipped.values())
+        if self._pause_windows:
+            stats["pause_windows"] = len(self._pause_windows)
+        return stats
+
+    # -- call sampling --------------------------------------------------------
+
+    def _keep_call(self, callsite_key: tuple, occurrence: int, policy: str) -> bool:
+        """Deterministic per-callsite policy: a function of the occurrence only,
+        so every run records the same occurrences and alignment still holds."""
+        k = occurrence - self.call_sampling_first
+        if k < 0 or policy == "all":
+            return True
+        if policy == "every":
+            keep = k % self.call_sampling_every == 0
+        else:  # "backoff": first, first+1, first+3, first+7, ...
+            keep = (k + 1) & k == 0
+        if not keep:
+            with self._skipped_lock:
+                self._skipped[callsite_key] = self._skipped.get(callsite_key, 0) + 1
+        return keep
+
+    def write_call_sampling(self, run_dir: str | Path) -> Path | None:
+        """Write per-callsite counts of calls skipped by call sampling."""
+        if self.call_sampling == "all" and not self._skipped:
+            return None
+        with self._skipped_lock:
+            skipped = sorted(self._skipped.items(), key=lambda kv: tuple(map(str, kv[0])))
+        payload = {
+            "policy": self.call_sampling,
+            "first": self.call_sampling_first,
+            "every": self.call_sampling_every,
+            "skipped": [
+                {
+                    "module": module,
+                    "qualname": qualname,
+                    "ufunc_method": ufunc_method,
+                    "file": file,
+                    "lineno": lineno,
+                    "calls": n,
+                }
+                for (module, qualname, ufunc_method, file, lineno), n in skipped
+            ],
+        }
+        path = Path(run_dir) / CALL_SAMPLING_FILENAME
+        path.write_text(json.dumps(payload, indent=2))
+        return path
+
+    # -- pausing ------------------------------------------------------------
+
+    def pause(self, hard: bool = False) -> None:
+        """Stop recording until the matching ``resume()``; pauses nest.
+
+        A soft pause makes every wrapper pass straight through. A hard pause
+        also puts the original callables back (via ``self.patcher``), so
+        code run while paused pays no wrapper cost at all. Each outermost
+        pause/resume pair is one window in ``pauses.json``.
+        """
+        with self._pause_lock:
+            self._pause_depth += 1
+            if self._pause_depth == 1:
+                self._pause_windows.append(
+                    {"mode": "soft", "start_ns": time.monotonic_ns(), "end_ns": None}
+                )
+                self.paused = True
+            window = self._pause_windows[-1]
+            if hard and window["mode"] == "soft" and self.patcher is not None:
+                self.patcher.suspend()
+                window["mode"] = "hard"
+
+    def resume(self) -> None:
+        with self._pause_lock:
+            if self._pause_depth == 0:
+                return
+            self._pause_depth -= 1
+            if self._pause_depth:
+                return
+            window = self._pause_windows[-1]
+            if window["mode"] == "hard" and self.patcher is not None:
+                self.patcher.restore()
+            window["end_ns"] = time.monotonic_ns()
+            self.paused = False
+
+    def write_pauses(self, run_dir: str | Path) -> Path | None:
+        """Write the run's pause windows (monotonic ns, like event ts_ns)."""
+        with self._pause_lock:
+            windows = [dict(w) for w in self._pause_windows]
+        if not windows:
+            return None
+        path = Path(run_dir) / PAUSES_FILENAME
+        path.write_text(json.dumps({"windows": windows}, indent=2))
+        return path
+
+    # -- regions --------------------------------------------------------------
+
+    def enter_region(self, name: str) -> dict | None:
+        """Open a region window (see instrumentation.region); pass it to exit_region."""
+        window = {"name": name, "start_ns": time.monotonic_ns(), "end_ns": None}
+        with self._pause_lock:
+            if len(self._region_windows) >= REGION_WINDOW_LIMIT:
+                self._region_windows_dropped += 1
+                return None
+            self._region_windows.append(window)
+        return window
+
+    def exit_region(self, window: dict | None) -> None:
+        if window is not None:
+            window["end_ns"] = time.monotonic_ns()
+
+    def write_regions(self, run_dir: str | Path) -> Path | None:
+        """Write the run's region windows (monotonic ns, like event ts_ns)."""
+        with self._pause_lock:
+            windows = [dict(w) for w in self._region_windows]
+            dropped = self._region_windows_dropped
+        if not windows:
             return None
-        return summarize_value(value)
+        path = Path(run_dir) / REGIONS_FILENAME
+        path.write_text(json.dumps({"windows": windows, "dropped": dropped}, indent=2))
+        return path
+
+    def _callsite_id(self, callsite_key: tuple, tier: str, source: SourceRef | None) -> int:
+        site_key = (*callsite_key, tier)
+        callsite_id = self._callsites.get(site_key)
+        if callsite_id is not None:
+            return callsite_id
+        with self._callsites_lock:
+            callsite_id = self._callsites.get(site_key)
+            if callsite_id is None:
+                callsite_id = len(self._callsites)
+                module, qualname, ufunc_method = callsite_key[:3]
+                self.writer.write_callsite(
+                    Callsite(
+                        callsite_id=callsite_id,
+                        module=module,
+                        qualname=qualname,
+                        tier=tier,  # type: ignore[arg-type]
+                        ufunc_method=ufunc_method,
+                        source=source,
+                    )
+                )
+                self._callsites[site_key] = callsite_id
+        return callsite_id
+
+    def _arg_record(
+        self, call_id: int, phase: str, name: str, value: object, region: RegionScope | None
+    ) -> ArgRecord:
+        if not isinstance(value, SUMMARIZABLE_TYPES):
+            return ArgRecord(name=name)  # nothing to summarize or store (None, str, ...)
+        summary = self._summary(value, region.mode if region is not None else None)
+        payload_ref = None
+        array_store = self._array_store_for(region)
+        if array_store is not None:
+            payload_ref = array_store.maybe_store(call_id, phase, name, value)
+        if payload_ref is not None:
+            payload_kind = "array_ref"
+        elif summary is not None:
+            payload_kind = "summary"
+        else:
+            payload_kind = "none"
+        return ArgRecord(
+            name=name,
+            payload_kind=payload_kind,  # type: ignore[arg-type]
+            summary=summary,
+            payload_ref=payload_ref,
+        )
 
     def _emit(
         self,
@@ -78,27 +436,22 @@ class Recorder:
         parent: int | None,
         occurrence: int,
         phase: str,
-        module: str,
-        qualname: str,
-        tier: str,
-        ufunc_method: str | None,
-        arg_name: str | None,
-        value: object = None,
-        source: SourceRef | None,
+        items: list[tuple[str, object]] | None = None,
+        module: str = "",
+        qualname: str = "",
+        tier: str = "t1",
+        ufunc_method: str | None = None,
+        source: SourceRef | None = None,
+        callsite_id: int | None = None,
         inplace: bool = False,
         note: str | None = None,
-        with_payload: bool = True,
+        region: RegionScope | None = None,
     ) -> None:
-        summary = self._summary(value) if with_payload else None
-        payload_ref = None
-        if with_payload and self.array_store is not None and phase in ("input", "output"):
-            payload_ref = self.array_store.maybe_store(call_id, phase, arg_name, value)
-        if payload_ref is not None:
-            payload_kind = "array_ref"
-        elif summary is not None:
-            payload_kind = "summary"
-        else:
-            payload_kind = "none"
+        """Write one call record: every argument (or result) of one side."""
+        args = [
+            self._arg_record(call_id, phase, name, value, region)
+            for name, value in items or ()
+        ]
         event = TraceEvent(
             schema_version=SCHEMA_VERSION,
             run_id=self.run_id,
@@ -111,28 +464,26 @@ class Recorder:
             qualname=qualname,
             tier=tier,  # type: ignore[arg-type]
             ufunc_method=ufunc_method,
-            arg_name=arg_name,
             inplace=inplace,
-            payload_kind=payload_kind,  # type: ignore[arg-type]
-            summary=summary,
-            payload_ref=payload_ref,
             source=source,
             note=note,
             ts_ns=time.monotonic_ns(),
+            callsite_id=callsite_id,
+            args=args,
+            region=region.name if region is not None else None,
         )
         self.writer.write_event(event)
 
     @staticmethod
-    def _bind_arguments(bind_with, args, kwargs) -> dict[str, object]:
-        if bind_with is not None:
-            try:
-                sig = _cached_signature(bind_with)
-                bound = sig.bind(*args, **kwargs)
-                arguments = dict(bound.arguments)
-                arguments.pop("self", None)
+    def _bind_arguments(
+        bind_with, args, kwargs, binder: ArgBinder | None = None
+    ) -> dict[str, object]:
+        if binder is None and bind_with is not None:
+            binder = make_binder(bind_with)
+        if binder is not None:
+            arguments = binder.bind(args, kwargs)
+            if arguments is not None:
                 return arguments
-            except (ValueError, TypeError):
-                pass
         named = {f"Arg{i}": v for i, v in enumerate(args)}
         named.update(kwargs)
         return named
@@ -157,9 +508,15 @@ class Recorder:
         ufunc_method: str | None = None,
         inplace: bool = False,
         bind_with=_BIND_WITH_WRAPPED,
+        binder: ArgBinder | None = None,
     ):
         if bind_with is _BIND_WITH_WRAPPED:
             bind_with = wrapped
+        if self.paused:
+            return wrapped(*args, **kwargs)
+        region = current_region()
+        if region is None and self.regions_only:
+            return wrapped(*args, **kwargs)
         ctx = self.context
         if ctx.inside():
             # Reentrant use of a traced function from inside pytracer itself
@@ -177,24 +534,39 @@ class Recorder:
                     source.lineno if source else None,
                 )
                 occurrence = ctx.next_occurrence(callsite_key)
-                call_id = ctx.next_call_id()
-                parent = ctx.current_parent()
-                common: dict[str, Any] = dict(
-                    call_id=call_id,
-                    parent=parent,
-                    occurrence=occurrence,
-                    module=module,
-                    qualname=qualname,
-                    tier=tier,
-                    ufunc_method=ufunc_method,
-                    source=source,
-                    inplace=inplace,
-                )
-                for name, value in self._bind_arguments(bind_with, args, kwargs).items():
-                    self._emit(phase="input", arg_name=name, value=value, **common)
+                if inplace:
+                    self.summaries.note_inplace_write()
+                policy = self.call_sampling
+                if region is not None and region.call_sampling is not None:
+                    policy = region.call_sampling
+                recorded = self._keep_call(callsite_key, occurrence, policy)
+                if recorded:
+                    call_id = ctx.next_call_id()
+                    parent = ctx.current_parent()
+                    common: dict[str, Any] = dict(
+                        call_id=call_id,
+                        parent=parent,
+                        occurrence=occurrence,
+                        inplace=inplace,
+                        region=region,
+                    )
+                    if self.intern_callsites:
+                        common["callsite_id"] = self._callsite_id(callsite_key, tier, source)
+                    else:
+                        common.update(
+                            module=module,
+                            qualname=qualname,
+                            tier=tier,
+                            ufunc_method=ufunc_method,
+                            source=source,
+                        )
+                    arguments = self._bind_arguments(bind_with, args, kwargs, binder)
+                    self._emit(phase="input", items=list(arguments.items()), **common)
         except Exception:
             # Never let recording break the traced call: run it untraced.
             return wrapped(*args, **kwargs)
+        if not recorded:
+            return wrapped(*args, **kwargs)  # sampled out: counted, not traced
 
         try:
             with ctx.pushed(call_id):
@@ -203,11 +575,7 @@ class Recorder:
             try:
                 with ctx.guard():
                     self._emit(
-                        phase="exception",
-                        arg_name=None,
-                        note=f"{type(exc).__name__}: {exc}",
-                        with_payload=False,
-                        **common,
+                        phase="exception", note=f"{type(exc).__name__}: {exc}", **common
                     )
             except Exception:
                 pass
@@ -215,8 +583,7 @@ class Recorder:
 
         try:
             with ctx.guard():
-                for name, value in self._output_items(result):
-                    self._emit(phase="output", arg_name=name, value=value, **common)
+                self._emit(phase="output", items=self._output_items(result), **common)
         except Exception:
             pass
         if self.taint_outputs and tier != "t3":
@@ -0,0 +1,65 @@
+"""Region-scoped tracing: ``pytracer.region("solver")``.
+
+A region names a stretch of the program, as a context manager or as a
+decorator. Calls traced inside it carry the region name (nested regions
+join with "/"), and the run's region windows go to ``regions.json``. With
+``trace.scope = "regions"`` nothing outside a region is recorded.
+
+A region can override the run's capture policy for the calls inside it:
+``mode`` (summary | sampled | metadata), ``store_arrays`` (auto | always |
+never) and ``call_sampling`` (all | every | backoff). Like
+``trace_function``, regions are no-ops outside a pytracer run.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+from pytracer.instrumentation.call_context import RegionScope, _region
+from pytracer.instrumentation.recorder import (
+    CALL_SAMPLING_POLICIES,
+    TRACE_MODES,
+    get_active_recorder,
+)
+
+STORE_ARRAYS_MODES = ("auto", "always", "never")
+
+
+def _check(name: str, value: str | None, allowed: tuple[str, ...]) -> None:
+    if value is not None and value not in allowed:
+        raise ValueError(f"region {name} must be one of {allowed}, got {value!r}")
+
+
+@contextmanager
+def region(
+    name: str,
+    *,
+    mode: str | None = None,
+    store_arrays: str | None = None,
+    call_sampling: str | None = None,
+):
+    """Trace the enclosed block (or decorated function) as region *name*."""
+    _check("mode", mode, TRACE_MODES)
+    _check("store_arrays", store_arrays, STORE_ARRAYS_MODES)
+    _check("call_sampling", call_sampling, CALL_SAMPLING_POLICIES)
+    recorder = get_active_recorder()
+    if recorder is None:
+        yield
+        return
+    outer = _region.get()
+    if outer is not None:
+        scope = RegionScope(
+            name=f"{outer.name}/{name}",
+            mode=mode or outer.mode,
+            store_arrays=store_arrays or outer.store_arrays,
+            call_sampling=call_sampling or outer.call_sampling,
+        )
+    else:
+        scope = RegionScope(name, mode, store_arrays, call_sampling)
+    token = _region.set(scope)
+    window = recorder.enter_region(scope.name)
+    try:
+        yield
+    finally:
+        recorder.exit_region(window)
+        _region.reset(token)
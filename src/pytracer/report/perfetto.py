@@ -2,22 +2,28 @@
 
 Each run becomes a process row (pid = run index); each traced call becomes a
 complete event ("X") spanning its input→output timestamps, annotated with
-the call's summary statistics. Open the file at https://ui.perfetto.dev or
+the call's summary statistics. pytracer.region windows get their own
+thread row (tid 1). Open the file at https://ui.perfetto.dev or
 chrome://tracing.
 """
 
 from __future__ import annotations
 
 import json
+from collections.abc import Iterable
 from pathlib import Path
 
 from pytracer._errors import PytracerError
 from pytracer.trace.event import TraceEvent
-from pytracer.trace.reader import iter_events
-from pytracer.trace.writer import EVENTS_FILENAME
+from pytracer.trace.reader import (
+    EventStream,
+    find_events_file,
+    iter_argument_events,
+    load_region_windows,
+)
 
 
-def _call_spans(events: list[TraceEvent]) -> list[dict]:
+def _call_spans(events: Iterable[TraceEvent]) -> list[dict]:
     spans: dict[int, dict] = {}
     for ev in events:
         if ev.ts_ns is None:
@@ -30,7 +36,7 @@ def _call_spans(events: list[TraceEvent]) -> list[dict]:
                 "tier": ev.tier,
                 "start": ev.ts_ns,
                 "end": ev.ts_ns,
-                "args": {},
+                "args": {"region": ev.region} if ev.region else {},
                 "exception": None,
             },
         )
@@ -60,14 +66,14 @@ def export_perfetto(experiment_dir: str | Path, output: str | Path | None = None
         raise PytracerError(f"{experiment_dir}: no runs found")
 
     for pid, run_dir in enumerate(run_dirs):
-        events_path = run_dir / EVENTS_FILENAME
-        if not events_path.is_file():
+        events_path = find_events_file(run_dir)
+        if events_path is None:
             continue
-        events, _truncated = iter_events(events_path)
-        spans = _call_spans(events)
+        spans = _call_spans(iter_argument_events(EventStream(events_path)))
         if not spans:
             continue
-        base = min(s["start"] for s in spans)
+        windows = [w for w in load_region_windows(run_dir) if w.get("end_ns") is not None]
+        base = min([s["start"] for s in spans] + [w["start_ns"] for w in windows])
         trace_events.append(
             {"ph": "M", "pid": pid, "name": "process_name",
              "args": {"name": run_dir.name}}
@@ -86,6 +92,16 @@ def export_perfetto(experiment_dir: str | Path, output: str | Path | None = None
             if span["exception"]:
                 entry["args"]["exception"] = span["exception"]
             trace_events.append(entry)
+        for window in windows:
+            trace_events.append({
+                "name": window["name"],
+                "cat": "region",
+                "ph": "X",
+                "pid": pid,
+                "tid": 1,
+                "ts": (window["start_ns"] - base) / 1000.0,
+                "dur": max((window["end_ns"] - window["start_ns"]) / 1000.0, 0.001),
+            })
 
     if not trace_events:
         raise PytracerError(
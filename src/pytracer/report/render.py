@@ -24,6 +24,18 @@ _SIG_NOTE_ELEMENT = (
 )
 
 
+_SIG_NOTE_SAMPLED = (
+    "Basis `summary*` marks sig values computed from summaries estimated on a "
+    "sample of a large array (`trace.mode = \"sampled\"`). Every run samples the "
+    "same elements, so these values describe the stability of the sampled elements only."
+)
+
+
+def _basis(row: dict) -> str:
+    basis = row.get("sig_basis", "summary")
+    return f"{basis}*" if row.get("sampled") else basis
+
+
 def _fmt(value, digits=1) -> str:
     if value is None:
         return "-"
@@ -51,16 +63,25 @@ def render_markdown(data: dict) -> str:
         f"divergent: {a.get('divergent_call_groups', 0)})")
     if a.get("truncated_runs"):
         add(f"- **Truncated runs**: {', '.join(a['truncated_runs'])}")
+    if a.get("pause_windows"):
+        add(f"- Pause windows per run: {a['pause_windows']}"
+            + (" (**differ**: divergence may come from where runs paused)"
+               if a.get("pause_windows_differ") else ""))
     add("")
     any_element = any(f.get("sig_basis") == "element" for f in data.get("functions", []))
     add(f"> {_SIG_NOTE_ELEMENT if any_element else _SIG_NOTE_SUMMARY}")
     add("")
+    if any(f.get("sampled") for f in data.get("functions", [])):
+        add(f"> {_SIG_NOTE_SAMPLED}")
+        add("")
 
     add("## Coverage: what was observed")
     add("")
     tiers = cov.get("calls_per_tier", {})
     add(f"- Traced calls per tier: {tiers if tiers else 'none'}")
     add(f"- Monitor (T4) available: {cov.get('monitor_available', False)}")
+    if cov.get("calls_per_region"):
+        add(f"- Traced calls per region: {cov['calls_per_region']}")
     untraced = cov.get("untraced_numerical_callables", [])
     if untraced:
         add("")
@@ -71,6 +92,15 @@ def render_markdown(data: dict) -> str:
         add("|---|---|")
         for entry in untraced[:15]:
             add(f"| `{entry['function']}` | {entry['calls']} |")
+    skipped = cov.get("calls_skipped_by_sampling", {})
+    if skipped:
+        add("")
+        add("Calls skipped by call sampling (all runs):")
+        add("")
+        add("| Function | Skipped calls |")
+        add("|---|---|")
+        for name, count in list(skipped.items())[:15]:
+            add(f"| `{name}` | {count} |")
     native = cov.get("native_kernels", {})
     if native:
         add("")
@@ -94,7 +124,7 @@ def render_markdown(data: dict) -> str:
         for row in top:
             add(
                 f"| `{row['function']}` | {_fmt(row['min_output_sig_bits'])} "
-                f"| {row.get('sig_basis', 'summary')} "
+                f"| {_basis(row)} "
                 f"| {_fmt(row['max_amplification_bits'])} "
                 f"| {_fmt(row['divergence_score'], 3)} "
                 f"| {'yes' if row['nan_instability'] else '-'} "
@@ -104,6 +134,41 @@ def render_markdown(data: dict) -> str:
         add("No traced calls were aggregated.")
     add("")
 
+    adaptive = exp.get("adaptive")
+    if adaptive:
+        waves = adaptive.get("waves", [])
+        used = waves[-1]["runs"] if waves else 0
+        add("## Convergence")
+        add("")
+        add(f"Adaptive repetition: {used} of at most {adaptive.get('max_runs', '?')} runs "
+            f"in {len(waves)} wave(s); "
+            + ("**converged**" if adaptive.get("converged") else "**not converged**")
+            + f" (target 95% CI width: {_fmt(adaptive.get('target_ci_bits'))} bits).")
+        add("")
+        rows = [r for r in data.get("functions", []) if r.get("min_output_sig_bits") is not None]
+        if rows:
+            add("| Function | min sig (bits) | 95% CI width (bits) |")
+            add("|---|---|---|")
+            for row in sorted(rows, key=lambda r: -(r.get("min_output_sig_ci_bits") or 0)):
+                add(f"| `{row['function']}` | {_fmt(row['min_output_sig_bits'])} "
+                    f"| {_fmt(row.get('min_output_sig_ci_bits'), 2)} |")
+        add("")
+
+    by_region: dict[str, list[dict]] = {}
+    for row in data.get("functions", []):
+        for region in row.get("regions", []):
+            by_region.setdefault(region, []).append(row)
+    if by_region:
+        add("## Regions")
+        add("")
+        add("| Region | Function | min sig (bits) | basis |")
+        add("|---|---|---|---|")
+        for region, rows in sorted(by_region.items()):
+            for row in rows:
+                add(f"| {region} | `{row['function']}` "
+                    f"| {_fmt(row['min_output_sig_bits'])} | {_basis(row)} |")
+        add("")
+
     div = a.get("divergent_calls", [])
     add("## Control-flow divergence")
     add("")
@@ -117,6 +182,18 @@ def render_markdown(data: dict) -> str:
             )
     else:
         add("None: all runs executed the same traced calls.")
+    counts = a.get("call_count_divergence", [])
+    if counts:
+        add("")
+        add("Callsites whose total call count (recorded + sampled out) differs:")
+        add("")
+        add("| Function | Source | Calls per run |")
+        add("|---|---|---|")
+        for entry in counts:
+            add(
+                f"| `{entry['function']}` | {entry['source'] or '-'} "
+                f"| {', '.join(map(str, entry['calls_per_run']))} |"
+            )
     add("")
 
     add("## Reproducibility")
@@ -0,0 +1,203 @@
+"""Run finalization: a finished run's derived artifacts, events.parquet and
+the trace index (events.idx), built from its capture file.
+
+``storage.finalize`` chooses when:
+
+- ``background``: the orchestrator hands each run to a process pool as soon
+  as the run exits, so conversion overlaps with the runs still to come;
+  ``run_experiment`` returns once every run is finalized;
+- ``inline``: the run's own process converts before exiting (the next
+  repetition waits for it). Runs of the batch executor always do, since no
+  orchestrator outlives them;
+- ``deferred``: nothing at run time; ``pytracer finalize <experiment>`` or
+  the first ``pytracer analyze`` converts the pending runs in parallel.
+
+Finalizing is idempotent: a run whose events.parquet is newer than its
+capture file and whose index is fresh is skipped. A capture without events
+gets no events.parquet; its fresh, empty index marks it finalized. Failures never fail the
+run; they are recorded in its metadata.json notes.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import msgspec
+
+from pytracer.storage.parquet import DEFAULT_ROW_GROUP_SIZE, PARQUET_FILENAME, finalize_run
+from pytracer.trace.index import build_index, open_index
+from pytracer.trace.reader import find_events_file
+
+FINALIZE_MODES = ("background", "inline", "deferred")
+
+
+def empty_capture(run_dir: str | Path) -> bool | None:
+    """For a run whose capture holds no complete event, and so gets no
+    events.parquet, whether the capture was truncated; None when it has
+    events or its index is missing or stale."""
+    index = open_index(run_dir)
+    if index is None:
+        return None
+    try:
+        return index.truncated if not len(index) else None
+    finally:
+        index.close()
+
+
+def _pending(run_dir: Path) -> tuple[bool, bool]:
+    """(parquet stale, index stale) for a run with a capture file."""
+    events_path = find_events_file(run_dir)
+    if events_path is None:
+        return False, False
+    index = open_index(run_dir)
+    empty = index is not None and not len(index)
+    if index is not None:
+        index.close()
+    try:
+        parquet_stale = (
+            (run_dir / PARQUET_FILENAME).stat().st_mtime_ns < events_path.stat().st_mtime_ns
+        )
+    except OSError:
+        parquet_stale = not empty  # an empty capture is finalized without a table
+    return parquet_stale, index is None
+
+
+def is_finalized(run_dir: str | Path) -> bool:
+    return not any(_pending(Path(run_dir)))
+
+
+def _record_notes(run_dir: Path, notes: list[str]) -> None:
+    path = run_dir / "metadata.json"
+    try:
+        meta = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return
+    meta["notes"] = [*meta.get("notes", []), *notes]
+    path.write_bytes(msgspec.json.format(msgspec.json.encode(meta), indent=2))
+
+
+def finalize_run_dir(
+    run_dir: str | Path, row_group_size: int = DEFAULT_ROW_GROUP_SIZE, force: bool = False
+) -> list[str] | None:
+    """Build whatever of the run's Parquet table and index is missing or
+    stale (everything with *force*).
+
+    Returns None when there was nothing to do, else the failures (empty on
+    success), which are also appended to the run's metadata.json notes.
+    """
+    run_dir = Path(run_dir)
+    parquet_stale, index_stale = _pending(run_dir)
+    if force and find_events_file(run_dir) is not None:
+        parquet_stale = index_stale = True
+    if not (parquet_stale or index_stale):
+        return None
+    notes = []
+    if parquet_stale:
+        try:
+            finalize_run(run_dir, row_group_size=row_group_size)
+        except Exception as e:  # parquet is an artifact, not the capture
+            notes.append(f"parquet finalize failed: {type(e).__name__}: {e}")
+    if index_stale:
+        try:
+            build_index(run_dir)
+        except Exception as e:  # so is the index: readers rebuild or scan
+            notes.append(f"trace index failed: {type(e).__name__}: {e}")
+    if notes:
+        _record_notes(run_dir, notes)
+    return notes
+
+
+def _process_pool(jobs: int) -> ProcessPoolExecutor:
+    # spawn: the orchestrator is multi-threaded, and forking it is unsafe
+    return ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn"))
+
+
+class BackgroundFinalizer:
+    """Finalizes runs in worker processes while the experiment goes on.
+
+    ``submit`` may be called from the run threads; workers start with the
+    first submission.
+    """
+
+    def __init__(self, jobs: int, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        self.row_group_size = row_group_size
+        self._pool: ProcessPoolExecutor | None = _process_pool(jobs)
+        self._futures: dict[str, Future] = {}
+
+    def submit(self, run_dir: Path) -> None:
+        if self._pool is None:
+            raise RuntimeError("cannot submit runs to a closed finalizer")
+        self._futures[run_dir.name] = self._pool.submit(
+            finalize_run_dir, run_dir, self.row_group_size
+        )
+
+    def wait(self) -> list[str]:
+        """Block until every submitted run is finalized; returns warnings."""
+        warnings: list[str] = []
+        for run_id, future in sorted(self._futures.items()):
+            try:
+                notes = future.result()
+            except Exception as e:  # a crashed worker
+                notes = [f"finalize failed: {type(e).__name__}: {e}"]
+            warnings.extend(f"{run_id}: {note}" for note in notes or [])
+        self._futures.clear()
+        self.close()
+        return warnings
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+@dataclass(slots=True)
+class FinalizeResult:
+    finalized: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)  # already up to date
+    warnings: list[str] = field(default_factory=list)
+
+
+def finalize_experiment(
+    experiment_dir: str | Path,
+    jobs: int | None = None,
+    force: bool = False,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> FinalizeResult:
+    """Finalize every finished run of an experiment, *jobs* at a time
+    (default: one per CPU). Runs still executing (no exit code recorded)
+    are left alone."""
+    result = FinalizeResult()
+    pending: list[Path] = []
+    for run_dir in sorted(Path(experiment_dir).glob("runs/run-*")):
+        try:
+            finished = json.loads((run_dir / "metadata.json").read_bytes()).get("exit_code")
+        except (OSError, ValueError):
+            finished = None
+        if finished is None or find_events_file(run_dir) is None:
+            continue
+        if force or not is_finalized(run_dir):
+            pending.append(run_dir)
+        else:
+            result.skipped.append(run_dir.name)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(pending)))
+    if jobs == 1:
+        outcomes = [finalize_run_dir(d, row_group_size, force) for d in pending]
+    else:
+        with _process_pool(jobs) as pool:
+            outcomes = list(
+                pool.map(
+                    finalize_run_dir,
+                    pending,
+                    [row_group_size] * len(pending),
+                    [force] * len(pending),
+                )
+            )
+    for run_dir, notes in zip(pending, outcomes, strict=True):
+        result.finalized.append(run_dir.name)
+        result.warnings.extend(f"{run_dir.name}: {note}" for note in notes or [])
+    return result
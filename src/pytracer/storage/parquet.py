@@ -1,20 +1,29 @@
-"""Finalize a run: convert the append-safe JSONL capture to a Parquet table.
+"""Finalize a run: convert the append-safe capture to a Parquet table.
 
 Capture never writes Parquet directly (buffered row groups + a crashing
-traced program = truncated files). The JSONL capture remains the canonical
-input for pytracer's own analysis; events.parquet is the interoperable
-artifact for external tools (pandas, duckdb, ...).
+traced program = truncated files). The JSONL (or binary) capture remains
+the canonical input for pytracer's own analysis; events.parquet is the interoperable
+artifact for external tools (pandas, duckdb, ...). It keeps one row per
+argument: call records are split, so rows of one record share its event_id.
+
+Conversion streams: events are decoded from the capture in batches of one
+row group, turned into an Arrow record batch column by column, and appended
+through a ``ParquetWriter``, so a run of any length finalizes in constant
+memory.
 """
 
 from __future__ import annotations
 
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
 
-from pytracer.trace.event import TraceEvent
-from pytracer.trace.reader import iter_events
-from pytracer.trace.writer import EVENTS_FILENAME
+from pytracer.trace.event import NumericSummary, TraceEvent
+from pytracer.trace.reader import EventStream, find_events_file, iter_argument_events
 
 PARQUET_FILENAME = "events.parquet"
+DEFAULT_ROW_GROUP_SIZE = 65536
+TRUNCATED_KEY = "pytracer.truncated"  # schema metadata: the capture's final event was partial
 
 _COLUMNS = [
     ("schema_version", "string"),
@@ -35,6 +44,8 @@ _COLUMNS = [
     ("source_lineno", "int64"),
     ("note", "string"),
     ("ts_ns", "int64"),
+    ("callsite_id", "int64"),
+    ("region", "string"),
     ("dtype", "string"),
     ("shape", "list<int64>"),
     ("size", "int64"),
@@ -49,53 +60,79 @@ _COLUMNS = [
     ("zero_count", "int64"),
     ("subnormal_count", "int64"),
     ("fingerprint", "string"),
+    ("sample_ratio", "float64"),
+    ("mean_stderr", "float64"),
 ]
 
 
-def _row(ev: TraceEvent) -> dict:
-    s = ev.summary
-    return {
-        "schema_version": ev.schema_version,
-        "run_id": ev.run_id,
-        "event_id": ev.event_id,
-        "call_id": ev.call_id,
-        "parent_call_id": ev.parent_call_id,
-        "occurrence": ev.occurrence,
-        "phase": ev.phase,
-        "module": ev.module,
-        "qualname": ev.qualname,
-        "tier": ev.tier,
-        "ufunc_method": ev.ufunc_method,
-        "arg_name": ev.arg_name,
-        "inplace": ev.inplace,
-        "payload_kind": ev.payload_kind,
-        "source_file": ev.source.file if ev.source else None,
-        "source_lineno": ev.source.lineno if ev.source else None,
-        "note": ev.note,
-        "ts_ns": ev.ts_ns,
-        "dtype": s.dtype if s else None,
-        "shape": list(s.shape) if s else None,
-        "size": s.size if s else None,
-        "mean": s.mean if s else None,
-        "std": s.std if s else None,
-        "min": s.min if s else None,
-        "max": s.max if s else None,
-        "l2_norm": s.l2_norm if s else None,
-        "linf_norm": s.linf_norm if s else None,
-        "nan_count": s.nan_count if s else None,
-        "inf_count": s.inf_count if s else None,
-        "zero_count": s.zero_count if s else None,
-        "subnormal_count": s.subnormal_count if s else None,
-        "fingerprint": s.fingerprint if s else None,
+_SOURCE_COLUMNS = {"source_file": "file", "source_lineno": "lineno"}
+_SUMMARY_COLUMNS = {
+    name for name, _ in _COLUMNS
+    if name in NumericSummary.__struct_fields__ and name != "shape"
+}
+
+
+def _schema(pa, truncated: bool = False):
+    types = {
+        "list<int64>": pa.list_(pa.int64()),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+        "string": pa.string(),
     }
+    return pa.schema(
+        [pa.field(name, types[kind]) for name, kind in _COLUMNS],
+        metadata={TRUNCATED_KEY: "true" if truncated else "false"},
+    )
+
+
+def _record_batch(pa, schema, events: list[TraceEvent]):
+    """Build one record batch column by column from the event structs."""
+    summaries = [ev.summary for ev in events]
+    sources = [ev.source for ev in events]
+    columns = []
+    for name in schema.names:
+        if name in _SOURCE_COLUMNS:
+            get = attrgetter(_SOURCE_COLUMNS[name])
+            values = [get(src) if src is not None else None for src in sources]
+        elif name == "shape":
+            values = [list(s.shape) if s is not None else None for s in summaries]
+        elif name in _SUMMARY_COLUMNS:
+            get = attrgetter(name)
+            values = [get(s) if s is not None else None for s in summaries]
+        else:
+            get = attrgetter(name)
+            values = [get(ev) for ev in events]
+        columns.append(values)
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema, strict=True)],
+        schema=schema,
+    )
 
 
-def finalize_run(run_dir: str | Path) -> Path | None:
-    """Write events.parquet next to events.jsonl. Returns the path, or None
-    when pyarrow is unavailable or there are no events."""
+def _copy_truncated(pq, schema, src: Path, dst: Path) -> None:
+    """Copy *src* row group by row group under *schema* (flagged truncated)."""
+    source = pq.ParquetFile(src)
+    with pq.ParquetWriter(dst, schema, compression="zstd") as writer:
+        for i in range(source.num_row_groups):
+            writer.write_table(source.read_row_group(i))
+
+
+def finalize_run(
+    run_dir: str | Path, row_group_size: int = DEFAULT_ROW_GROUP_SIZE
+) -> Path | None:
+    """Write events.parquet next to the capture file. Returns the path, or
+    None when pyarrow is unavailable or there are no events.
+
+    Events are decoded and written *row_group_size* rows at a time, so peak
+    memory is one batch whatever the length of the trace. The truncation
+    flag lives in the schema metadata, fixed when the writer opens, but is
+    only known once the capture has been read: a truncated capture (a run
+    that crashed) is copied once more to set it.
+    """
     run_dir = Path(run_dir)
-    events_path = run_dir / EVENTS_FILENAME
-    if not events_path.is_file():
+    events_path = find_events_file(run_dir)
+    if events_path is None:
         return None
     try:
         import pyarrow as pa
@@ -103,24 +140,31 @@ def finalize_run(run_dir: str | Path) -> Path | None:
     except ImportError:
         return None
 
-    events, _truncated = iter_events(events_path)
-    rows = [_row(ev) for ev in events]
-
-    fields = []
-    for name, kind in _COLUMNS:
-        if kind == "list<int64>":
-            fields.append(pa.field(name, pa.list_(pa.int64())))
-        elif kind == "int64":
-            fields.append(pa.field(name, pa.int64()))
-        elif kind == "float64":
-            fields.append(pa.field(name, pa.float64()))
-        elif kind == "bool":
-            fields.append(pa.field(name, pa.bool_()))
-        else:
-            fields.append(pa.field(name, pa.string()))
-    schema = pa.schema(fields)
-    columns = {name: [r[name] for r in rows] for name, _ in _COLUMNS}
-    table = pa.Table.from_pydict(columns, schema=schema)
+    schema = _schema(pa)
     out = run_dir / PARQUET_FILENAME
-    pq.write_table(table, out, compression="zstd")
+    tmp = out.with_suffix(".tmp")
+    stream = EventStream(events_path)
+    events = iter_argument_events(stream)
+    n_rows = 0
+    try:
+        with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+            while batch := list(islice(events, row_group_size)):
+                writer.write_batch(_record_batch(pa, schema, batch), row_group_size=row_group_size)
+                n_rows += len(batch)
+        if n_rows and stream.truncated:
+            flagged = out.with_suffix(".truncated.tmp")
+            try:
+                _copy_truncated(pq, _schema(pa, truncated=True), tmp, flagged)
+            except BaseException:
+                flagged.unlink(missing_ok=True)
+                raise
+            flagged.replace(tmp)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if not n_rows:
+        tmp.unlink()
+        out.unlink(missing_ok=True)  # from an earlier capture of this run
+        return None
+    tmp.replace(out)
     return out
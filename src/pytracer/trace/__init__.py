@@ -1,3 +1,17 @@
-from pytracer.trace.event import SCHEMA_VERSION, NumericSummary, SourceRef, TraceEvent
+from pytracer.trace.event import (
+    SCHEMA_VERSION,
+    ArgRecord,
+    Callsite,
+    NumericSummary,
+    SourceRef,
+    TraceEvent,
+)
 
-__all__ = ["SCHEMA_VERSION", "TraceEvent", "NumericSummary", "SourceRef"]
+__all__ = [
+    "SCHEMA_VERSION",
+    "TraceEvent",
+    "ArgRecord",
+    "NumericSummary",
+    "SourceRef",
+    "Callsite",
+]
@@ -0,0 +1,331 @@
+"""Compact binary capture format (``capture_format = "binary"``).
+
+Layout: an 8-byte magic, then a sequence of records
+
+    <u32 payload length> <u32 crc32(kind + payload)> <u8 kind> <payload>
+
+Payloads are msgpack arrays. Repeated strings (run id, module, qualname,
+source file, arg names, dtypes, ...) are interned: the first use of a string
+emits a STRING side record ``[id, text]`` and events carry the small integer
+id afterwards. Call records (see trace.event) append their argument list
+to the event array, each entry packed like a per-argument event's payload,
+then the region string id when the call ran inside a pytracer.region.
+Callsite table entries are CALLSITE side records, written
+before the first event that references them. Every record is self-delimiting
+and checksummed, so the JSONL guarantee carries over: a crash loses at most
+the final partial record, and a bad checksum anywhere else is corruption.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import zlib
+from collections.abc import Generator
+from pathlib import Path
+
+import msgspec
+
+from pytracer._errors import PytracerError
+from pytracer.trace.event import (
+    ArgRecord,
+    Callsite,
+    NumericSummary,
+    SourceRef,
+    TraceEvent,
+    resolve_callsite,
+)
+
+BINARY_SUFFIX = ".ptb"
+BINARY_EVENTS_FILENAME = f"events{BINARY_SUFFIX}"
+MAGIC = b"PTRCBIN1"
+
+KIND_STRING = 1
+KIND_EVENT = 2
+KIND_CALLSITE = 3
+
+_HEADER = struct.Struct("<IIB")
+_KIND_CRC = {
+    kind: zlib.crc32(bytes((kind,))) for kind in (KIND_STRING, KIND_EVENT, KIND_CALLSITE)
+}
+
+
+def _pack_summary(s: NumericSummary, dtype_id: int | None) -> tuple:
+    return (
+        dtype_id,
+        s.shape,
+        s.size,
+        s.mean,
+        s.std,
+        s.min,
+        s.max,
+        s.l2_norm,
+        s.linf_norm,
+        s.nan_count,
+        s.inf_count,
+        s.zero_count,
+        s.subnormal_count,
+        s.cancellation,
+        s.fingerprint,
+        s.sample_ratio,
+        s.mean_stderr,
+    )
+
+
+def _unpack_summary(packed: list | None, strings: list[str]) -> NumericSummary | None:
+    if packed is None:
+        return None
+    dtype, shape, *rest = packed
+    return NumericSummary(strings[dtype], tuple(shape), *rest)
+
+
+class BinaryEncoder:
+    """Stateful encoder: one per output file (string ids are per file)."""
+
+    def __init__(self):
+        self._encoder = msgspec.msgpack.Encoder()
+        self._ids: dict[str, int] = {}
+        # whole-header cache: one dict lookup per event on the hot path
+        self._headers: dict[tuple, tuple] = {}
+
+    def _record(self, kind: int, payload: bytes) -> bytes:
+        crc = zlib.crc32(payload, _KIND_CRC[kind])
+        return _HEADER.pack(len(payload), crc, kind) + payload
+
+    def _intern(self, text: str | None, out: list[bytes]) -> int | None:
+        if text is None:
+            return None
+        sid = self._ids.get(text)
+        if sid is None:
+            sid = self._ids[text] = len(self._ids)
+            out.append(self._record(KIND_STRING, self._encoder.encode((sid, text))))
+        return sid
+
+    def encode(self, ev: TraceEvent) -> bytes:
+        """Encode one event, preceded by any STRING records it introduces."""
+        out: list[bytes] = []
+        s = ev.summary
+        src = ev.source
+        header = (
+            ev.schema_version,
+            ev.run_id,
+            ev.phase,
+            ev.module,
+            ev.qualname,
+            ev.tier,
+            ev.ufunc_method,
+            ev.arg_name,
+            ev.payload_kind,
+            src.file if src is not None else None,
+            s.dtype if s is not None else None,
+        )
+        ids = self._headers.get(header)
+        if ids is None:
+            ids = self._headers[header] = tuple(self._intern(t, out) for t in header)
+        packed_summary = None if s is None else _pack_summary(s, ids[10])
+        packed_args = None
+        if ev.args is not None:
+            intern = self._intern
+            packed_args = []
+            for arg in ev.args:
+                a = arg.summary
+                packed_args.append((
+                    intern(arg.name, out),
+                    intern(arg.payload_kind, out),
+                    None if a is None else _pack_summary(a, intern(a.dtype, out)),
+                    arg.payload_ref,
+                ))
+        packed: tuple = (  # + optional trailing args, region
+            ids[0],
+            ids[1],
+            ev.event_id,
+            ev.call_id,
+            ev.occurrence,
+            ids[2],
+            ids[3],
+            ids[4],
+            ids[5],
+            ev.parent_call_id,
+            ids[6],
+            ids[7],
+            ev.inplace,
+            ids[8],
+            packed_summary,
+            ev.payload_ref,
+            ids[9],
+            src.lineno if src is not None else None,
+            ev.note,
+            ev.ts_ns,
+            ev.callsite_id,
+        )
+        if ev.region is not None:
+            packed += (packed_args, self._intern(ev.region, out))
+        elif packed_args is not None:
+            packed += (packed_args,)
+        out.append(self._record(KIND_EVENT, self._encoder.encode(packed)))
+        return b"".join(out) if len(out) > 1 else out[0]
+
+    def encode_callsite(self, site: Callsite) -> bytes:
+        out: list[bytes] = []
+        intern = self._intern
+        src = site.source
+        packed = (
+            site.callsite_id,
+            intern(site.module, out),
+            intern(site.qualname, out),
+            intern(site.tier, out),
+            intern(site.ufunc_method, out),
+            intern(src.file, out) if src is not None else None,
+            src.lineno if src is not None else None,
+        )
+        out.append(self._record(KIND_CALLSITE, self._encoder.encode(packed)))
+        return b"".join(out)
+
+
+def _unpack_callsite(packed: list, strings: list[str]) -> Callsite:
+    callsite_id, module, qualname, tier, ufunc_method, src_file, src_lineno = packed
+    return Callsite(
+        callsite_id=callsite_id,
+        module=strings[module],
+        qualname=strings[qualname],
+        tier=strings[tier],  # type: ignore[arg-type]
+        ufunc_method=strings[ufunc_method] if ufunc_method is not None else None,
+        source=SourceRef(strings[src_file], src_lineno) if src_file is not None else None,
+    )
+
+
+def _unpack_event(packed: list, strings: list[str]) -> TraceEvent:
+    (sv, run_id, event_id, call_id, occurrence, phase, module, qualname, tier,
+     parent, ufunc_method, arg_name, inplace, payload_kind, packed_summary,
+     payload_ref, src_file, src_lineno, note, ts_ns, callsite_id, *extra) = packed
+
+    def lookup(sid):
+        return strings[sid] if sid is not None else None
+
+    args = None
+    if extra and extra[0] is not None:
+        args = [
+            ArgRecord(
+                name=strings[name],
+                payload_kind=strings[kind],  # type: ignore[arg-type]
+                summary=_unpack_summary(arg_summary, strings),
+                payload_ref=ref,
+            )
+            for name, kind, arg_summary, ref in extra[0]
+        ]
+    return TraceEvent(
+        schema_version=strings[sv],
+        run_id=strings[run_id],
+        event_id=event_id,
+        call_id=call_id,
+        occurrence=occurrence,
+        phase=strings[phase],  # type: ignore[arg-type]
+        module=strings[module],
+        qualname=strings[qualname],
+        tier=strings[tier],  # type: ignore[arg-type]
+        parent_call_id=parent,
+        ufunc_method=lookup(ufunc_method),
+        arg_name=lookup(arg_name),
+        inplace=inplace,
+        payload_kind=strings[payload_kind],  # type: ignore[arg-type]
+        summary=_unpack_summary(packed_summary, strings),
+        payload_ref=payload_ref,
+        source=SourceRef(strings[src_file], src_lineno) if src_file is not None else None,
+        note=note,
+        ts_ns=ts_ns,
+        callsite_id=callsite_id,
+        args=args,
+        region=strings[extra[1]] if len(extra) > 1 else None,
+    )
+
+
+class BinaryDecoder:
+    """Stateful record decoder: the string table and callsites seen so far.
+
+    Seeded with a finished file's tables (see trace.index), it decodes any
+    single event record out of order.
+    """
+
+    def __init__(
+        self, strings: list[str] | None = None, callsites: dict[int, Callsite] | None = None
+    ):
+        self.strings: list[str] = strings if strings is not None else []
+        self.callsites: dict[int, Callsite] = callsites if callsites is not None else {}
+        self._decoder = msgspec.msgpack.Decoder()
+
+    def decode(self, kind: int, payload: bytes) -> TraceEvent | None:
+        """The event of an event record; None for side records. Raises
+        msgspec.DecodeError, ValueError, TypeError or IndexError on bad input."""
+        if kind == KIND_STRING:
+            sid, text = self._decoder.decode(payload)
+            if sid != len(self.strings):
+                raise ValueError(f"string id {sid} out of sequence")
+            self.strings.append(text)
+        elif kind == KIND_EVENT:
+            event = _unpack_event(self._decoder.decode(payload), self.strings)
+            resolve_callsite(event, self.callsites)
+            return event
+        elif kind == KIND_CALLSITE:
+            site = _unpack_callsite(self._decoder.decode(payload), self.strings)
+            self.callsites[site.callsite_id] = site
+        else:
+            raise ValueError(f"unknown record kind {kind}")
+        return None
+
+
+def iter_binary_records(path: str | Path) -> Generator[tuple[int, int, bytes], None, bool]:
+    """Yield (kind, payload offset, payload) for each checksummed record of a
+    binary capture file; returns truncated (the ``StopIteration`` value).
+
+    The file is memory-mapped and read record by record, so memory does not
+    grow with the file.
+    """
+    with open(path, "rb") as fo:
+        end = os.fstat(fo.fileno()).st_size
+        if end < len(MAGIC):
+            if MAGIC.startswith(fo.read()):
+                return True  # died before the magic was fully flushed
+            raise PytracerError(f"{path}: not a pytracer binary trace")
+        with mmap.mmap(fo.fileno(), 0, access=mmap.ACCESS_READ) as raw:
+            if raw[: len(MAGIC)] != MAGIC:
+                raise PytracerError(f"{path}: not a pytracer binary trace")
+            pos = len(MAGIC)
+            while pos < end:
+                if end - pos < _HEADER.size:
+                    return True
+                length, crc, kind = _HEADER.unpack_from(raw, pos)
+                body_start = pos + _HEADER.size
+                body_end = body_start + length
+                if body_end > end:
+                    return True
+                payload = raw[body_start:body_end]
+                if zlib.crc32(payload, _KIND_CRC.get(kind, 0)) != crc:
+                    if body_end == end:
+                        return True
+                    raise PytracerError(
+                        f"{path}: corrupt record at byte {pos} (checksum mismatch)"
+                    )
+                yield kind, body_start, payload
+                pos = body_end
+    return False
+
+
+def iter_binary_events(path: str | Path) -> Generator[TraceEvent, None, bool]:
+    """Yield a binary capture file's events; returns truncated (see
+    trace.reader.EventStream)."""
+    decoder = BinaryDecoder()
+    records = iter_binary_records(path)
+    while True:
+        try:
+            kind, offset, payload = next(records)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            event = decoder.decode(kind, payload)
+        except (msgspec.DecodeError, ValueError, TypeError, IndexError) as e:
+            raise PytracerError(
+                f"{path}: corrupt record at byte {offset - _HEADER.size}: {e}"
+            ) from e
+        if event is not None:
+            yield event
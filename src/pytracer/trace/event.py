@@ -2,6 +2,23 @@
 
 Every artifact pytracer writes carries SCHEMA_VERSION. Events are the wire
 format; analysis reassembles them into calls (see trace.reader.CallRecord).
+
+Callsite identity (module, qualname, tier, ufunc method, source) is interned
+per run: the recorder writes one ``Callsite`` record on first sight and
+events then carry only its ``callsite_id``, leaving ``module``/``qualname``
+empty. Readers fill those fields back in, so consumers see full events.
+
+The recorder writes *call records*: one "input" event carrying every input
+argument in ``args``, then one "output" (or "exception") event carrying the
+results, each stamped with ``ts_ns`` at its end of the call. Per-argument
+events (``arg_name``/``summary`` set, ``args`` None) are still read, and
+``trace.reader.expand_arguments`` turns records back into them for
+consumers that want one row per argument.
+
+Version 3 introduced call records, interned callsites and ``region``;
+readers still accept 2.x traces (per-argument events, full callsite fields
+on every event) and reject any other major version rather than misread it
+(``check_schema_version``).
 """
 
 from __future__ import annotations
@@ -10,13 +27,27 @@ from typing import Literal
 
 import msgspec
 
-SCHEMA_VERSION = "2.0.0"
+from pytracer._errors import PytracerError
+
+SCHEMA_VERSION = "3.0.0"
+READABLE_SCHEMA_MAJORS = (2, 3)
 
 Phase = Literal["input", "output", "exception"]
 PayloadKind = Literal["none", "summary", "array_ref"]
 Tier = Literal["t1", "t2", "t3", "t4"]
 
 
+def check_schema_version(version: str, source: object) -> None:
+    """Raise PytracerError unless events of *version* can be read."""
+    major = version.partition(".")[0]
+    if not (major.isdigit() and int(major) in READABLE_SCHEMA_MAJORS):
+        readable = ", ".join(f"{m}.x" for m in READABLE_SCHEMA_MAJORS)
+        raise PytracerError(
+            f"{source}: trace schema version {version!r} is not supported "
+            f"(this pytracer reads {readable})"
+        )
+
+
 class SourceRef(msgspec.Struct, frozen=True, omit_defaults=True):
     file: str
     lineno: int
@@ -38,6 +69,28 @@ class NumericSummary(msgspec.Struct, omit_defaults=True):
     subnormal_count: int = 0
     cancellation: float | None = None
     fingerprint: str | None = None
+    # set only by trace.mode = "sampled" on arrays above sample_threshold:
+    # fraction of elements summarized, and the standard error of ``mean``
+    sample_ratio: float | None = None
+    mean_stderr: float | None = None
+
+
+class ArgRecord(msgspec.Struct, omit_defaults=True):
+    """One argument (or result) inside a call record."""
+
+    name: str
+    payload_kind: PayloadKind = "none"
+    summary: NumericSummary | None = None
+    payload_ref: str | None = None
+
+
+class Callsite(msgspec.Struct, omit_defaults=True):
+    callsite_id: int
+    module: str
+    qualname: str
+    tier: Tier = "t1"
+    ufunc_method: str | None = None
+    source: SourceRef | None = None
 
 
 class TraceEvent(msgspec.Struct, omit_defaults=True):
@@ -47,8 +100,8 @@ class TraceEvent(msgspec.Struct, omit_defaults=True):
     call_id: int
     occurrence: int
     phase: Phase
-    module: str
-    qualname: str
+    module: str = ""  # empty when interned: see callsite_id
+    qualname: str = ""
     tier: Tier = "t1"
     parent_call_id: int | None = None
     ufunc_method: str | None = None
@@ -60,3 +113,18 @@ class TraceEvent(msgspec.Struct, omit_defaults=True):
     source: SourceRef | None = None
     note: str | None = None  # exception text on phase == "exception"
     ts_ns: int | None = None  # monotonic nanoseconds within the run
+    callsite_id: int | None = None
+    args: list[ArgRecord] | None = None  # set on call records (see module docstring)
+    region: str | None = None  # innermost pytracer.region path at call time
+
+
+def resolve_callsite(event: TraceEvent, callsites: dict[int, Callsite]) -> None:
+    """Fill an interned event's callsite fields in place from its table entry."""
+    site = callsites.get(event.callsite_id) if event.callsite_id is not None else None
+    if site is None or event.module:
+        return
+    event.module = site.module
+    event.qualname = site.qualname
+    event.tier = site.tier
+    event.ufunc_method = site.ufunc_method
+    event.source = site.source
@@ -0,0 +1,436 @@
+"""Per-run random-access index over a capture file (``events.idx``).
+
+Written when a run is finalized (and on demand by ``open_index``), the
+index maps every call to the byte ranges of its events in the capture file
+and every callsite to its calls in occurrence order, so one call's events
+are fetched without reading the rest of the trace:
+
+    index = open_index(run_dir)
+    index.call(call_id)                 # CallRecord, O(1)
+    index.call_at(site, occurrence)     # by alignment key
+    index.call_stubs()                  # structure only: no event decoded
+
+Layout: an 8-byte magic, a u64 header length, a msgpack ``IndexHeader``
+(callsite and string tables, the capture file's size and mtime), then
+8-byte aligned little-endian arrays that are memory-mapped, not loaded:
+
+    call_row[call_id]   row of the call, -1 when absent (call ids are
+                        block-allocated per thread, so the table is dense
+                        up to small gaps)
+    per row:            call_id, site, occurrence, parent (-1: none),
+                        first_event_id, first_ts_ns (-1: none),
+                        region (-1: none), flags, ev_start/ev_count into
+                        the event arrays
+    per event (by row): offset, length of the line or record payload
+    site_rows           rows ordered by (site, occurrence), sliced by
+                        site_start/site_count
+
+The index is only trusted while the capture file keeps the size and mtime
+it was built from. A truncated capture is indexed up to its last complete
+event, like the readers do.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from pathlib import Path
+
+import msgspec
+import numpy as np
+
+from pytracer._errors import PytracerError
+from pytracer.trace.binary import (
+    BINARY_SUFFIX,
+    KIND_EVENT,
+    BinaryDecoder,
+    iter_binary_records,
+)
+from pytracer.trace.event import (
+    Callsite,
+    SourceRef,
+    TraceEvent,
+    check_schema_version,
+    resolve_callsite,
+)
+from pytracer.trace.reader import (
+    CallRecord,
+    assemble_calls,
+    find_events_file,
+    is_final_line,
+    load_callsites,
+)
+
+INDEX_FILENAME = "events.idx"
+INDEX_VERSION = 2
+_MAGIC = b"PTRCIDX1"
+_LENGTH = struct.Struct("<Q")
+_decoder = msgspec.json.Decoder(TraceEvent)
+
+FLAG_EXCEPTION = 1
+FLAG_ARRAYS = 2  # some argument has a stored payload
+
+# (module, qualname, ufunc_method, file, lineno, tier)
+IndexSite = tuple[str, str, str | None, str | None, int | None, str]
+
+
+class IndexHeader(msgspec.Struct):
+    version: int
+    events_file: str
+    events_size: int
+    events_mtime_ns: int
+    truncated: bool
+    sites: list[IndexSite]
+    regions: list[str]
+    callsites: list[Callsite]
+    strings: list[str]  # binary captures: the string table
+    arrays: dict[str, tuple[int, str, int]]  # name -> (offset, dtype, length)
+
+
+def _jsonl_spans(path: Path):
+    """Yield (offset, length, event) per line; returns truncated."""
+    with open(path, "rb") as fo:
+        size = os.fstat(fo.fileno()).st_size
+        if size == 0:
+            return False
+        with mmap.mmap(fo.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = line_no = 0
+            while pos < size:
+                line_no += 1
+                stop = mm.find(b"\n", pos)
+                stop = size if stop < 0 else stop
+                line = mm[pos:stop]
+                if line.strip():
+                    try:
+                        event = _decoder.decode(line)
+                    except msgspec.DecodeError as e:
+                        if is_final_line(mm, stop):
+                            return True
+                        raise PytracerError(
+                            f"{path}: corrupt event at line {line_no}: {e}"
+                        ) from e
+                    yield pos, stop - pos, event
+                pos = stop + 1
+    return False
+
+
+def _binary_spans(path: Path, decoder: BinaryDecoder):
+    records = iter_binary_records(path)
+    while True:
+        try:
+            kind, offset, payload = next(records)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            event = decoder.decode(kind, payload)
+        except (msgspec.DecodeError, ValueError, TypeError, IndexError) as e:
+            raise PytracerError(f"{path}: corrupt record at byte {offset}: {e}") from e
+        if event is not None:
+            yield offset, len(payload), event
+
+
+def build_index(run_dir: str | Path) -> Path | None:
+    """Scan the run's capture file once and write events.idx; None without one."""
+    run_dir = Path(run_dir)
+    events_path = find_events_file(run_dir)
+    if events_path is None:
+        return None
+    stat = events_path.stat()
+
+    binary = events_path.suffix == BINARY_SUFFIX
+    decoder = BinaryDecoder()
+    callsites: dict[int, Callsite] = {}
+    if binary:
+        spans = _binary_spans(events_path, decoder)
+    else:
+        callsites = load_callsites(run_dir)
+        spans = _jsonl_spans(events_path)
+
+    sites: dict[IndexSite, int] = {}
+    regions: dict[str, int] = {}
+    rows: dict[int, list] = {}  # call_id -> [site, occurrence, parent, first, region, flags, ts]
+    ev_call: list[int] = []
+    ev_offset: list[int] = []
+    ev_length: list[int] = []
+    truncated = False
+    while True:
+        try:
+            offset, length, ev = next(spans)
+        except StopIteration as stop:
+            truncated = bool(stop.value)
+            break
+        if not ev_call:
+            check_schema_version(ev.schema_version, events_path)
+        if not binary:
+            resolve_callsite(ev, callsites)
+        ev_call.append(ev.call_id)
+        ev_offset.append(offset)
+        ev_length.append(length)
+        row = rows.get(ev.call_id)
+        if row is None:
+            site = (
+                ev.module,
+                ev.qualname,
+                ev.ufunc_method,
+                ev.source.file if ev.source else None,
+                ev.source.lineno if ev.source else None,
+                ev.tier,
+            )
+            region = -1 if ev.region is None else regions.setdefault(ev.region, len(regions))
+            row = rows[ev.call_id] = [
+                sites.setdefault(site, len(sites)),
+                ev.occurrence,
+                -1 if ev.parent_call_id is None else ev.parent_call_id,
+                ev.event_id,
+                region,
+                0,
+                -1 if ev.ts_ns is None else ev.ts_ns,
+            ]
+        if ev.phase == "exception":
+            row[5] |= FLAG_EXCEPTION
+        if ev.payload_ref or any(a.payload_ref for a in ev.args or ()):
+            row[5] |= FLAG_ARRAYS
+
+    call_ids = np.fromiter(rows, dtype=np.int64, count=len(rows))
+    table = np.array(list(rows.values()), dtype=np.int64).reshape(len(rows), 7)
+    row_of = {cid: i for i, cid in enumerate(rows)}
+    ev_rows = np.fromiter((row_of[c] for c in ev_call), dtype=np.int64, count=len(ev_call))
+    order = np.argsort(ev_rows, kind="stable")  # events grouped by call, file order within
+    ev_count = np.bincount(ev_rows, minlength=len(rows)).astype(np.int32)
+    ev_start = np.zeros(len(rows), dtype=np.int64)
+    if len(rows) > 1:
+        np.cumsum(ev_count[:-1], out=ev_start[1:])
+
+    call_row = np.full(int(call_ids.max()) + 1 if len(rows) else 0, -1, dtype=np.int32)
+    call_row[call_ids] = np.arange(len(rows), dtype=np.int32)
+    site_rows = np.lexsort((table[:, 1], table[:, 0])).astype(np.int32)
+    site_count = np.bincount(table[:, 0], minlength=len(sites)).astype(np.int32)
+    site_start = np.zeros(len(sites), dtype=np.int64)
+    if len(sites) > 1:
+        np.cumsum(site_count[:-1], out=site_start[1:])
+
+    arrays: dict[str, np.ndarray] = {
+        "call_row": call_row,
+        "call_id": call_ids,
+        "site": table[:, 0].astype(np.int32),
+        "occurrence": table[:, 1],
+        "parent": table[:, 2],
+        "first_event_id": table[:, 3],
+        "first_ts_ns": table[:, 6],
+        "region": table[:, 4].astype(np.int32),
+        "flags": table[:, 5].astype(np.uint8),
+        "ev_start": ev_start,
+        "ev_count": ev_count,
+        "ev_offset": np.asarray(ev_offset, dtype=np.int64)[order],
+        "ev_length": np.asarray(ev_length, dtype=np.int32)[order],
+        "site_rows": site_rows,
+        "site_start": site_start,
+        "site_count": site_count,
+    }
+    header = IndexHeader(
+        version=INDEX_VERSION,
+        events_file=events_path.name,
+        events_size=stat.st_size,
+        events_mtime_ns=stat.st_mtime_ns,
+        truncated=truncated,
+        sites=list(sites),
+        regions=list(regions),
+        callsites=list((decoder.callsites if binary else callsites).values()),
+        strings=decoder.strings if binary else [],
+        arrays={},
+    )
+    # array offsets are relative to the first 8-byte boundary after the header
+    position = 0
+    for name, array in arrays.items():
+        header.arrays[name] = (position, array.dtype.str, len(array))
+        position += -(-array.nbytes // 8) * 8
+    encoded = msgspec.msgpack.encode(header)
+    out = run_dir / INDEX_FILENAME
+    tmp = out.with_suffix(".tmp")
+    with open(tmp, "wb") as fo:
+        fo.write(_MAGIC + _LENGTH.pack(len(encoded)) + encoded)
+        fo.write(b"\0" * (-fo.tell() % 8))
+        for array in arrays.values():
+            fo.write(array.tobytes())
+            fo.write(b"\0" * (-array.nbytes % 8))
+    tmp.replace(out)
+    return out
+
+
+class TraceIndex:
+    """Random access to one run's calls through its events.idx."""
+
+    def __init__(self, run_dir: Path, header: IndexHeader, index_mm: mmap.mmap, base: int):
+        self.run_dir = run_dir
+        self.header = header
+        self.truncated = header.truncated
+        self.sites = header.sites
+        self._index_mm = index_mm
+        self._arrays = {
+            name: np.frombuffer(index_mm, dtype=np.dtype(dtype), count=length, offset=base + off)
+            for name, (off, dtype, length) in header.arrays.items()
+        }
+        events_path = run_dir / header.events_file
+        self._events_fo = open(events_path, "rb")
+        self._events_mm = (
+            mmap.mmap(self._events_fo.fileno(), 0, access=mmap.ACCESS_READ)
+            if header.events_size
+            else None
+        )
+        self._callsites = {site.callsite_id: site for site in header.callsites}
+        self._binary = (
+            BinaryDecoder(list(header.strings), dict(self._callsites))
+            if events_path.suffix == BINARY_SUFFIX
+            else None
+        )
+
+    def __len__(self) -> int:
+        return len(self._arrays["call_id"])
+
+    def __enter__(self) -> TraceIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._arrays.clear()
+        for mm in (self._index_mm, self._events_mm):
+            try:
+                if mm is not None:
+                    mm.close()
+            except BufferError:
+                pass  # an array view is still referenced; the mapping goes with it
+        self._events_fo.close()
+
+    def _row(self, call_id: int) -> int | None:
+        call_row = self._arrays["call_row"]
+        if not 0 <= call_id < len(call_row):
+            return None
+        row = int(call_row[call_id])
+        return row if row >= 0 else None
+
+    def _decode(self, offset: int, length: int) -> TraceEvent:
+        events_file = self.run_dir / self.header.events_file
+        if self._events_mm is None:
+            raise PytracerError(f"{events_file}: empty, but the index lists events")
+        data = self._events_mm[offset:offset + length]
+        if self._binary is not None:
+            decoded = self._binary.decode(KIND_EVENT, data)
+            if decoded is None:
+                raise PytracerError(f"{events_file}: no event record at byte {offset}")
+            event = decoded
+        else:
+            event = _decoder.decode(data)
+            resolve_callsite(event, self._callsites)
+        return event
+
+    def events(self, call_id: int) -> list[TraceEvent]:
+        """The events of one call, in file order; empty when it is not in the run."""
+        row = self._row(call_id)
+        if row is None:
+            return []
+        start = int(self._arrays["ev_start"][row])
+        stop = start + int(self._arrays["ev_count"][row])
+        offsets = self._arrays["ev_offset"][start:stop]
+        lengths = self._arrays["ev_length"][start:stop]
+        return [self._decode(int(o), int(n)) for o, n in zip(offsets, lengths, strict=True)]
+
+    def call(self, call_id: int) -> CallRecord | None:
+        calls = assemble_calls(self.events(call_id))
+        return calls[0] if calls else None
+
+    def call_ids_at(self, site: int) -> np.ndarray:
+        """Call ids at one index site (``sites[site]``), in occurrence order."""
+        start = int(self._arrays["site_start"][site])
+        rows = self._arrays["site_rows"][start:start + int(self._arrays["site_count"][site])]
+        return self._arrays["call_id"][rows]
+
+    def call_at(self, site: int, occurrence: int) -> CallRecord | None:
+        start = int(self._arrays["site_start"][site])
+        rows = self._arrays["site_rows"][start:start + int(self._arrays["site_count"][site])]
+        occurrences = self._arrays["occurrence"][rows]
+        i = int(np.searchsorted(occurrences, occurrence))
+        if i == len(rows) or occurrences[i] != occurrence:
+            return None
+        return self.call(int(self._arrays["call_id"][rows[i]]))
+
+    def call_stubs(self) -> list[CallRecord]:
+        """Every call with its identity and nesting but no argument summaries,
+        in program order (see ``program_order``), read from the index alone.
+
+        ``exception`` is a placeholder ("exception") when the call raised;
+        ``input_refs`` holds a placeholder entry when it stored arrays.
+        """
+        first_event_id, first_ts = self._arrays["first_event_id"], self._arrays["first_ts_ns"]
+        if np.all(first_ts >= 0):
+            order = np.lexsort((first_event_id, first_ts))
+        else:
+            order = np.argsort(first_event_id, kind="stable")
+        columns = zip(
+            *(
+                self._arrays[name][order].tolist()
+                for name in ("call_id", "site", "occurrence", "parent",
+                             "first_event_id", "first_ts_ns", "region", "flags")
+            ),
+            strict=True,
+        )
+        regions = self.header.regions
+        stubs = []
+        for call_id, site, occurrence, parent, first_event_id, ts, region, flags in columns:
+            module, qualname, ufunc_method, file, lineno, tier = self.sites[site]
+            stubs.append(
+                CallRecord(
+                    call_id=call_id,
+                    module=module,
+                    qualname=qualname,
+                    tier=tier,
+                    ufunc_method=ufunc_method,
+                    source=SourceRef(file, lineno) if file is not None else None,
+                    occurrence=occurrence,
+                    parent_call_id=parent if parent >= 0 else None,
+                    input_refs={"": ""} if flags & FLAG_ARRAYS else {},
+                    exception="exception" if flags & FLAG_EXCEPTION else None,
+                    first_event_id=first_event_id,
+                    region=regions[region] if region >= 0 else None,
+                    first_ts_ns=ts if ts >= 0 else None,
+                )
+            )
+        return stubs
+
+
+def open_index(run_dir: str | Path, build: bool = False) -> TraceIndex | None:
+    """The run's index, or None when it is missing or stale (the capture file
+    changed since). With *build*, a missing or stale index is rebuilt first."""
+    run_dir = Path(run_dir)
+    index = _open(run_dir)
+    if index is None and build and build_index(run_dir) is not None:
+        index = _open(run_dir)
+    return index
+
+
+def _open(run_dir: Path) -> TraceIndex | None:
+    path = run_dir / INDEX_FILENAME
+    try:
+        with open(path, "rb") as fo:
+            mm = mmap.mmap(fo.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        if mm[: len(_MAGIC)] != _MAGIC:
+            raise ValueError("bad magic")
+        (length,) = _LENGTH.unpack_from(mm, len(_MAGIC))
+        start = len(_MAGIC) + _LENGTH.size
+        header = msgspec.msgpack.decode(mm[start:start + length], type=IndexHeader)
+        if header.version != INDEX_VERSION:
+            raise ValueError("old index version")
+        stat = (run_dir / header.events_file).stat()
+        if (stat.st_size, stat.st_mtime_ns) != (header.events_size, header.events_mtime_ns):
+            raise ValueError("stale index")
+        base = start + length
+        base += -base % 8
+        return TraceIndex(run_dir, header, mm, base)
+    except (OSError, ValueError, struct.error, msgspec.DecodeError, msgspec.ValidationError):
+        mm.close()
+        return None
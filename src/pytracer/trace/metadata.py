@@ -41,6 +41,8 @@ class RunMetadata(msgspec.Struct):
     error: str | None = None
     unresolved_targets: list[str] = []
     notes: list[str] = []
+    capture_stats: dict[str, int] = {}
+    startup_s: float | None = None  # launch request -> script start
 
 
 def filtered_environment(environ: dict[str, str] | None = None) -> dict[str, str]:
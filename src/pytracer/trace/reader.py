@@ -1,41 +1,200 @@
 """Read captured events and reassemble them into calls.
 
-A truncated final line (crashed run) is tolerated and reported; corruption
-anywhere else raises.
+A truncated final line or record (crashed run) is tolerated and reported;
+corruption anywhere else raises. Both capture formats (JSONL and binary)
+are read transparently.
+
+``EventStream`` iterates a capture file without loading it: the file is
+memory-mapped and JSONL is decoded in batches of about READ_CHUNK_BYTES
+(msgspec ``decode_lines``), so a reader that consumes events as they come
+(``assemble_calls``, parquet conversion, the Perfetto export) holds what it
+builds, not the trace. ``iter_events`` is the list-returning convenience.
 """
 
 from __future__ import annotations
 
+import mmap
+import os
+from collections.abc import Generator, Iterable, Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
 
 import msgspec
 
 from pytracer._errors import PytracerError
-from pytracer.trace.event import NumericSummary, SourceRef, TraceEvent
-from pytracer.trace.writer import EVENTS_FILENAME
+from pytracer.trace.binary import BINARY_EVENTS_FILENAME, BINARY_SUFFIX, iter_binary_events
+from pytracer.trace.event import (
+    Callsite,
+    NumericSummary,
+    SourceRef,
+    TraceEvent,
+    check_schema_version,
+    resolve_callsite,
+)
+from pytracer.trace.writer import CALLSITES_FILENAME, EVENTS_FILENAME
+
+CALL_SAMPLING_FILENAME = "call_sampling.json"
+PAUSES_FILENAME = "pauses.json"
+REGIONS_FILENAME = "regions.json"
+READ_CHUNK_BYTES = 1 << 20  # JSONL bytes decoded per batch
 
 _decoder = msgspec.json.Decoder(TraceEvent)
+_callsite_decoder = msgspec.json.Decoder(Callsite)
+
+
+def find_events_file(run_dir: str | Path) -> Path | None:
+    """The run's capture file, whichever format it was written in."""
+    for name in (EVENTS_FILENAME, BINARY_EVENTS_FILENAME):
+        path = Path(run_dir) / name
+        if path.is_file():
+            return path
+    return None
+
+
+class EventStream:
+    """Iterate the events of one capture file, either format.
+
+    ``truncated`` (the final line or record was partial) is known once the
+    iteration has finished.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.truncated = False
+
+    def __iter__(self) -> Iterator[TraceEvent]:
+        binary = self.path.suffix == BINARY_SUFFIX
+        lines = iter_binary_events(self.path) if binary else _decode_lines(self.path, _decoder)
+        try:
+            first = next(lines)
+        except StopIteration as stop:
+            self.truncated = stop.value
+            return
+        check_schema_version(first.schema_version, self.path)
+        if binary:
+            yield first
+            self.truncated = yield from lines
+            return
+        callsites = load_callsites(self.path.parent)
+        event = first
+        while True:
+            if callsites:
+                resolve_callsite(event, callsites)
+            yield event
+            try:
+                event = next(lines)
+            except StopIteration as stop:
+                self.truncated = stop.value
+                return
+
+
+def load_callsites(run_dir: str | Path) -> dict[int, Callsite]:
+    """The JSONL capture's callsite table (callsites.jsonl); empty without one."""
+    path = Path(run_dir) / CALLSITES_FILENAME
+    if not path.is_file():
+        return {}
+    return {site.callsite_id: site for site in _decode_lines(path, _callsite_decoder)}
 
 
 def iter_events(path: str | Path) -> tuple[list[TraceEvent], bool]:
     """Return (events, truncated). truncated=True when the final line was partial."""
-    raw = Path(path).read_bytes()
-    lines = raw.split(b"\n")
-    events: list[TraceEvent] = []
-    truncated = False
-    last_index = len(lines) - 1
-    for i, line in enumerate(lines):
-        if not line.strip():
-            continue
-        try:
-            events.append(_decoder.decode(line))
-        except msgspec.DecodeError as e:
-            if i >= last_index - 1:
-                truncated = True
-                break
-            raise PytracerError(f"{path}: corrupt event at line {i + 1}: {e}") from e
-    return events, truncated
+    stream = EventStream(path)
+    events = list(stream)
+    return events, stream.truncated
+
+
+def load_call_sampling(run_dir: str | Path) -> dict[tuple, int] | None:
+    """Per-callsite counts of calls skipped by call sampling, keyed like
+    ``CallRecord.key`` without the occurrence; None when sampling was off."""
+    path = Path(run_dir) / CALL_SAMPLING_FILENAME
+    if not path.is_file():
+        return None
+    try:
+        data = msgspec.json.decode(path.read_bytes())
+        return {
+            (s["module"], s["qualname"], s["ufunc_method"], s["file"], s["lineno"]): s["calls"]
+            for s in data["skipped"]
+        }
+    except (msgspec.DecodeError, KeyError, TypeError) as e:
+        raise PytracerError(f"{path}: corrupt call sampling record: {e}") from e
+
+
+def load_pause_windows(run_dir: str | Path) -> list[dict]:
+    """The run's pytracer.pause()/resume() windows; empty when it never paused."""
+    path = Path(run_dir) / PAUSES_FILENAME
+    if not path.is_file():
+        return []
+    try:
+        return list(msgspec.json.decode(path.read_bytes())["windows"])
+    except (msgspec.DecodeError, KeyError, TypeError) as e:
+        raise PytracerError(f"{path}: corrupt pause record: {e}") from e
+
+
+def load_region_windows(run_dir: str | Path) -> list[dict]:
+    """The run's pytracer.region windows; empty when it used no regions."""
+    path = Path(run_dir) / REGIONS_FILENAME
+    if not path.is_file():
+        return []
+    try:
+        return list(msgspec.json.decode(path.read_bytes())["windows"])
+    except (msgspec.DecodeError, KeyError, TypeError) as e:
+        raise PytracerError(f"{path}: corrupt region record: {e}") from e
+
+
+def is_final_line(mm: mmap.mmap, end: int) -> bool:
+    """True when only whitespace follows byte *end* of a JSONL file.
+
+    A line that fails to decode is a partial write (the run was cut off) when
+    it is the file's last one; anywhere else it is corruption.
+    """
+    size = len(mm)
+    while end < size:
+        if mm[end:end + READ_CHUNK_BYTES].strip():
+            return False
+        end += READ_CHUNK_BYTES
+    return True
+
+
+def _decode_lines[T](path: Path, decoder: msgspec.json.Decoder[T]) -> Generator[T, None, bool]:
+    """Yield the records of a JSONL file; returns truncated."""
+    with open(path, "rb") as fo:
+        size = os.fstat(fo.fileno()).st_size
+        if size == 0:
+            return False
+        with mmap.mmap(fo.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            line_no = 1
+            while pos < size:
+                # batch = whole lines up to ~READ_CHUNK_BYTES (at least one line)
+                stop = mm.rfind(b"\n", pos, min(pos + READ_CHUNK_BYTES, size))
+                if stop < 0:
+                    stop = mm.find(b"\n", pos)
+                stop = size if stop < 0 else stop + 1
+                batch = mm[pos:stop]
+                try:
+                    records = decoder.decode_lines(batch)
+                except msgspec.DecodeError:
+                    records = None
+                if records is not None:
+                    yield from records
+                else:  # locate the bad line; only the file's last line may be partial
+                    start = pos
+                    for i, line in enumerate(batch.split(b"\n")):
+                        end, start = start + len(line), start + len(line) + 1
+                        if not line.strip():
+                            continue
+                        try:
+                            record = decoder.decode(line)
+                        except msgspec.DecodeError as e:
+                            if is_final_line(mm, end):
+                                return True
+                            raise PytracerError(
+                                f"{path}: corrupt event at line {line_no + i}: {e}"
+                            ) from e
+                        yield record
+                line_no += batch.count(b"\n")
+                pos = stop
+    return False
 
 
 # Callsite identity: everything that must match for calls in different runs
@@ -53,12 +212,15 @@ class CallRecord:
     source: SourceRef | None
     occurrence: int
     parent_call_id: int | None = None
+    callsite_id: int | None = None  # per-run id; only meaningful within one run
     inputs: dict[str, NumericSummary | None] = field(default_factory=dict)
     outputs: dict[str, NumericSummary | None] = field(default_factory=dict)
     input_refs: dict[str, str] = field(default_factory=dict)
     output_refs: dict[str, str] = field(default_factory=dict)
     exception: str | None = None
     first_event_id: int = 0
+    region: str | None = None
+    first_ts_ns: int | None = None
 
     @property
     def key(self) -> CallKey:
@@ -71,6 +233,25 @@ class CallRecord:
             self.occurrence,
         )
 
+    @property
+    def site(self) -> tuple[str, str, str | None, str | None, int | None]:
+        """The callsite part of the key (everything but the occurrence)."""
+        return (
+            self.module,
+            self.qualname,
+            self.ufunc_method,
+            self.source.file if self.source else None,
+            self.source.lineno if self.source else None,
+        )
+
+    @property
+    def sampled(self) -> bool:
+        """True when any argument summary was estimated from a sample."""
+        return any(
+            s is not None and s.sample_ratio is not None
+            for s in (*self.inputs.values(), *self.outputs.values())
+        )
+
     @property
     def function(self) -> str:
         name = f"{self.module}.{self.qualname}"
@@ -79,42 +260,120 @@ class CallRecord:
         return name
 
 
-def assemble_calls(events: list[TraceEvent]) -> list[CallRecord]:
-    calls: dict[int, CallRecord] = {}
+def program_order(calls: Iterable[CallRecord]) -> list[CallRecord]:
+    """*calls* sorted in the order they started.
+
+    Event ids are allocated in per-thread blocks, so they are chronological
+    within a thread only; when every call has a timestamp, the first
+    event's ``ts_ns`` orders calls across threads and the id breaks ties.
+    Otherwise (captures predating ts_ns) calls keep event id order.
+    """
+    calls = list(calls)
+    if all(call.first_ts_ns is not None for call in calls):
+        return sorted(calls, key=lambda r: (r.first_ts_ns, r.first_event_id))
+    return sorted(calls, key=lambda r: r.first_event_id)
+
+
+class CallAssembler:
+    """``assemble_calls`` fed in batches, e.g. as a live stream arrives: only
+    the calls built so far are held, not the events. Calls come out in
+    ``program_order``."""
+
+    def __init__(self) -> None:
+        self._calls: dict[int, CallRecord] = {}
+
+    @property
+    def n_calls(self) -> int:
+        return len(self._calls)
+
+    def feed(self, events: Iterable[TraceEvent]) -> None:
+        calls = self._calls
+        for ev in events:
+            rec = calls.get(ev.call_id)
+            if rec is None:
+                rec = CallRecord(
+                    call_id=ev.call_id,
+                    module=ev.module,
+                    qualname=ev.qualname,
+                    tier=ev.tier,
+                    ufunc_method=ev.ufunc_method,
+                    source=ev.source,
+                    occurrence=ev.occurrence,
+                    parent_call_id=ev.parent_call_id,
+                    callsite_id=ev.callsite_id,
+                    first_event_id=ev.event_id,
+                    region=ev.region,
+                    first_ts_ns=ev.ts_ns,
+                )
+                calls[ev.call_id] = rec
+            if ev.args is not None:  # call record: every argument of one side
+                if ev.phase == "exception":
+                    rec.exception = ev.note or "exception"
+                    continue
+                values, refs = (
+                    (rec.inputs, rec.input_refs) if ev.phase == "input"
+                    else (rec.outputs, rec.output_refs)
+                )
+                for arg in ev.args:
+                    values[arg.name] = arg.summary
+                    if arg.payload_ref:
+                        refs[arg.name] = arg.payload_ref
+            elif ev.phase == "input":
+                name = ev.arg_name or f"Arg{len(rec.inputs)}"
+                rec.inputs[name] = ev.summary
+                if ev.payload_ref:
+                    rec.input_refs[name] = ev.payload_ref
+            elif ev.phase == "output":
+                name = ev.arg_name or "Ret"
+                rec.outputs[name] = ev.summary
+                if ev.payload_ref:
+                    rec.output_refs[name] = ev.payload_ref
+            elif ev.phase == "exception":
+                rec.exception = ev.note or "exception"
+
+    def calls(self) -> list[CallRecord]:
+        return program_order(self._calls.values())
+
+
+def assemble_calls(events: Iterable[TraceEvent]) -> list[CallRecord]:
+    assembler = CallAssembler()
+    assembler.feed(events)
+    return assembler.calls()
+
+
+def expand_arguments(events: Iterable[TraceEvent]) -> list[TraceEvent]:
+    """One event per argument: split call records into per-argument events.
+
+    The split events share their record's event_id and ts_ns; a record with
+    no arguments stays a single event so its timestamp is kept.
+    """
+    return list(iter_argument_events(events))
+
+
+def iter_argument_events(events: Iterable[TraceEvent]) -> Iterator[TraceEvent]:
+    """``expand_arguments`` as a generator, for streamed events."""
     for ev in events:
-        rec = calls.get(ev.call_id)
-        if rec is None:
-            rec = CallRecord(
-                call_id=ev.call_id,
-                module=ev.module,
-                qualname=ev.qualname,
-                tier=ev.tier,
-                ufunc_method=ev.ufunc_method,
-                source=ev.source,
-                occurrence=ev.occurrence,
-                parent_call_id=ev.parent_call_id,
-                first_event_id=ev.event_id,
+        if not ev.args:
+            yield ev if ev.args is None else msgspec.structs.replace(ev, args=None)
+            continue
+        for arg in ev.args:
+            yield msgspec.structs.replace(
+                ev,
+                args=None,
+                arg_name=arg.name,
+                payload_kind=arg.payload_kind,
+                summary=arg.summary,
+                payload_ref=arg.payload_ref,
             )
-            calls[ev.call_id] = rec
-        if ev.phase == "input":
-            name = ev.arg_name or f"Arg{len(rec.inputs)}"
-            rec.inputs[name] = ev.summary
-            if ev.payload_ref:
-                rec.input_refs[name] = ev.payload_ref
-        elif ev.phase == "output":
-            name = ev.arg_name or "Ret"
-            rec.outputs[name] = ev.summary
-            if ev.payload_ref:
-                rec.output_refs[name] = ev.payload_ref
-        elif ev.phase == "exception":
-            rec.exception = ev.note or "exception"
-    return sorted(calls.values(), key=lambda r: r.first_event_id)
 
 
 def load_run_calls(run_dir: str | Path) -> tuple[list[CallRecord], bool]:
     """Load calls for one run directory. Returns (calls, truncated)."""
-    events_path = Path(run_dir) / EVENTS_FILENAME
-    if not events_path.is_file():
-        raise PytracerError(f"{run_dir}: no {EVENTS_FILENAME} found")
-    events, truncated = iter_events(events_path)
-    return assemble_calls(events), truncated
+    events_path = find_events_file(run_dir)
+    if events_path is None:
+        raise PytracerError(
+            f"{run_dir}: no {EVENTS_FILENAME} or {BINARY_EVENTS_FILENAME} found"
+        )
+    stream = EventStream(events_path)
+    calls = assemble_calls(stream)
+    return calls, stream.truncated
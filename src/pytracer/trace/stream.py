@@ -0,0 +1,180 @@
+"""Live event transport from a run subprocess to the orchestrator.
+
+With ``trace.transport = "pipe"`` the run still writes its capture file
+(the crash-safe record) and additionally streams every event and callsite
+to the parent over an inherited pipe, one frame per line:
+
+    E<json TraceEvent>   C<json Callsite>   Z<json {"events": n}>
+
+The parent's ``StreamReceiver`` decodes frames as they arrive and folds
+them into the run's calls batch by batch (``CallAssembler``), so it holds
+the calls, never the run's events. It keeps live counts for progress
+display and hands the calls to analysis when the stream is complete (the
+Z frame arrived and its count matches), so analysis does not re-read and
+re-decode the capture file. A run that dies mid-stream never sends Z: its
+calls are discarded and analysis reads the file as usual.
+
+A pipe rather than a shared-memory ring: the kernel already provides the
+blocking backpressure and end-of-stream signal a ring would need its own
+synchronisation for, and the parent reads concurrently so the child only
+blocks if the parent falls behind by a full pipe buffer.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import IO
+
+import msgspec
+
+from pytracer.trace.event import Callsite, TraceEvent, resolve_callsite
+from pytracer.trace.reader import CallAssembler, CallRecord
+
+FRAME_EVENT = b"E"
+FRAME_CALLSITE = b"C"
+FRAME_END = b"Z"
+STREAM_FLUSH_EVERY = 256  # events per pipe write
+PROGRESS_INTERVAL = 0.5  # seconds between on_progress callbacks
+
+
+class StreamingTraceWriter:
+    """Tee a TraceWriter's events into the stream pipe (child side).
+
+    A broken pipe (parent gone) only disables streaming: the capture file
+    is the record.
+    """
+
+    def __init__(self, inner, fd: int):
+        self.inner = inner
+        self.path = inner.path
+        self.run_dir = inner.run_dir
+        self._encoder = msgspec.json.Encoder()
+        self._lock = threading.Lock()
+        self._buffer: list[bytes] = []
+        self._streamed = 0
+        self._fo: IO[bytes] | None
+        try:
+            self._fo = os.fdopen(fd, "wb")
+        except OSError:
+            self._fo = None
+
+    @property
+    def n_events(self) -> int:
+        return self.inner.n_events
+
+    def write_event(self, event: TraceEvent) -> None:
+        self.inner.write_event(event)
+        self._send([FRAME_EVENT + self._encoder.encode(event) + b"\n"], events=1)
+
+    def write_events(self, events: list[TraceEvent]) -> None:
+        self.inner.write_events(events)
+        encode = self._encoder.encode
+        self._send([FRAME_EVENT + encode(ev) + b"\n" for ev in events], events=len(events))
+
+    def write_callsite(self, site: Callsite) -> None:
+        self.inner.write_callsite(site)
+        # flushed at once: it must precede the events that reference it
+        self._send([FRAME_CALLSITE + self._encoder.encode(site) + b"\n"], flush=True)
+
+    def _send(self, frames: list[bytes], events: int = 0, flush: bool = False) -> None:
+        if self._fo is None:
+            return
+        with self._lock:
+            self._buffer.extend(frames)
+            self._streamed += events
+            if flush or len(self._buffer) >= STREAM_FLUSH_EVERY:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._fo is None or not self._buffer:
+            return
+        data = b"".join(self._buffer)
+        self._buffer.clear()
+        try:
+            self._fo.write(data)
+            self._fo.flush()
+        except (OSError, ValueError):
+            self._fo = None
+
+    def stats(self) -> dict[str, int]:
+        return {**self.inner.stats(), "events_streamed": self._streamed}
+
+    def close(self) -> None:
+        self.inner.close()
+        with self._lock:
+            if self._fo is None:
+                return
+            end = msgspec.json.encode({"events": self._streamed})
+            self._buffer.append(FRAME_END + end + b"\n")
+            self._flush_locked()
+            try:
+                if self._fo is not None:
+                    self._fo.close()
+            except OSError:
+                pass
+            self._fo = None
+
+
+class StreamReceiver(threading.Thread):
+    """Read one run's stream in the parent (a daemon thread per run)."""
+
+    def __init__(
+        self,
+        fd: int,
+        run_id: str,
+        on_progress: Callable[[str, dict], None] | None = None,
+    ):
+        super().__init__(name=f"pytracer-stream-{run_id}", daemon=True)
+        self.fd = fd
+        self.run_id = run_id
+        self.on_progress = on_progress
+        self.n_events = 0
+        self.n_calls = 0
+        self.complete = False
+        self.error: str | None = None
+        self._callsites: dict[int, Callsite] = {}
+        self._expected: int | None = None
+        self._assembler = CallAssembler()
+
+    def progress(self) -> dict:
+        return {"events": self.n_events, "calls": self.n_calls}
+
+    def calls(self) -> list[CallRecord]:
+        """The run's calls, once the thread has finished."""
+        return self._assembler.calls()
+
+    def run(self) -> None:
+        event_decoder = msgspec.json.Decoder(TraceEvent)
+        callsite_decoder = msgspec.json.Decoder(Callsite)
+        last = time.monotonic()
+        batch: list[TraceEvent] = []
+        try:
+            with os.fdopen(self.fd, "rb") as fo:
+                for line in fo:
+                    kind, body = line[:1], line[1:]
+                    if kind == FRAME_EVENT:
+                        event = event_decoder.decode(body)
+                        resolve_callsite(event, self._callsites)
+                        batch.append(event)
+                        self.n_events += 1
+                        if event.phase == "input":
+                            self.n_calls += 1
+                        if len(batch) >= STREAM_FLUSH_EVERY:
+                            self._assembler.feed(batch)
+                            batch.clear()
+                    elif kind == FRAME_CALLSITE:
+                        site = callsite_decoder.decode(body)
+                        self._callsites[site.callsite_id] = site
+                    elif kind == FRAME_END:
+                        self._expected = msgspec.json.decode(body)["events"]
+                    if self.on_progress is not None and time.monotonic() - last > PROGRESS_INTERVAL:
+                        last = time.monotonic()
+                        self.on_progress(self.run_id, self.progress())
+        except (OSError, msgspec.DecodeError, KeyError, TypeError) as e:
+            self.error = f"{type(e).__name__}: {e}"
+            return
+        self._assembler.feed(batch)
+        self.complete = self._expected is not None and self._expected == self.n_events
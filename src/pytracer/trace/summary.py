@@ -2,38 +2,90 @@
 
 Summaries never raise and never copy more than ``max_fingerprint_bytes`` of
 data. Non-numeric values summarize to None.
+
+With ``sample_above`` set (``trace.mode = "sampled"``), arrays larger than
+that are summarized from a deterministic sample of about ``sample_size``
+elements: the array is cut into that many equal strata and one element is
+taken from each, at an offset drawn once from a fixed seed. Every run thus
+samples the same elements, and unlike a plain stride the sample cannot alias
+with periodic data. Statistics are then estimates: counts are scaled up,
+min/max are the sample's extrema (inner bounds of the true range), and the
+summary records ``sample_ratio`` and ``mean_stderr``, the standard error of
+the mean.
+
+``_summarize_array`` is the per-call hot spot of tracing. It avoids whole-
+array boolean temporaries: zeros are counted in place, min/max double as the
+"all finite" test, and the NaN/Inf/subnormal scan runs over fixed-size
+blocks with reused scratch buffers. Floating-point statistics keep NumPy's
+exact reduction order (std reuses the mean's pairwise sum the way np.std
+computes it internally), so results are bit-identical to np.mean / np.std /
+np.linalg.norm on the same data.
 """
 
 from __future__ import annotations
 
+import collections
+import functools
 import hashlib
+import math
+import threading
 
 import numpy as np
 
 from pytracer.trace.event import NumericSummary
 
 MAX_FINGERPRINT_BYTES = 1_000_000
+# values of any other type summarize to None
+SUMMARIZABLE_TYPES = (bool, int, float, complex, np.generic, np.ndarray)
+DEFAULT_SAMPLE_SIZE = 65_536
+SAMPLE_SEED = 0x5EED
+
+SUMMARY_CACHE_VALIDATORS = ("exact", "sampled")
+DEFAULT_SUMMARY_CACHE_SIZE = 256
+CACHE_MAX_ENTRY_BYTES = 1 << 20  # "exact": larger arrays are not memoized
+CACHE_MAX_BYTES = 32 << 20  # "exact": total array bytes held by the keys
+VALIDATOR_SAMPLE = 64  # "sampled": elements compared on a hit
+SCAN_BLOCK = 1 << 15  # elements per block of the special-value scan (fits L2)
+
+# str(dtype) goes through several Python-level numpy helpers (~10 µs)
+_DTYPE_NAMES: dict[np.dtype, str] = {}
+
+
+def _dtype_name(dtype: np.dtype) -> str:
+    name = _DTYPE_NAMES.get(dtype)
+    if name is None:
+        name = _DTYPE_NAMES[dtype] = str(dtype)
+    return name
 
 
-def summarize_value(value: object) -> NumericSummary | None:
-    """Summarize a scalar or NumPy array; return None for non-numeric values."""
+def summarize_value(
+    value: object,
+    sample_above: int | None = None,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+) -> NumericSummary | None:
+    """Summarize a scalar or NumPy array; return None for non-numeric values.
+
+    Arrays with more than *sample_above* elements get a sampled summary.
+    """
     try:
-        if isinstance(value, bool | int | float | complex | np.generic):
-            array = np.asarray(value)
-        elif isinstance(value, np.ndarray):
+        if isinstance(value, np.ndarray):
             array = value
+        elif isinstance(value, SUMMARIZABLE_TYPES):
+            array = np.asarray(value)
         else:
             return None
         if array.dtype == object or array.dtype.kind in "USVmM":
             return None
+        if sample_above is not None and array.size > max(sample_above, sample_size):
+            return _summarize_sampled(array, sample_size)
         return _summarize_array(array)
     except Exception:
         # A summary failure must never break the traced program.
         return None
 
 
-def _summarize_array(array: np.ndarray) -> NumericSummary:
-    dtype = str(array.dtype)
+def _summarize_array(array: np.ndarray, fingerprint: bool = True) -> NumericSummary:
+    dtype = _dtype_name(array.dtype)
     shape = tuple(int(d) for d in array.shape)
     size = int(array.size)
     summary = NumericSummary(dtype=dtype, shape=shape, size=size)
@@ -47,40 +99,127 @@ def _summarize_array(array: np.ndarray) -> NumericSummary:
     else:
         values = array
 
-    summary.zero_count = int(np.count_nonzero(values == 0))
+    summary.zero_count = size - int(np.count_nonzero(values))
+    v64 = values.astype(np.float64, copy=False)
+    lo = v64.min()
+    hi = v64.max()
+    # NaN propagates through min/max and an Inf would be an extremum:
+    # finite extrema mean every value is finite.
+    all_finite = math.isfinite(lo) and math.isfinite(hi)
 
     if values.dtype.kind == "f":
-        finite = np.isfinite(values)
-        n_finite = int(np.count_nonzero(finite))
-        summary.nan_count = int(np.count_nonzero(np.isnan(values)))
-        summary.inf_count = size - n_finite - summary.nan_count
-        tiny = np.finfo(values.dtype).tiny
-        with np.errstate(invalid="ignore"):
-            absv = np.abs(values)
-            summary.subnormal_count = int(np.count_nonzero((absv > 0) & (absv < tiny)))
+        nan, inf, below_tiny = _scan_float(values, count_nonfinite=not all_finite)
+        summary.nan_count = nan
+        summary.inf_count = inf
+        summary.subnormal_count = below_tiny - summary.zero_count
+        n_finite = size - nan - inf
     else:
         # integer/bool data cannot hold NaN/Inf/subnormals: skip those passes
-        finite = None
         n_finite = size
 
     if n_finite:
-        if finite is not None and n_finite != size:
-            fv = values[finite]
+        if all_finite:
+            fv64 = v64
         else:
-            fv = values
-        fv64 = fv.astype(np.float64, copy=False)
-        summary.mean = float(np.mean(fv64))
-        summary.std = float(np.std(fv64))
-        summary.min = float(np.min(fv64))
-        summary.max = float(np.max(fv64))
+            fv64 = values[np.isfinite(values)].astype(np.float64, copy=False)
+            lo = fv64.min()
+            hi = fv64.max()
+        summary.min = float(lo)
+        summary.max = float(hi)
         # |x|_inf from the extrema already computed: saves an abs pass
         summary.linf_norm = max(abs(summary.min), abs(summary.max))
-        summary.l2_norm = float(np.linalg.norm(fv64.ravel()))
+        summary.mean, summary.std = _mean_std(fv64)
+        flat = fv64.ravel()
+        summary.l2_norm = math.sqrt(flat.dot(flat))  # what np.linalg.norm does
 
+    if fingerprint:
+        summary.fingerprint = array_fingerprint(array)
+    return summary
+
+
+@functools.lru_cache(maxsize=64)
+def _sample_index(size: int, n: int) -> np.ndarray:
+    """Flat indices of the stratified sample: one per stratum of size // n."""
+    step = size // n
+    m = size // step
+    offsets = np.random.default_rng(SAMPLE_SEED).integers(0, step, m)
+    index = np.arange(0, m * step, step) + offsets
+    index.flags.writeable = False
+    return index
+
+
+def _sample(array: np.ndarray, n: int) -> np.ndarray:
+    """Gather the stratified sample (flat C-order positions), copying only it."""
+    index = _sample_index(array.size, n)
+    if array.flags.c_contiguous:
+        return array.reshape(-1)[index]
+    return array[np.unravel_index(index, array.shape)]
+
+
+def _summarize_sampled(array: np.ndarray, sample_size: int) -> NumericSummary:
+    sample = _sample(array, sample_size)
+    summary = _summarize_array(sample, fingerprint=False)
+    m = int(sample.size)
+    m_finite = m - summary.nan_count - summary.inf_count
+    size = int(array.size)
+    scale = size / m
+    summary.shape = tuple(int(d) for d in array.shape)
+    summary.size = size
+    summary.zero_count = round(summary.zero_count * scale)
+    summary.nan_count = round(summary.nan_count * scale)
+    summary.inf_count = round(summary.inf_count * scale)
+    summary.subnormal_count = round(summary.subnormal_count * scale)
+    summary.sample_ratio = m / size
+    if summary.l2_norm is not None:
+        summary.l2_norm *= math.sqrt(scale)
+    if summary.std is not None:
+        # finite-population corrected standard error of the sample mean
+        fpc = math.sqrt(1.0 - m / size)
+        summary.mean_stderr = summary.std / math.sqrt(m_finite) * fpc
     summary.fingerprint = array_fingerprint(array)
     return summary
 
 
+def _scan_float(values: np.ndarray, count_nonfinite: bool) -> tuple[int, int, int]:
+    """Return (nan, inf, |x| < tiny) counts in one blocked pass.
+
+    ``|x| < tiny`` counts zeros and subnormals together; NaN compares false.
+    """
+    tiny = np.finfo(values.dtype).tiny
+    flat = values.ravel(order="K")
+    n = flat.size
+    block = min(n, SCAN_BLOCK)
+    absbuf = np.empty(block, dtype=values.dtype)
+    mask = np.empty(block, dtype=bool)
+    nan = inf = below = 0
+    for start in range(0, n, block):
+        chunk = flat[start:start + block]
+        k = chunk.size
+        a = np.abs(chunk, out=absbuf[:k])
+        m = mask[:k]
+        below += int(np.count_nonzero(np.less(a, tiny, out=m)))
+        if count_nonfinite:
+            nan += int(np.count_nonzero(np.isnan(chunk, out=m)))
+            inf += int(np.count_nonzero(np.equal(a, np.inf, out=m)))
+    return nan, inf, below
+
+
+def _mean_std(fv64: np.ndarray) -> tuple[float, float]:
+    """np.mean and np.std (ddof=0) of a float64 array, sharing one sum.
+
+    Mirrors numpy's _mean/_var step for step (same reductions on the same
+    array), so both results are bit-identical to the separate calls.
+    """
+    n = fv64.size
+    mean = np.add.reduce(fv64, axis=None, keepdims=True) / n
+    # explicit out: a 0-d difference would otherwise come back as a scalar,
+    # which np.square cannot write into
+    dev = np.subtract(fv64, mean, out=np.empty_like(fv64))
+    np.square(dev, out=dev)
+    var = np.add.reduce(dev, axis=None) / n
+    return float(np.reshape(mean, -1)[0]), float(np.sqrt(var))
+
+
 def array_fingerprint(array: np.ndarray, max_bytes: int = MAX_FINGERPRINT_BYTES) -> str | None:
     """Stable blake2b fingerprint over at most *max_bytes* of the array.
 
@@ -90,11 +229,11 @@ def array_fingerprint(array: np.ndarray, max_bytes: int = MAX_FINGERPRINT_BYTES)
     whole array first.
     """
     try:
-        header = f"{array.dtype}|{array.shape}|".encode()
+        header = f"{_dtype_name(array.dtype)}|{array.shape}|".encode()
         if array.nbytes <= max_bytes:
             data = np.ascontiguousarray(array).tobytes()
         elif array.flags.c_contiguous or array.flags.f_contiguous:
-            flat = array.reshape(-1)  # view: array is contiguous
+            flat = array.ravel(order="K")  # view: array is C or F contiguous
             step = max(1, int(np.ceil(array.nbytes / max_bytes)))
             data = np.ascontiguousarray(flat[::step]).tobytes()
         else:
@@ -102,3 +241,114 @@ def array_fingerprint(array: np.ndarray, max_bytes: int = MAX_FINGERPRINT_BYTES)
         return hashlib.blake2b(header + data, digest_size=16).hexdigest()
     except Exception:
         return None
+
+
+class SummaryCache:
+    """Bounded LRU memo of array summaries for values passed again unchanged.
+
+    Only ``np.ndarray`` values are memoized; scalars are cheap to summarize.
+    A summary depends on the array's dtype, shape, strides (NumPy's
+    reduction order follows the memory layout) and content, so those plus
+    the sampling parameters form the key. The *validate* policy decides how
+    content is checked:
+
+    - "exact" (default): the content bytes are part of the key, so a hit is
+      always correct, and equal data in different buffers hits too. Arrays
+      above CACHE_MAX_ENTRY_BYTES are not memoized: copying and comparing
+      them would approach the cost of the summary itself.
+    - "sampled": the key is the buffer identity (data pointer) and a hit is
+      trusted when VALIDATOR_SAMPLE evenly spaced elements still match.
+      Cheap at any size, but blind to writes between sampled elements, so
+      the first in-place write seen by a traced call (``out=``,
+      ``ufunc.at``) disables the cache for the rest of the run.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_SUMMARY_CACHE_SIZE,
+        validate: str = "exact",
+    ):
+        if validate not in SUMMARY_CACHE_VALIDATORS:
+            raise ValueError(
+                f"validate must be one of {SUMMARY_CACHE_VALIDATORS}, got {validate!r}"
+            )
+        self.max_entries = max_entries
+        self.validate = validate
+        self.disabled = max_entries < 1
+        self._entries: collections.OrderedDict[tuple, tuple] = collections.OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def summarize(
+        self,
+        value: object,
+        sample_above: int | None = None,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+    ) -> NumericSummary | None:
+        if self.disabled or not isinstance(value, np.ndarray):
+            return summarize_value(value, sample_above, sample_size)
+        try:
+            key, check, nbytes = self._key(value, sample_above, sample_size)
+        except Exception:
+            key = None
+        if key is None:
+            return summarize_value(value, sample_above, sample_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == check:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        summary = summarize_value(value, sample_above, sample_size)
+        if summary is not None:
+            with self._lock:
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self._nbytes -= old[2]
+                self._entries[key] = (check, summary, nbytes)
+                self._nbytes += nbytes
+                while len(self._entries) > self.max_entries or self._nbytes > CACHE_MAX_BYTES:
+                    _, (_, _, freed) = self._entries.popitem(last=False)
+                    self._nbytes -= freed
+        return summary
+
+    def _key(self, array: np.ndarray, sample_above, sample_size) -> tuple:
+        layout = (array.dtype, array.shape, array.strides, sample_above, sample_size)
+        if self.validate == "exact":
+            if array.nbytes > CACHE_MAX_ENTRY_BYTES:
+                return None, None, 0
+            data = array.tobytes()
+            return (*layout, data), None, len(data)
+        pointer = array.__array_interface__["data"][0]
+        index = _validator_index(array.size)
+        if array.flags.c_contiguous:
+            probe = array.reshape(-1)[index]
+        else:
+            probe = array[np.unravel_index(index, array.shape)]
+        return (*layout, pointer), probe.tobytes(), 0
+
+    def note_inplace_write(self) -> None:
+        """A traced call wrote into an existing array."""
+        if self.validate == "sampled" and not self.disabled:
+            with self._lock:
+                self.disabled = True
+                self._entries.clear()
+                self._nbytes = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "summary_cache_hits": self.hits,
+            "summary_cache_misses": self.misses,
+            "summary_cache_disabled": int(self.disabled),
+        }
+
+
+@functools.lru_cache(maxsize=64)
+def _validator_index(size: int) -> np.ndarray:
+    index = np.unique(np.linspace(0, size - 1, min(size, VALIDATOR_SAMPLE)).astype(np.intp))
+    index.flags.writeable = False
+    return index
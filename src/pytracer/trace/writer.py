@@ -1,46 +1,126 @@
 """Append-safe trace capture.
 
 Events are written as JSON lines (msgspec-encoded) so a crash of the traced
-program loses at most the final partial line. Parquet conversion happens at
-run finalization, never during capture.
+program loses at most the final partial line. ``capture_format = "binary"``
+selects the compact checksummed record format of ``trace.binary`` with the
+same guarantee. Parquet conversion happens at run finalization, never during
+capture.
+
+The callsite table (see trace.event.Callsite) goes to ``callsites.jsonl``
+next to the JSONL capture, flushed as soon as an entry is written: an event
+can therefore never reach disk before the callsite it references. The
+binary format carries the table inline as side records.
+
+``writer = "async"`` moves encoding and file writes to a background thread
+(``AsyncTraceWriter``); events still in its buffer when the process is
+killed are lost, so it trades crash-safety of the last batch for capture
+throughput.
+
+``stream_fd`` (``trace.transport = "pipe"``) tees events to the
+orchestrator as well; see trace.stream.
 """
 
 from __future__ import annotations
 
+import collections
 import threading
 from pathlib import Path
+from typing import IO, TYPE_CHECKING, Protocol
 
 import msgspec
 
-from pytracer.trace.event import TraceEvent
+from pytracer.trace.binary import BINARY_EVENTS_FILENAME, MAGIC, BinaryEncoder
+from pytracer.trace.event import Callsite, TraceEvent
+
+if TYPE_CHECKING:
+    from pytracer.trace.stream import StreamingTraceWriter
 
 EVENTS_FILENAME = "events.jsonl"
+CALLSITES_FILENAME = "callsites.jsonl"
 FLUSH_EVERY = 200
 
+CAPTURE_FORMATS = ("jsonl", "binary")
+WRITER_MODES = ("sync", "async")
+BACKPRESSURE_MODES = ("block", "drop", "spill")
+
+DEFAULT_QUEUE_SIZE = 65_536
+ASYNC_FLUSH_INTERVAL = 0.05  # seconds the writer thread sleeps when idle
+
+
+class EventWriter(Protocol):
+    """What the recorder writes through: any writer ``make_trace_writer``
+    returns (TraceWriter, BinaryTraceWriter, StreamingTraceWriter,
+    AsyncTraceWriter)."""
+
+    path: Path
+
+    @property
+    def n_events(self) -> int: ...
+
+    def write_event(self, event: TraceEvent) -> None: ...
+
+    def write_callsite(self, site: Callsite) -> None: ...
+
+    def stats(self) -> dict[str, int]: ...
+
+    def close(self) -> None: ...
+
 
 class TraceWriter:
+    filename = EVENTS_FILENAME
+
     def __init__(self, run_dir: str | Path):
         self.run_dir = Path(run_dir)
         self.run_dir.mkdir(parents=True, exist_ok=True)
-        self.path = self.run_dir / EVENTS_FILENAME
+        self.path = self.run_dir / self.filename
         self._encoder = msgspec.json.Encoder()
         self._lock = threading.Lock()
-        self._fo = open(self.path, "ab")
+        self._fo = self._open()
+        self._callsites_fo: IO[bytes] | None = None
         self._pending = 0
         self._closed = False
         self.n_events = 0
 
+    def _open(self):
+        return open(self.path, "ab")
+
     def write_event(self, event: TraceEvent) -> None:
         line = self._encoder.encode(event) + b"\n"
         with self._lock:
             if self._closed:
                 return
-            self._fo.write(line)
-            self.n_events += 1
-            self._pending += 1
-            if self._pending >= FLUSH_EVERY:
-                self._fo.flush()
-                self._pending = 0
+            self._write_locked(line)
+
+    def write_events(self, events: list[TraceEvent]) -> None:
+        """Write a batch under a single lock acquisition."""
+        lines = [self._encoder.encode(event) + b"\n" for event in events]
+        with self._lock:
+            if self._closed:
+                return
+            for line in lines:
+                self._write_locked(line)
+
+    def write_callsite(self, site: Callsite) -> None:
+        line = self._encoder.encode(site) + b"\n"
+        with self._lock:
+            if self._closed:
+                return
+            fo = self._callsites_fo
+            if fo is None:
+                fo = self._callsites_fo = open(self.run_dir / CALLSITES_FILENAME, "ab")
+            fo.write(line)
+            fo.flush()
+
+    def stats(self) -> dict[str, int]:
+        return {"events_written": self.n_events}
+
+    def _write_locked(self, data: bytes) -> None:
+        self._fo.write(data)
+        self.n_events += 1
+        self._pending += 1
+        if self._pending >= FLUSH_EVERY:
+            self._fo.flush()
+            self._pending = 0
 
     def close(self) -> None:
         with self._lock:
@@ -49,3 +129,204 @@ class TraceWriter:
             self._closed = True
             self._fo.flush()
             self._fo.close()
+            if self._callsites_fo is not None:
+                self._callsites_fo.close()
+
+
+class BinaryTraceWriter(TraceWriter):
+    """Interned, checksummed binary records (see trace.binary).
+
+    Encoding happens under the lock: string ids are assigned in file order,
+    so a STRING record must land before the first event that uses it.
+    """
+
+    filename = BINARY_EVENTS_FILENAME
+
+    def _open(self):
+        # Appending would need the existing string table: always start fresh.
+        fo = open(self.path, "wb")
+        fo.write(MAGIC)
+        self._binary = BinaryEncoder()
+        return fo
+
+    def write_event(self, event: TraceEvent) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._write_locked(self._binary.encode(event))
+
+    def write_events(self, events: list[TraceEvent]) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            for event in events:
+                self._write_locked(self._binary.encode(event))
+
+    def write_callsite(self, site: Callsite) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._fo.write(self._binary.encode_callsite(site))
+
+
+class AsyncTraceWriter:
+    """Hand events to a background thread that encodes and writes batches.
+
+    Traced threads only append to a bounded deque (atomic under the GIL, no
+    lock on the fast path). When the buffer is full, *backpressure* decides:
+
+    - "block": wait for the writer thread to make room (lossless),
+    - "drop":  discard the event and count it,
+    - "spill": write it synchronously on the calling thread (lossless;
+               events may land out of event_id order, which readers allow).
+
+    ``close()`` drains everything still buffered before closing the file.
+    Events emitted while it runs are written synchronously; any arriving
+    after the file is closed are counted as dropped.
+    """
+
+    def __init__(
+        self,
+        inner: TraceWriter | StreamingTraceWriter,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        backpressure: str = "block",
+    ):
+        if backpressure not in BACKPRESSURE_MODES:
+            raise ValueError(
+                f"backpressure must be one of {BACKPRESSURE_MODES}, got {backpressure!r}"
+            )
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be >= 1, got {queue_size}")
+        self.inner = inner
+        self.path = inner.path
+        self.queue_size = queue_size
+        self.backpressure = backpressure
+        self._queue: collections.deque[TraceEvent] = collections.deque()
+        self._wake = threading.Event()
+        self._space = threading.Condition()
+        self._closing = False
+        self._closed = False
+        self._late_lock = threading.Lock()
+        self._inner_closed = False
+        self.n_dropped = 0
+        self.n_spilled = 0
+        self.n_blocked = 0
+        self._thread = threading.Thread(
+            target=self._run, name="pytracer-writer", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def n_events(self) -> int:
+        return self.inner.n_events
+
+    def write_event(self, event: TraceEvent) -> None:
+        if self._closing:
+            self._write_late(event)
+            return
+        queue = self._queue
+        if len(queue) >= self.queue_size:
+            self._wake.set()
+            if self.backpressure == "drop":
+                self.n_dropped += 1
+                return
+            if self.backpressure == "spill":
+                self.n_spilled += 1
+                self.inner.write_event(event)
+                return
+            self.n_blocked += 1
+            with self._space:
+                while len(queue) >= self.queue_size and self._thread.is_alive():
+                    self._space.wait(ASYNC_FLUSH_INTERVAL)
+        queue.append(event)
+        if self._closing:  # close() may have drained before this append
+            self._write_late()
+        elif len(queue) >= self.queue_size // 2:
+            self._wake.set()
+
+    def _write_late(self, event: TraceEvent | None = None) -> None:
+        """Write events that arrive once close() has begun.
+
+        They go synchronously through the inner writer while its file is
+        still open; after that they can only be counted as dropped.
+        """
+        with self._late_lock:
+            if event is not None:
+                self._queue.append(event)
+            if self._inner_closed:
+                self.n_dropped += len(self._queue)
+                self._queue.clear()
+            else:
+                self._drain()
+
+    def write_callsite(self, site: Callsite) -> None:
+        # Synchronous: the entry must precede every queued event using it.
+        self.inner.write_callsite(site)
+
+    def _drain(self) -> None:
+        queue = self._queue
+        while queue:
+            batch = []
+            try:
+                for _ in range(min(len(queue), 4096)):
+                    batch.append(queue.popleft())
+            except IndexError:
+                pass
+            self.inner.write_events(batch)
+            with self._space:
+                self._space.notify_all()
+
+    def _run(self) -> None:
+        while not self._closing:
+            self._wake.wait(ASYNC_FLUSH_INTERVAL)
+            self._wake.clear()
+            self._drain()
+        self._drain()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            **self.inner.stats(),
+            "events_dropped": self.n_dropped,
+            "events_spilled": self.n_spilled,
+            "writes_blocked": self.n_blocked,
+        }
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._closing = True
+        self._wake.set()
+        self._thread.join()
+        with self._late_lock:
+            self._drain()  # anything appended while the thread was exiting
+            self.inner.close()
+            self._inner_closed = True
+
+
+def make_trace_writer(
+    run_dir: str | Path,
+    capture_format: str = "jsonl",
+    mode: str = "sync",
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    backpressure: str = "block",
+    stream_fd: int | None = None,
+) -> EventWriter:
+    writer: TraceWriter | StreamingTraceWriter
+    if capture_format == "binary":
+        writer = BinaryTraceWriter(run_dir)
+    elif capture_format == "jsonl":
+        writer = TraceWriter(run_dir)
+    else:
+        raise ValueError(
+            f"capture format must be one of {CAPTURE_FORMATS}, got {capture_format!r}"
+        )
+    if stream_fd is not None:  # trace.transport = "pipe" (see trace.stream)
+        from pytracer.trace.stream import StreamingTraceWriter
+
+        writer = StreamingTraceWriter(writer, stream_fd)
+    if mode == "async":
+        return AsyncTraceWriter(writer, queue_size=queue_size, backpressure=backpressure)
+    if mode != "sync":
+        raise ValueError(f"writer mode must be one of {WRITER_MODES}, got {mode!r}")
+    return writer
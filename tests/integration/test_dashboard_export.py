@@ -100,6 +100,20 @@ def test_dashboard_data_layer(experiment):
     assert only_inputs and all(r["phase"] == "input" for r in only_inputs)
 
 
+def test_dashboard_indexed_matches_full_load(experiment, monkeypatch):
+    from pytracer.dashboard import data as data_module
+
+    lazy = data_module.ExperimentData(experiment)
+    assert lazy.indexes is not None  # finalization indexed every run
+    fn = lazy.functions[0]
+    lazy_rows = lazy.timeline_for([fn], ["input", "output"])
+    monkeypatch.setattr(data_module.ExperimentData, "_open_indexes", lambda self: None)
+    full = data_module.ExperimentData(experiment)
+    assert lazy_rows == full.timeline_for([fn], ["input", "output"])
+    assert lazy.timeline_rows == full.timeline_rows
+    assert lazy.has_arrays == full.has_arrays
+
+
 @pytest.mark.skipif(importlib.util.find_spec("dash") is None, reason="dash not installed")
 def test_dashboard_figures(experiment):
     from pytracer.dashboard import figures
@@ -0,0 +1,122 @@
+"""Executor backends, with a localhost stand-in for ssh."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from pytracer import executors
+from pytracer._errors import ExperimentError
+from pytracer.analysis import analyze_experiment
+from pytracer.config.schema import PytracerConfig
+from pytracer.executors import BATCH_SCRIPT, LocalExecutor, RunLaunch
+from pytracer.experiment import ingest_experiment, run_experiment
+
+pytestmark = pytest.mark.integration
+
+SCRIPT = (
+    "import os, sys\nimport numpy as np\n"
+    "np.sum(np.arange(4.0) * float(os.environ['SEED']))\n"
+    "sys.exit(0 if os.environ['SEED'] == str(int(os.environ['PYTRACER_RUN_ID'][-3:])) else 9)\n"
+)
+
+
+def config_for(tmp_path, executor):
+    config = PytracerConfig()
+    config.storage.output_dir = str(tmp_path / "out")
+    config.run.executor = executor
+    config.perturb.env = {"SEED": "{run_index}"}
+    return config
+
+
+@pytest.fixture
+def fake_ssh(tmp_path):
+    """`fake-ssh HOST CMD`: log the host, run CMD locally with a minimal environment."""
+    log = tmp_path / "hosts.log"
+    path = tmp_path / "fake_ssh.py"
+    path.write_text(
+        "import subprocess, sys\n"
+        f"open({str(log)!r}, 'a').write(sys.argv[1] + '\\n')\n"
+        "sys.exit(subprocess.run(['sh', '-c', sys.argv[2]], env={'PATH': '/usr/bin:/bin'})"
+        ".returncode)\n"
+    )
+    return [sys.executable, str(path)], log
+
+
+def test_ssh_executor_runs_on_hosts(tmp_path, fake_ssh):
+    ssh_command, log = fake_ssh
+    script = tmp_path / "s.py"
+    script.write_text(SCRIPT)
+    config = config_for(tmp_path, "ssh")
+    config.run.hosts = ["node-a", "node-b"]
+    config.run.ssh_command = ssh_command
+    config.run.jobs = 2
+    config.trace.transport = "pipe"  # not available remotely: falls back to files
+    result = run_experiment(config=config, script=str(script), script_args=[],
+                            target_specs=["numpy.sum"], repeat=4)
+    assert [r.exit_code for r in result.runs] == [0, 0, 0, 0]
+    assert set(log.read_text().split()) == {"node-a", "node-b"}
+    assert result.streamed_calls == {}
+    assert any("pipe" in w for w in result.warnings)
+    alignment, _, _ = analyze_experiment(result.experiment_dir)
+    assert alignment.summary_dict()["runs"] == 4
+
+
+def test_ssh_executor_reports_failures(tmp_path, fake_ssh):
+    ssh_command, _ = fake_ssh
+    script = tmp_path / "fail.py"
+    script.write_text("raise SystemExit(5)\n")
+    config = config_for(tmp_path, "ssh")
+    config.run.hosts = ["node-a"]
+    config.run.ssh_command = ssh_command
+    result = run_experiment(config=config, script=str(script), script_args=[],
+                            target_specs=[], repeat=3)
+    assert [r.exit_code for r in result.runs] == [5]
+    assert any("stopping" in w for w in result.warnings)
+
+
+def test_batch_executor_writes_job_array_then_ingests(tmp_path):
+    script = tmp_path / "s.py"
+    script.write_text(SCRIPT)
+    config = config_for(tmp_path, "batch")
+    result = run_experiment(config=config, script=str(script), script_args=[],
+                            target_specs=["numpy.sum"], repeat=3)
+    assert result.runs == [] and result.submit_script is not None
+    submit = result.experiment_dir / BATCH_SCRIPT
+    assert result.submit_script == submit
+    assert "#SBATCH --array=0-2" in submit.read_text()
+
+    for index in (0, 2):  # run-001 is still "queued"
+        subprocess.run(["bash", str(submit), str(index)], check=True)
+    ingested = ingest_experiment(result.experiment_dir)
+    assert [r.run_id for r in ingested.runs] == ["run-000", "run-002"]
+    assert [r.exit_code for r in ingested.runs] == [0, 0]
+    assert any("run-001" in w for w in ingested.warnings)
+    meta = json.loads((result.experiment_dir / "experiment.json").read_text())
+    assert meta["executor"] == "batch" and len(meta["runs"]) == 2
+
+    subprocess.run(["bash", str(submit), "1"], check=True)
+    alignment, _, _ = analyze_experiment(ingest_experiment(result.experiment_dir).experiment_dir)
+    assert alignment.summary_dict()["runs"] == 3
+
+
+def test_local_executor_spawns_the_run_when_the_fork_server_is_lost(tmp_path, monkeypatch):
+    class LostServer:
+        alive = True
+
+        def run(self, spec_path, env, stream_fd=None):
+            raise ExperimentError("fork server exited while running run-000")
+
+    monkeypatch.setattr(
+        executors, "_bootstrap_command",
+        lambda python, spec_path: [python, "-c", "import sys; sys.exit(4)"],
+    )
+    executor = LocalExecutor("forkserver")
+    executor._server = LostServer()
+    launch = RunLaunch(index=0, run_id="run-000", run_dir=tmp_path,
+                       spec_path=tmp_path / "spec.json", cwd=tmp_path, env={}, run_env={})
+    assert executor.run(launch) == 4
+    assert executor.warnings == [
+        "run-000: fork server exited while running run-000; spawning the remaining runs"
+    ]
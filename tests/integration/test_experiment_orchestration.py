@@ -1,6 +1,10 @@
 """Experiment orchestration edge cases: failures, continue-on-error."""
 
+import itertools
+import json
+import os
 import sys
+from dataclasses import asdict
 
 import pytest
 
@@ -38,6 +42,8 @@ def test_failure_stops_by_default(tmp_path):
                             script_args=[], target_specs=[], repeat=3)
     assert [r.exit_code for r in result.runs] == [3]  # stopped after first
     assert any("stopping" in w for w in result.warnings)
+    meta = json.loads((result.experiment_dir / "experiment.json").read_text())
+    assert meta["repeat"] == 1 and meta["repeat_budget"] == 3
 
 
 def test_continue_on_error_runs_all(tmp_path):
@@ -131,3 +137,314 @@ def test_events_survive_hard_kill(tmp_path):
 
     calls, _truncated = load_run_calls(result.runs[0].run_dir)
     assert len(calls) >= 1  # flushed events are readable after SIGKILL
+
+
+def test_binary_capture_survives_hard_kill(tmp_path):
+    script = tmp_path / "killself.py"
+    script.write_text(
+        "import numpy as np, os, signal\n"
+        "for i in range(300):\n"
+        "    np.sum(np.arange(10.0))\n"
+        "os.kill(os.getpid(), signal.SIGKILL)\n"
+    )
+    config = config_for(tmp_path)
+    config.trace.capture_format = "binary"
+    result = run_experiment(config=config, script=str(script),
+                            script_args=[], target_specs=["numpy.sum"], repeat=1,
+                            continue_on_error=True)
+    run_dir = result.runs[0].run_dir
+    assert (run_dir / "events.ptb").is_file()
+    assert not (run_dir / "events.jsonl").exists()
+    from pytracer.trace.reader import load_run_calls
+
+    calls, _truncated = load_run_calls(run_dir)
+    assert len(calls) >= 1
+
+
+def test_async_writer_drained_and_stats_in_metadata(tmp_path):
+    import json
+
+    script = tmp_path / "loop.py"
+    script.write_text("import numpy as np\nfor i in range(100):\n    np.sum(np.arange(5.0))\n")
+    config = config_for(tmp_path)
+    config.trace.writer = "async"
+    result = run_experiment(config=config, script=str(script),
+                            script_args=[], target_specs=["numpy.sum"], repeat=1)
+    run_dir = result.runs[0].run_dir
+    meta = json.loads((run_dir / "metadata.json").read_text())
+    stats = meta["capture_stats"]
+    assert stats["events_dropped"] == 0
+    assert stats["events_written"] == 200  # input + output per call
+    # np.arange(5.0) is a fresh but equal array each time: memoized after the first
+    assert stats["summary_cache_hits"] >= 99
+    from pytracer.trace.reader import load_run_calls
+
+    calls, truncated = load_run_calls(run_dir)
+    assert len(calls) == 100 and not truncated
+
+
+def test_pipe_transport_streams_complete_runs(tmp_path):
+    script = tmp_path / "loop.py"
+    script.write_text("import numpy as np\nfor i in range(50):\n    np.sum(np.arange(5.0))\n")
+    config = config_for(tmp_path)
+    config.trace.transport = "pipe"
+    config.trace.writer = "async"
+    seen = []
+    result = run_experiment(config=config, script=str(script), script_args=[],
+                            target_specs=["numpy.sum"], repeat=2,
+                            on_progress=lambda run_id, p: seen.append(run_id))
+    from pytracer.trace.reader import load_run_calls
+
+    assert set(result.streamed_calls) == {"run-000", "run-001"}
+    for run in result.runs:
+        from_file, _ = load_run_calls(run.run_dir)
+        assert run.calls == from_file and len(run.calls) == 50
+
+
+def test_pipe_transport_falls_back_when_run_dies(tmp_path):
+    script = tmp_path / "die.py"
+    script.write_text(
+        "import os, signal\nimport numpy as np\n"
+        "for i in range(300):\n"
+        "    np.sum(np.arange(10.0))\n"
+        "os.kill(os.getpid(), signal.SIGKILL)\n"
+    )
+    config = config_for(tmp_path)
+    config.trace.transport = "pipe"
+    result = run_experiment(config=config, script=str(script), script_args=[],
+                            target_specs=["numpy.sum"], repeat=1, continue_on_error=True)
+    assert result.runs[0].calls is None and result.streamed_calls == {}
+
+
+def test_forkserver_runs_are_independent_and_report_startup(tmp_path):
+    script = tmp_path / "rng.py"
+    script.write_text(
+        "import os, random, sys\nimport numpy as np\n"
+        "np.sum(np.arange(3.0))\n"
+        "out = os.path.join(os.environ['OUT_DIR'], os.environ['PYTRACER_RUN_ID'])\n"
+        "open(out, 'w').write(f'{np.random.rand()} {random.random()} {os.environ[\"SEED\"]}')\n"
+        "sys.exit(0 if sys.argv[1:] == ['a'] else 9)\n"
+    )
+    config = config_for(tmp_path)
+    config.run.start_method = "forkserver"
+    config.perturb.env = {"SEED": "{run_index}"}
+    result = run_experiment(config=config, script=str(script), script_args=["a"],
+                            target_specs=["numpy.sum"], repeat=3,
+                            env_overrides={"OUT_DIR": str(tmp_path)})
+    assert [r.exit_code for r in result.runs] == [0, 0, 0]
+    outputs = [(tmp_path / r.run_id).read_text().split() for r in result.runs]
+    assert [o[2] for o in outputs] == ["0", "1", "2"]
+    assert len({o[0] for o in outputs}) == 3 and len({o[1] for o in outputs}) == 3
+
+    from pytracer.trace.reader import load_run_calls
+
+    assert all(len(load_run_calls(r.run_dir)[0]) == 1 for r in result.runs)
+    meta = json.loads((result.experiment_dir / "experiment.json").read_text())
+    assert meta["start_method"] == "forkserver" and meta["forkserver_preload_s"] >= 0
+    assert [r["startup_s"] is not None for r in meta["runs"]] == [True] * 3
+
+
+def test_forkserver_mirrors_exit_codes_and_signals(tmp_path):
+    script = tmp_path / "die.py"
+    script.write_text(
+        "import os, signal, sys\n"
+        "if os.environ['PYTRACER_RUN_ID'] == 'run-000':\n"
+        "    sys.exit(3)\n"
+        "os.kill(os.getpid(), signal.SIGKILL)\n"
+    )
+    config = config_for(tmp_path)
+    config.run.start_method = "forkserver"
+    config.trace.transport = "pipe"
+    result = run_experiment(config=config, script=str(script), script_args=[],
+                            target_specs=[], repeat=2, continue_on_error=True)
+    assert [r.exit_code for r in result.runs] == [3, -9]
+    assert result.streamed_calls == {"run-000": []}
+
+
+@pytest.mark.parametrize("start_method", ["spawn", "forkserver"])
+def test_parallel_jobs_keep_run_naming_and_templating(tmp_path, start_method):
+    script = tmp_path / "par.py"
+    script.write_text(
+        "import os, sys, time\n"
+        "out = os.path.join(os.environ['OUT_DIR'], os.environ['PYTRACER_RUN_ID'])\n"
+        "start = time.time()\n"
+        "time.sleep(0.3)\n"
+        "open(out, 'w').write(f'{start} {time.time()}')\n"
+        "ok = os.environ['SEED'] == 'seed-' + os.environ['PYTRACER_RUN_ID']\n"
+        "ok = ok and os.environ['OMP_NUM_THREADS'] == os.environ['EXPECT_THREADS']\n"
+        "sys.exit(0 if ok else 9)\n"
+    )
+    config = config_for(tmp_path)
+    config.run.start_method = start_method
+    config.run.jobs = 4
+    config.perturb.env = {"SEED": "seed-{run_id}"}
+    ncpu = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    env = {"EXPECT_THREADS": str(max(1, ncpu // 4)), "OUT_DIR": str(tmp_path)}
+    saved = os.environ.pop("OMP_NUM_THREADS", None)
+    try:
+        result = run_experiment(config=config, script=str(script), script_args=[],
+                                target_specs=[], repeat=8, env_overrides=env)
+    finally:
+        if saved is not None:
+            os.environ["OMP_NUM_THREADS"] = saved
+    assert [r.run_id for r in result.runs] == [f"run-{k:03d}" for k in range(8)]
+    assert [r.exit_code for r in result.runs] == [0] * 8
+    spans = sorted(
+        tuple(map(float, (tmp_path / r.run_id).read_text().split())) for r in result.runs
+    )
+    assert any(b[0] < a[1] for a, b in itertools.pairwise(spans))  # runs overlapped
+
+
+def test_parallel_failure_stops_new_runs(tmp_path):
+    script = tmp_path / "fail.py"
+    script.write_text(
+        "import os, sys, time\n"
+        "if os.environ['PYTRACER_RUN_ID'] == 'run-000':\n"
+        "    sys.exit(4)\n"
+        "time.sleep(0.5)\n"
+    )
+    config = config_for(tmp_path)
+    config.run.jobs = 2
+    result = run_experiment(config=config, script=str(script), script_args=[],
+                            target_specs=[], repeat=6)
+    # run-000 fails at once; run-001 was already in flight and is kept
+    assert [r.run_id for r in result.runs] == ["run-000", "run-001"]
+    assert [r.exit_code for r in result.runs] == [4, 0]
+    assert any("stopping" in w for w in result.warnings)
+    assert not (result.experiment_dir / "runs" / "run-002").exists()
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="no CPU affinity")
+def test_pin_cpus_applied_in_run(tmp_path):
+    script = tmp_path / "pin.py"
+    script.write_text(
+        "import os\n"
+        "out = os.path.join(os.environ['OUT_DIR'], os.environ['PYTRACER_RUN_ID'])\n"
+        "open(out, 'w').write(','.join(map(str, sorted(os.sched_getaffinity(0)))))\n"
+    )
+    config = config_for(tmp_path)
+    config.run.jobs = 2
+    config.run.pin_cpus = True
+    result = run_experiment(config=config, script=str(script), script_args=[],
+                            target_specs=[], repeat=2,
+                            env_overrides={"OUT_DIR": str(tmp_path)})
+    for run in result.runs:
+        spec = json.loads((run.run_dir / "spec.json").read_text())
+        pinned = [int(c) for c in (tmp_path / run.run_id).read_text().split(",")]
+        assert pinned == spec["cpus"]
+
+
+def test_adaptive_stops_when_sig_converges(tmp_path):
+    script = tmp_path / "noisy.py"
+    script.write_text(
+        "import os\nimport numpy as np\n"
+        "rng = np.random.default_rng(int(os.environ['PYTRACER_RUN_ID'][-3:]))\n"
+        "np.sum(np.arange(10.0) + rng.normal(scale=1e-6))\n"
+        "np.prod(np.arange(1.0, 4.0))\n"
+    )
+    config = config_for(tmp_path)
+    config.run.adaptive = True
+    config.run.wave_size = 5
+    config.run.target_ci_bits = 1.0
+    config.run.start_method = "forkserver"
+    result = run_experiment(config=config, script=str(script), script_args=[],
+                            target_specs=["numpy.sum", "numpy.prod"], repeat=40)
+    experiment_meta = json.loads((result.experiment_dir / "experiment.json").read_text())
+    assert experiment_meta["repeat"] == 20 and experiment_meta["repeat_budget"] == 40
+    meta = experiment_meta["adaptive"]
+    # the exact np.prod converges at once; np.sum needs ~20 runs for a 1-bit interval
+    assert meta["converged"] and len(result.runs) == 20
+    assert [w["runs"] for w in meta["waves"]] == [5, 10, 15, 20]
+    assert meta["waves"][0]["unconverged"] == ["numpy.sum"]
+
+    from pytracer.analysis import analyze_experiment
+
+    _, aggregation, _ = analyze_experiment(result.experiment_dir)
+    widths = {r.function: r.min_output_sig_ci_bits for r in aggregation.functions}
+    assert widths["numpy.prod"] == 0.0 and widths["numpy.sum"] <= 1.0
+
+
+def test_adaptive_reports_budget_exhausted(tmp_path):
+    script = tmp_path / "noisy.py"
+    script.write_text(
+        "import numpy as np\nnp.sum(np.random.default_rng().normal(size=4))\n"
+    )
+    config = config_for(tmp_path)
+    config.run.adaptive = True
+    config.run.wave_size = 2
+    config.run.target_ci_bits = 0.1
+    result = run_experiment(config=config, script=str(script), script_args=[],
+                            target_specs=["numpy.sum"], repeat=3)
+    meta = json.loads((result.experiment_dir / "experiment.json").read_text())["adaptive"]
+    assert len(result.runs) == 3 and not meta["converged"]
+    assert [w["runs"] for w in meta["waves"]] == [2, 3]
+    assert any("still above" in w for w in result.warnings)
+
+
+def test_extend_and_incremental_analysis_match_full(tmp_path):
+    from pytracer.analysis import analyze_experiment, analyze_incremental
+
+    script = tmp_path / "noisy.py"
+    script.write_text(
+        "import os\nimport numpy as np\n"
+        "rng = np.random.default_rng(int(os.environ['PYTRACER_RUN_ID'][-3:]))\n"
+        "np.sum(np.arange(10.0) + rng.normal(scale=1e-6, size=10))\n"
+    )
+    config = config_for(tmp_path)
+    config.trace.store_arrays = "always"
+    first = run_experiment(config=config, script=str(script), script_args=[],
+                           target_specs=["numpy.sum"], repeat=3)
+    exp_dir = first.experiment_dir
+    analyze_incremental(exp_dir)
+    assert (exp_dir / "analysis" / "state.msgpack").is_file()
+
+    more = run_experiment(config=config, script=str(script), script_args=[],
+                          target_specs=["numpy.sum"], repeat=2, extend=exp_dir)
+    assert more.experiment_dir == exp_dir
+    assert [r.run_id for r in more.runs] == ["run-003", "run-004"]
+    meta = json.loads((exp_dir / "experiment.json").read_text())
+    assert meta["repeat"] == meta["repeat_budget"] == 5 and len(meta["runs"]) == 5
+
+    summary, incremental, _ = analyze_incremental(exp_dir)
+    alignment, full, _ = analyze_experiment(exp_dir)
+    assert summary == alignment.summary_dict()
+    (inc_row,), (full_row,) = incremental.functions, full.functions
+    assert inc_row.sig_basis == full_row.sig_basis == "element"
+    # tolerance zero: both reduce the same per-run means and shifted sums
+    assert [asdict(r) for r in incremental.functions] == [asdict(r) for r in full.functions]
+    assert [asdict(r) for r in incremental.arguments] == [asdict(r) for r in full.arguments]
+
+    other = tmp_path / "other.py"
+    other.write_text("pass\n")
+    with pytest.raises(ExperimentError, match="cannot extend"):
+        run_experiment(config=config, script=str(other), script_args=[],
+                       target_specs=[], repeat=1, extend=exp_dir)
+
+
+def test_finalization_background_and_deferred(tmp_path, capsys):
+    pytest.importorskip("pyarrow")
+    from pytracer.cli.main import main
+    from pytracer.storage.finalize import is_finalized
+
+    script = tmp_path / "p.py"
+    script.write_text("import numpy as np\nnp.sum(np.arange(10.0))\n")
+    config = config_for(tmp_path)
+    config.run.jobs = 2
+    background = run_experiment(config=config, script=str(script), script_args=[],
+                                target_specs=["numpy.sum"], repeat=2)
+    for run in background.runs:
+        assert json.loads((run.run_dir / "spec.json").read_text())["finalize"] is False
+        assert is_finalized(run.run_dir)  # by the orchestrator's pool
+
+    config.storage.finalize = "deferred"
+    deferred = run_experiment(config=config, script=str(script), script_args=[],
+                              target_specs=["numpy.sum"], repeat=3)
+    run_dirs = [run.run_dir for run in deferred.runs]
+    assert not any((d / "events.parquet").exists() for d in run_dirs)
+    assert main(["finalize", str(deferred.experiment_dir), "-j", "2"]) == 0
+    assert "finalized 3 run(s), 0 already up to date" in capsys.readouterr().out
+    assert all(is_finalized(d) for d in run_dirs)
+    mtimes = [(d / "events.parquet").stat().st_mtime_ns for d in run_dirs]
+    assert main(["finalize", str(deferred.experiment_dir)]) == 0
+    assert "finalized 0 run(s), 3 already up to date" in capsys.readouterr().out
+    assert [(d / "events.parquet").stat().st_mtime_ns for d in run_dirs] == mtimes
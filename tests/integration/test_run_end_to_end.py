@@ -103,6 +103,23 @@ def test_variability_is_detected(workdir):
     assert by_name["numpy.mean"]["min_output_sig_bits"] < 53.0
 
 
+def test_columnar_engine_matches_record_engine(workdir):
+    proc = run_cli(
+        ["run", "random_variability.py", "--repeat", "3", "--store-arrays", "never",
+         "--plugins", "--target", "numpy.mean", "--target", "numpy.sum", "--no-report"],
+        workdir,
+    )
+    assert proc.returncode == 0, proc.stderr
+    exp = experiment_dir(workdir)
+    outputs = {}
+    for engine in ("records", "columnar"):
+        proc = run_cli(["analyze", str(exp), "--engine", engine], workdir)
+        assert proc.returncode == 0, proc.stderr
+        outputs[engine] = {p.name: p.read_bytes() for p in (exp / "analysis").glob("*.json")}
+    assert outputs["records"] == outputs["columnar"]
+    assert b"numpy.mean" in outputs["columnar"]["function_summary.json"]
+
+
 def test_control_flow_divergence_reported(workdir):
     # 6 runs of a coin-flip branch: overwhelmingly likely to diverge at least once
     proc = run_cli(
@@ -1,10 +1,15 @@
+import json
+import math
+from dataclasses import asdict
+
+import numpy as np
 import pytest
 
 from pytracer._errors import AlignmentError
 from pytracer.analysis.aggregate import aggregate, sig_bits
-from pytracer.analysis.align import align
+from pytracer.analysis.align import align, call_count_divergence
 from pytracer.trace.event import NumericSummary, SourceRef
-from pytracer.trace.reader import CallRecord
+from pytracer.trace.reader import CALL_SAMPLING_FILENAME, CallRecord
 
 
 def make_call(call_id, qualname="sum", occurrence=0, out_mean=6.0, in_mean=2.0, lineno=5):
@@ -37,6 +42,26 @@ def test_sig_bits_degenerate():
     assert sig_bits([float("nan"), 1.0]) is None  # single finite value
 
 
+def test_sig_bits_matrix_matches_sig_bits():
+    from pytracer.analysis.aggregate import sig_bits_matrix
+
+    rows = [
+        [1.0, 1.0, 1.0],  # exact
+        [1.0, 1.0 + 1e-9, 1.0 - 1e-9],
+        [0.0, 1e-3, -1e-3],  # zero mean
+        [2.0, float("nan"), 2.5],
+        [3.0, None, float("inf")],  # one finite value
+        [None, None, None],
+    ]
+    sigs, means = sig_bits_matrix(np.array(rows, dtype=float))
+    for row, sig, mean in zip(rows, sigs.tolist(), means.tolist(), strict=True):
+        expected = sig_bits(row)
+        assert (math.isnan(sig) and expected is None) or sig == pytest.approx(expected)
+        clean = [v for v in row if v is not None and math.isfinite(v)]
+        assert (math.isnan(mean) and not clean) or mean == sum(clean) / len(clean)
+    assert sigs[0] == 53.0 and sigs[2] == 0.0
+
+
 def test_align_callsite_matches_identical_runs():
     runs = [[make_call(0), make_call(1, occurrence=1)] for _ in range(3)]
     alignment = align(["r0", "r1", "r2"], runs, mode="callsite")
@@ -99,6 +124,107 @@ def test_aggregate_nan_instability():
     assert result.functions[0].nan_instability
 
 
+def test_aggregate_marks_sampled_summaries():
+    calls = [make_call(0) for _ in range(2)]
+    calls[1].outputs["Ret"].sample_ratio = 0.01
+    alignment = align(["r0", "r1"], [[calls[0]], [calls[1]]])
+    assert alignment.summary_dict()["sampled_call_groups"] == 1
+    result = aggregate(alignment)
+    assert result.functions[0].sampled
+    by_phase = {row.phase: row for row in result.arguments}
+    assert by_phase["output"].sampled and not by_phase["input"].sampled
+
+
+def test_aggregate_without_runs_is_empty():
+    result = aggregate(align([], []))
+    assert result.functions == [] and result.arguments == []
+
+
+def test_reduce_observations_follows_group_accumulator():
+    from pytracer.analysis.aggregate import (
+        ArgObservation,
+        GroupAccumulator,
+        observations,
+        reduce_observations,
+    )
+
+    nan = math.nan
+    functions = ["numpy.dot", "numpy.sum"]
+    group_function = np.array([1, 0, 1, 1, 0])
+    complete = np.array([True, True, False, True, True])
+    # (group, phase, name, per-run means, nan counts, sampled, element min/p05/median)
+    table = [
+        (0, 0, 0, [1.0, 1.0 + 1e-9, 1.0], [0, 0], False, (nan, nan, nan)),
+        (0, 1, 1, [3.0, 3.0 + 1e-6, 3.0], [0, 0], True, (nan, nan, nan)),
+        (1, 0, 0, [2.0, 2.0, 2.0], [0, 1], False, (40.0, 42.0, 50.0)),
+        (1, 0, 2, [nan, nan, nan], [0, 0], False, (nan, nan, nan)),
+        (1, 1, 1, [0.5, 0.6, 0.5], [0, 0], False, (3.0, 4.0, 9.0)),
+        (3, 0, 0, [1.0, 1.0, 1.0], [0, 0], False, (nan, nan, nan)),
+        (3, 1, 1, [7.0, 7.1, 7.0], [0, 0], False, (nan, nan, nan)),
+        (4, 1, 1, [0.5, 0.5, 0.5], [0, 0], True, (20.0, 21.0, 30.0)),
+    ]
+    names = ["a", "Ret", "b"]
+    group, phase, name, means, nans, sampled, element = (list(c) for c in zip(*table, strict=True))
+    obs = observations(
+        np.array(group), np.array(phase), np.array(name), np.array(means),
+        np.array([[n[0], n[1], n[1]] for n in nans]), np.zeros((len(table), 3)),
+        np.array(sampled), np.array(element),
+    )
+    got = reduce_observations(
+        obs, 3, functions, group_function, complete,
+        {0: {"t1"}, 1: {"t2"}}, {1: {"solve"}}, names,
+    )
+
+    accumulator = GroupAccumulator()
+    for g, f in enumerate(group_function.tolist()):
+        rows = [k for k, row in enumerate(table) if row[0] == g]
+        accumulator.add_group(
+            functions[f],
+            complete=bool(complete[g]),
+            tiers={"t1"} if f == 0 else {"t2"},
+            regions={"solve"} if f == 1 else set(),
+            observations=[
+                ArgObservation(
+                    phase="output" if phase[k] else "input",
+                    arg_name=names[name[k]],
+                    proxy_sig=None if math.isnan(p := obs.proxy[k].item()) else p,
+                    element=None if math.isnan(element[k][0]) else dict(
+                        zip(("min", "p05", "median"), element[k], strict=True)
+                    ),
+                    sampled=sampled[k],
+                    nan_varies=bool(obs.nan_varies[k]),
+                    inf_varies=False,
+                    mean=None if math.isnan(m := obs.mean[k].item()) else m,
+                    run_means=means[k],
+                )
+                for k in rows
+            ],
+        )
+    expected = accumulator.result(3)
+    assert [asdict(r) for r in got.functions] == [asdict(r) for r in expected.functions]
+    assert [asdict(r) for r in got.arguments] == [asdict(r) for r in expected.arguments]
+
+
+def test_reduce_observations_sums_like_builtin_sum():
+    from pytracer.analysis.aggregate import observations, reduce_observations
+
+    # sequential float addition gives 1.0; sum() compensates it back to 2.0
+    values = [1e16, 1.0, -1e16, 1.0]
+    n = len(values)
+    obs = observations(
+        np.arange(n), np.ones(n, dtype=np.int64), np.zeros(n, dtype=np.int64),
+        np.array([[v, v] for v in values]), np.zeros((n, 2)), np.zeros((n, 2)),
+        np.zeros(n, dtype=bool),
+    )
+    result = reduce_observations(
+        obs, 2, ["f"], np.zeros(n, dtype=np.int64), np.ones(n, dtype=bool), {}, {}, ["Ret"]
+    )
+    (row,) = result.arguments
+    assert row.mean_of_means == sum(values) / n == 0.5
+    mu = sum(values) / n
+    assert row.std_of_means == math.sqrt(sum((v - mu) * (v - mu) for v in values) / n)
+
+
 def test_top_unstable_ranks_amplifiers_first():
     stable = [make_call(0, qualname="stable", lineno=1) for _ in range(3)]
     noisy = [
@@ -154,3 +280,244 @@ def test_fuzzy_alignment_identical_runs():
     alignment = align(["r0", "r1", "r2"], runs, mode="fuzzy")
     assert len(alignment.groups) == 2
     assert all(g.complete for g in alignment.groups)
+
+
+def test_align_callsite_ids_are_run_local():
+    # the same two sites, first seen in opposite order: run-local ids differ
+    def call(call_id, qualname, lineno, callsite_id):
+        c = make_call(call_id, qualname=qualname, lineno=lineno)
+        c.callsite_id = callsite_id
+        return c
+
+    run_a = [call(0, "sum", 1, 0), call(1, "mean", 2, 1)]
+    run_b = [call(0, "mean", 2, 0), call(1, "sum", 1, 1)]
+    alignment = align(["a", "b"], [run_a, run_b], mode="callsite")
+    assert len(alignment.groups) == 2
+    assert all(g.complete for g in alignment.groups)
+    for group in alignment.groups:
+        assert group.calls[0].qualname == group.calls[1].qualname
+    assert alignment.groups[0].key == ("numpy", "sum", None, "/x.py", 1, 0)
+
+
+def test_call_count_divergence_includes_sampled_out_calls(tmp_path):
+    run_dirs = [tmp_path / "run-000", tmp_path / "run-001"]
+    calls = [make_call(0), make_call(1, occurrence=1)]
+    for run_dir, skipped in zip(run_dirs, (5, 7), strict=True):
+        run_dir.mkdir()
+        (run_dir / CALL_SAMPLING_FILENAME).write_text(json.dumps({
+            "policy": "every", "first": 2, "every": 3,
+            "skipped": [{"module": "numpy", "qualname": "sum", "ufunc_method": None,
+                         "file": "/x.py", "lineno": 5, "calls": skipped}],
+        }))
+    divergence = call_count_divergence(run_dirs, [calls, calls])
+    assert divergence == [
+        {"function": "numpy.sum", "source": "/x.py:5", "calls_per_run": [7, 9]}
+    ]
+    assert call_count_divergence(run_dirs, [calls, calls[:1]])[0]["calls_per_run"] == [7, 8]
+    assert call_count_divergence([tmp_path / "none"], [calls]) == []
+
+
+def test_sig_ci_width_shrinks_with_runs():
+    from pytracer.analysis.aggregate import SIG_CAP_BITS, sig_ci_width
+
+    assert sig_ci_width(20.0, 1) is None and sig_ci_width(None, 10) is None
+    assert sig_ci_width(SIG_CAP_BITS, 3) == 0.0
+    widths = [sig_ci_width(20.0, n) for n in (3, 5, 10, 20, 40)]
+    assert widths == sorted(widths, reverse=True)
+    assert 0.9 < sig_ci_width(20.0, 20) < 1.0  # ~ 2 * 1.96 / ln2 / sqrt(38)
+    assert sig_ci_width(0.5, 10) > sig_ci_width(20.0, 10)  # mean uncertainty matters
+
+
+def test_bootstrap_ci_follows_the_runs_not_just_sig():
+    from pytracer.analysis.aggregate import bootstrap_ci_widths, sig_bits, sig_ci_width
+
+    d = 1e-6
+    outlier = [1.0, 1.0, 1.0, 1.0, 1.0 + d]  # one run disagrees
+    a = 0.4 * d / math.sqrt(0.5)  # same spread, shared by every run
+    spread = [1.0 - a, 1.0 - a / 2, 1.0, 1.0 + a / 2, 1.0 + a]
+    assert sig_bits(outlier) == pytest.approx(sig_bits(spread), abs=1e-3)
+    widths = bootstrap_ci_widths(np.array([outlier, spread]), np.array([0, 1]), 2)
+    assert widths[0] > 20 > 2 > widths[1] > 0  # resamples without the outlier agree exactly
+    assert sig_ci_width(sig_bits(outlier), 5) == pytest.approx(sig_ci_width(sig_bits(spread), 5))
+
+    # many groups: the lowest sig is steadier than any one group's
+    rng = np.random.default_rng(1)
+    one = 1.0 + rng.normal(scale=d, size=(1, 5))
+    many = 1.0 + rng.normal(scale=d, size=(50, 5))
+    widths = bootstrap_ci_widths(np.vstack([one, many]), np.repeat([0, 1], [1, 50]), 2)
+    assert widths[1] < widths[0]
+    assert np.isnan(bootstrap_ci_widths(np.ones((1, 1)), np.array([0]), 1)).all()
+
+
+def test_sig_convergence_folds_only_new_runs(tmp_path, monkeypatch):
+    import pytracer.analysis as analysis
+
+    summary = NumericSummary(dtype="float64", shape=(4,), size=4, mean=1.0)
+    call = ("sum", 0, {"a": summary}, {"Ret": summary}, {})
+    loaded = []
+    load_run_calls = analysis.load_run_calls
+    monkeypatch.setattr(
+        analysis, "load_run_calls", lambda d: loaded.append(d.name) or load_run_calls(d)
+    )
+    state = None
+    for k in range(3):
+        _write_columnar_run(tmp_path / "runs" / f"run-{k:03d}", k, [call])
+        wave, state = analysis.sig_convergence(tmp_path, 1.0, state=state)
+    assert loaded == ["run-000", "run-001", "run-002"]
+    assert wave == {"runs": 3, "max_ci_width_bits": 0.0, "unconverged": []}
+    assert state is not None and state.run_ids == loaded
+
+
+def test_incremental_state_matches_full_aggregation(tmp_path):
+    from pytracer.analysis.incremental import AnalysisState
+
+    runs = [
+        [make_call(0, out_mean=6.0), make_call(1, qualname="mean", out_mean=1.5)],
+        [make_call(0, out_mean=6.0 + 1e-9)],
+        [make_call(0, out_mean=6.0 - 2e-9), make_call(1, qualname="mean", out_mean=1.5)],
+    ]
+    run_ids = ["r0", "r1", "r2"]
+    alignment = align(run_ids, runs, mode="callsite")
+    full = aggregate(alignment)
+
+    state = AnalysisState(mode="callsite")
+    for run_id, calls in zip(run_ids, runs, strict=True):
+        state.add_run(run_id, calls, tmp_path)
+    summary = state.alignment_summary([], {})
+    assert summary == alignment.summary_dict()
+    incremental = state.aggregation()
+    assert [asdict(r) for r in incremental.functions] == [asdict(r) for r in full.functions]
+    assert [asdict(r) for r in incremental.arguments] == [asdict(r) for r in full.arguments]
+    with pytest.raises(AlignmentError, match="numpy.mean"):
+        state.check_strict()
+
+
+def test_incremental_state_keeps_the_spread_of_close_means(tmp_path):
+    from pytracer.analysis.incremental import AnalysisState
+
+    # means agreeing to ~2^-39: running moments of the raw values lose the
+    # spread to rounding, the per-run means reduced at once do not
+    base = 1.2345678901234567
+    runs = [
+        [make_call(0, in_mean=base * (1 + k * 2.0**-45), out_mean=base * (1 + k * 2.0**-39))]
+        for k in (0, 3, -1, 2, 5)
+    ]
+    run_ids = [f"r{k}" for k in range(len(runs))]
+    full = aggregate(align(run_ids, runs, mode="callsite"))
+    state = AnalysisState(mode="callsite")
+    for run_id, calls in zip(run_ids, runs, strict=True):
+        state.add_run(run_id, calls, tmp_path)
+    incremental = state.aggregation()
+    assert [asdict(r) for r in incremental.functions] == [asdict(r) for r in full.functions]
+    assert [asdict(r) for r in incremental.arguments] == [asdict(r) for r in full.arguments]
+
+
+def _write_columnar_run(run_dir, run_index, calls, truncate=False):
+    from pytracer.storage.parquet import finalize_run
+    from pytracer.trace.event import SCHEMA_VERSION, ArgRecord, TraceEvent
+    from pytracer.trace.writer import TraceWriter
+
+    writer = TraceWriter(run_dir)
+    event_id = 0
+    for call_id, (qualname, occurrence, inputs, outputs, extra) in enumerate(calls):
+        common = dict(
+            schema_version=SCHEMA_VERSION,
+            run_id=run_dir.name,
+            call_id=call_id,
+            occurrence=occurrence,
+            module="numpy",
+            qualname=qualname,
+            source=SourceRef(file="/x.py", lineno=3),
+            **extra,
+        )
+        for phase, args in (("input", inputs), ("output", outputs)):
+            if isinstance(args, dict):  # one event per argument
+                for name, summary in args.items():
+                    writer.write_event(TraceEvent(
+                        event_id=event_id, phase=phase, arg_name=name, summary=summary, **common
+                    ))
+                    event_id += 1
+            else:  # a call record
+                writer.write_event(TraceEvent(
+                    event_id=event_id, phase=phase,
+                    args=[ArgRecord(name=n, summary=s) for n, s in args], **common,
+                ))
+                event_id += 1
+    writer.close()
+    if truncate:
+        writer.path.write_bytes(writer.path.read_bytes()[:-10])
+    (run_dir / "metadata.json").write_text(json.dumps({"run_index": run_index}))
+    finalize_run(run_dir)
+
+
+def test_columnar_engine_matches_record_engine(tmp_path):
+    from pytracer.analysis import analyze_columnar, analyze_experiment
+    from pytracer.analysis.columnar import columnar_unsupported
+
+    def s(mean, nan=0, ratio=None):
+        return NumericSummary(
+            dtype="float64", shape=(4,), size=4, mean=mean, nan_count=nan, sample_ratio=ratio
+        )
+
+    def runs(k):
+        eps = k * 1e-9
+        return [
+            ("sum", 0, {"a": s(2.0), "b": s(1.0 + eps)}, {"Ret": s(6.0 + eps)}, {}),
+            ("dot", 0, [("x", s(0.1 * k)), ("y", None)], [("Ret", s(3.0, nan=k % 2))], {}),
+            ("add", 0, [("a", s(1.0, ratio=0.5))], [("Ret", s(2.0 + eps))],
+             {"ufunc_method": "reduce", "region": "solve"}),
+            ("sum", 1, {"a": s(float("nan"))}, {"Ret": s(5.0 - eps)}, {"tier": "t2"}),
+            ("sum", 0, {"a": s(2.5)}, {"Ret": s(7.0)}, {}),  # same key: last call wins
+            *([("mean", k, {"a": s(1.0)}, {"Ret": s(1.0)}, {})] if k != 1 else []),
+            ("var", 0, [("a", s(4.0))], [("Ret", s(0.0 + eps))], {}),
+        ]
+
+    run_dirs = [tmp_path / "runs" / f"run-{k:03d}" for k in range(3)]
+    for k, run_dir in enumerate(run_dirs):
+        _write_columnar_run(run_dir, k, runs(k), truncate=k == 2)
+    assert columnar_unsupported(run_dirs, "callsite") is None
+    assert columnar_unsupported(run_dirs, "fuzzy") == "fuzzy alignment"
+
+    outputs = {}
+    for name, analyze in (("records", analyze_experiment), ("columnar", analyze_columnar)):
+        kwargs = {} if name == "records" else {"fallback": False}
+        analyze(tmp_path, target_specs=[], **kwargs)
+        outputs[name] = {
+            p.name: p.read_text() for p in sorted((tmp_path / "analysis").glob("*.json"))
+        }
+    assert outputs["records"] == outputs["columnar"]
+    alignment = json.loads(outputs["columnar"]["alignment.json"])
+    assert alignment["truncated_runs"] == ["run-002"]
+    assert alignment["divergent_call_groups"] == 2  # numpy.mean: occurrences 0 and 2
+
+    with pytest.raises(AlignmentError, match="strict alignment failed: call numpy.mean"):
+        analyze_columnar(tmp_path, alignment_mode="strict", target_specs=[], fallback=False)
+
+
+def test_columnar_engine_analyzes_an_empty_run(tmp_path):
+    from pytracer.analysis import analyze_columnar, analyze_experiment
+    from pytracer.analysis.columnar import columnar_unsupported
+    from pytracer.storage.finalize import finalize_run_dir, is_finalized
+
+    summary = NumericSummary(dtype="float64", shape=(4,), size=4, mean=1.0)
+    call = ("sum", 0, {"a": summary}, {"Ret": summary}, {})
+    run_dirs = [tmp_path / "runs" / f"run-{k:03d}" for k in range(3)]
+    for k, run_dir in enumerate(run_dirs):
+        _write_columnar_run(run_dir, k, [] if k == 1 else [call])
+        finalize_run_dir(run_dir)  # builds the index
+    # the empty capture gets no table, and stays finalized
+    assert not (run_dirs[1] / "events.parquet").exists()
+    assert all(is_finalized(d) for d in run_dirs)
+    assert [finalize_run_dir(d) for d in run_dirs] == [None, None, None]
+    assert columnar_unsupported(run_dirs, "callsite") is None
+
+    outputs = {}
+    for name, analyze in (("records", analyze_experiment), ("columnar", analyze_columnar)):
+        kwargs = {} if name == "records" else {"fallback": False}
+        analyze(tmp_path, target_specs=[], **kwargs)
+        outputs[name] = {
+            p.name: p.read_text() for p in sorted((tmp_path / "analysis").glob("*.json"))
+        }
+    assert outputs["records"] == outputs["columnar"]
+    (row,) = json.loads(outputs["columnar"]["function_summary.json"])
+    assert (row["n_call_groups"], row["n_matched"]) == (1, 0)
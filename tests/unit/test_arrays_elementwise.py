@@ -52,6 +52,13 @@ def test_elementwise_identical_runs_full_precision():
     assert result["min"] == 53.0 and result["median"] == 53.0
 
 
+def test_elementwise_identical_runs_exact_whatever_the_rounding_of_their_mean():
+    # five copies of 0.123456789 do not average back to it exactly
+    assert np.full((5, 1), 0.123456789).std(axis=0)[0] > 0
+    result = elementwise_sig(np.full((5, 3), 0.123456789))
+    assert result["min"] == 53.0
+
+
 def test_elementwise_noisy_runs():
     rng = np.random.default_rng(42)
     base = np.full(1000, 100.0)
@@ -52,3 +52,9 @@ def test_doctor_runs_without_config(tmp_path):
     proc = run_cli(["doctor"], tmp_path)
     assert proc.returncode == 0
     assert "Pytracer doctor" in proc.stdout
+
+
+def test_ingest_rejects_non_experiment(tmp_path):
+    proc = run_cli(["ingest", str(tmp_path)], tmp_path)
+    assert proc.returncode == 1
+    assert "not a pytracer experiment" in proc.stderr
@@ -63,3 +63,61 @@ def test_perturb_env_bad_template_rejected():
 def test_perturb_env_non_string_rejected():
     with pytest.raises(ConfigError, match="perturb.env"):
         config_from_dict({"perturb": {"env": {"X": 5}}})
+
+
+def test_sampled_mode_validated():
+    trace = config_from_dict({"trace": {"mode": "sampled", "sample_size": 1024}}).trace
+    assert trace.mode == "sampled" and trace.sample_threshold == 1_000_000
+    with pytest.raises(ConfigError, match="sample_size"):
+        config_from_dict({"trace": {"sample_size": 0}})
+
+
+def test_capture_format_validated():
+    assert config_from_dict({"trace": {"capture_format": "binary"}}).trace.capture_format == \
+        "binary"
+    with pytest.raises(ConfigError, match="capture_format"):
+        config_from_dict({"trace": {"capture_format": "xml"}})
+
+
+def test_scope_validated():
+    assert config_from_dict({"trace": {"scope": "regions"}}).trace.scope == "regions"
+    with pytest.raises(ConfigError, match="scope"):
+        config_from_dict({"trace": {"scope": "kernels"}})
+
+
+def test_run_start_method_validated():
+    assert config_from_dict({"run": {"start_method": "forkserver"}}).run.start_method == \
+        "forkserver"
+    with pytest.raises(ConfigError, match="start_method"):
+        config_from_dict({"run": {"start_method": "thread"}})
+
+
+def test_run_jobs_validated():
+    assert config_from_dict({"run": {"jobs": 8}}).run.jobs == 8
+    with pytest.raises(ConfigError, match="jobs"):
+        config_from_dict({"run": {"jobs": 0}})
+
+
+def test_run_executor_validated():
+    config = config_from_dict({"run": {"executor": "ssh", "hosts": ["n1", "n2"]}})
+    assert config.run.hosts == ["n1", "n2"]
+    with pytest.raises(ConfigError, match="run.hosts"):
+        config_from_dict({"run": {"executor": "ssh"}})
+    with pytest.raises(ConfigError, match="executor"):
+        config_from_dict({"run": {"executor": "k8s"}})
+
+
+def test_storage_finalization_validated():
+    storage = config_from_dict({"storage": {"finalize": "deferred"}}).storage
+    assert storage.finalize == "deferred" and storage.parquet_row_group_size == 65536
+    with pytest.raises(ConfigError, match="finalize"):
+        config_from_dict({"storage": {"finalize": "never"}})
+    with pytest.raises(ConfigError, match="parquet_row_group_size"):
+        config_from_dict({"storage": {"parquet_row_group_size": 0}})
+
+
+def test_analysis_engine_validated():
+    assert config_from_dict({}).analysis.engine == "auto"
+    assert config_from_dict({"analysis": {"engine": "columnar"}}).analysis.engine == "columnar"
+    with pytest.raises(ConfigError, match="analysis.engine"):
+        config_from_dict({"analysis": {"engine": "arrow"}})
@@ -1,10 +1,34 @@
+import os
+
 import msgspec
 import pytest
 
 from pytracer._errors import PytracerError
-from pytracer.trace.event import SCHEMA_VERSION, NumericSummary, SourceRef, TraceEvent
-from pytracer.trace.reader import assemble_calls, iter_events
-from pytracer.trace.writer import TraceWriter
+from pytracer.trace.binary import BINARY_EVENTS_FILENAME, MAGIC
+from pytracer.trace.event import (
+    SCHEMA_VERSION,
+    ArgRecord,
+    Callsite,
+    NumericSummary,
+    SourceRef,
+    TraceEvent,
+)
+from pytracer.trace.index import INDEX_FILENAME, build_index, open_index
+from pytracer.trace.reader import (
+    EventStream,
+    assemble_calls,
+    expand_arguments,
+    find_events_file,
+    iter_events,
+    load_run_calls,
+)
+from pytracer.trace.stream import StreamReceiver
+from pytracer.trace.writer import (
+    CALLSITES_FILENAME,
+    BinaryTraceWriter,
+    TraceWriter,
+    make_trace_writer,
+)
 
 
 def make_event(event_id=0, call_id=0, phase="input", **kwargs):
@@ -66,6 +90,26 @@ def test_corruption_mid_file_raises(tmp_path):
         iter_events(writer.path)
 
 
+def test_index_and_stream_agree_on_truncation(tmp_path):
+    writer = TraceWriter(tmp_path)
+    for i in range(5):
+        writer.write_event(make_event(event_id=i))
+    writer.close()
+    lines = writer.path.read_bytes().splitlines(keepends=True)
+    # a bad line with anything after it is corruption, however far past it
+    bad = b'{"garbage": true\n'
+    writer.path.write_bytes(b"".join([*lines[:3], bad, b"\n" * 5000, lines[4]]))
+    for read in (iter_events, lambda path: build_index(path.parent)):
+        with pytest.raises(PytracerError, match="corrupt"):
+            read(writer.path)
+    # the same line last, followed only by blank lines, is a partial write
+    writer.path.write_bytes(b"".join([*lines[:3], bad, b"\n" * 5000]))
+    assert iter_events(writer.path)[1]
+    build_index(tmp_path)
+    with open_index(tmp_path) as index:
+        assert index.truncated
+
+
 def test_assemble_calls_groups_and_orders():
     events = [
         make_event(event_id=0, call_id=0, phase="input"),
@@ -88,3 +132,281 @@ def test_event_json_is_plain_json(tmp_path):
     decoded = msgspec.json.decode(line)
     assert decoded["module"] == "numpy"
     assert decoded["schema_version"] == SCHEMA_VERSION
+
+
+def test_binary_roundtrip_matches_jsonl(tmp_path):
+    events = [make_event(event_id=i, call_id=i // 2, phase="input" if i % 2 == 0 else "output",
+                         ts_ns=1000 + i)
+              for i in range(10)]
+    events.append(make_event(event_id=10, call_id=5, phase="exception", summary=None,
+                             arg_name=None, note="ValueError: x", source=None))
+    jsonl = TraceWriter(tmp_path / "j")
+    binary = BinaryTraceWriter(tmp_path / "b")
+    for ev in events:
+        jsonl.write_event(ev)
+        binary.write_event(ev)
+    jsonl.close()
+    binary.close()
+
+    from_jsonl, _ = iter_events(jsonl.path)
+    from_binary, truncated = iter_events(binary.path)
+    assert not truncated
+    assert from_binary == from_jsonl == events
+    assert binary.path.stat().st_size < jsonl.path.stat().st_size / 2
+
+
+def test_binary_truncated_final_record_tolerated(tmp_path):
+    writer = BinaryTraceWriter(tmp_path)
+    for i in range(3):
+        writer.write_event(make_event(event_id=i))
+    writer.close()
+    raw = writer.path.read_bytes()
+    writer.path.write_bytes(raw[:-5])
+
+    events, truncated = iter_events(writer.path)
+    assert truncated
+    assert [e.event_id for e in events] == [0, 1]
+
+
+def test_binary_checksum_mismatch_mid_file_raises(tmp_path):
+    writer = BinaryTraceWriter(tmp_path)
+    for i in range(5):
+        writer.write_event(make_event(event_id=i, note=f"n{i}"))
+    writer.close()
+    raw = bytearray(writer.path.read_bytes())
+    raw[len(MAGIC) + 12] ^= 0xFF  # inside the first record's payload
+    writer.path.write_bytes(bytes(raw))
+    with pytest.raises(PytracerError, match="corrupt"):
+        iter_events(writer.path)
+
+
+def test_find_events_file_either_format(tmp_path):
+    assert find_events_file(tmp_path) is None
+    make_trace_writer(tmp_path / "b", "binary").close()
+    assert find_events_file(tmp_path / "b").name == BINARY_EVENTS_FILENAME
+    with pytest.raises(ValueError, match="capture format"):
+        make_trace_writer(tmp_path, "xml")
+
+
+@pytest.mark.parametrize("capture_format", ["jsonl", "binary"])
+def test_interned_callsites_resolved_on_read(tmp_path, capture_format):
+    writer = make_trace_writer(tmp_path, capture_format)
+    site = Callsite(callsite_id=0, module="numpy", qualname="add", tier="t2",
+                    ufunc_method="reduce", source=SourceRef(file="/tmp/x.py", lineno=3))
+    writer.write_callsite(site)
+    writer.write_event(make_event(module="", qualname="", source=None, callsite_id=0))
+    writer.close()
+
+    (event,), _ = iter_events(writer.path)
+    assert (event.module, event.qualname, event.tier, event.ufunc_method) == \
+        ("numpy", "add", "t2", "reduce")
+    assert event.source == SourceRef(file="/tmp/x.py", lineno=3)
+    assert assemble_calls([event])[0].callsite_id == 0
+
+
+def test_interned_event_lines_omit_callsite_fields(tmp_path):
+    writer = TraceWriter(tmp_path)
+    writer.write_callsite(Callsite(callsite_id=0, module="numpy", qualname="sum"))
+    writer.write_event(make_event(module="", qualname="", source=None, callsite_id=0))
+    writer.close()
+    decoded = msgspec.json.decode(writer.path.read_bytes().splitlines()[0])
+    assert "module" not in decoded and "source" not in decoded
+    assert decoded["callsite_id"] == 0
+    assert (tmp_path / CALLSITES_FILENAME).is_file()
+
+
+def make_call_record(event_id, call_id, phase, names, **kwargs):
+    args = [
+        ArgRecord(name=name, payload_kind="summary",
+                  summary=NumericSummary(dtype="float64", shape=(3,), size=3, mean=float(i)))
+        for i, name in enumerate(names)
+    ]
+    return make_event(event_id=event_id, call_id=call_id, phase=phase, arg_name=None,
+                      summary=None, args=args, ts_ns=1000 + event_id, **kwargs)
+
+
+def test_call_records_roundtrip_and_assemble(tmp_path):
+    events = [
+        make_call_record(0, 0, "input", ["a", "b", "out"]),
+        make_call_record(1, 0, "output", ["Ret"]),
+        make_call_record(2, 1, "input", ["a"], region="solver"),
+        make_event(event_id=3, call_id=1, phase="exception", arg_name=None, summary=None,
+                   args=[], note="ValueError: x"),
+    ]
+    jsonl = TraceWriter(tmp_path / "j")
+    binary = BinaryTraceWriter(tmp_path / "b")
+    for ev in events:
+        jsonl.write_event(ev)
+        binary.write_event(ev)
+    jsonl.close()
+    binary.close()
+    from_jsonl, _ = iter_events(jsonl.path)
+    from_binary, _ = iter_events(binary.path)
+    assert from_binary == from_jsonl == events
+
+    calls = assemble_calls(from_binary)
+    assert list(calls[0].inputs) == ["a", "b", "out"]
+    assert calls[0].inputs["b"].mean == 1.0 and "Ret" in calls[0].outputs
+    assert calls[1].exception == "ValueError: x" and calls[1].region == "solver"
+    # mixed with legacy per-argument events from older captures
+    legacy = [make_event(event_id=10, call_id=5), make_event(event_id=11, call_id=5,
+                                                             phase="output")]
+    assert assemble_calls(events + legacy)[2].inputs["a"].mean == 2.0
+
+
+def test_calls_ordered_by_start_across_thread_id_blocks(tmp_path):
+    # a second thread's id block (4096...) starts before the first thread's call
+    events = [
+        msgspec.structs.replace(make_call_record(event_id, event_id, "input", ["a"]), ts_ns=ts)
+        for event_id, ts in ((0, 500), (4096, 100), (1, 900))
+    ]
+    assert [c.call_id for c in assemble_calls(events)] == [4096, 0, 1]
+    writer = TraceWriter(tmp_path)
+    writer.write_events(events)
+    writer.close()
+    with open_index(tmp_path, build=True) as index:
+        assert [c.call_id for c in index.call_stubs()] == [4096, 0, 1]
+    # without a timestamp on every call: event id order
+    events[2] = msgspec.structs.replace(events[2], ts_ns=None)
+    assert [c.call_id for c in assemble_calls(events)] == [0, 1, 4096]
+
+
+def test_expand_arguments_splits_records():
+    events = [make_call_record(0, 0, "input", ["a", "b"]), make_event(event_id=1)]
+    expanded = expand_arguments(events)
+    assert [(e.event_id, e.arg_name) for e in expanded] == [(0, "a"), (0, "b"), (1, "a")]
+    assert all(e.args is None for e in expanded)
+    assert expanded[1].summary.mean == 1.0 and expanded[1].payload_kind == "summary"
+
+
+def test_stream_transport_roundtrip(tmp_path):
+    read_fd, write_fd = os.pipe()
+    receiver = StreamReceiver(read_fd, "run-000")
+    receiver.start()
+    writer = make_trace_writer(tmp_path, stream_fd=write_fd)
+    writer.write_callsite(Callsite(callsite_id=0, module="numpy", qualname="sum"))
+    events = [make_event(event_id=i, call_id=i // 2, phase="input" if i % 2 == 0 else "output",
+                         module="", qualname="", callsite_id=0) for i in range(600)]
+    for ev in events:
+        writer.write_event(ev)
+    writer.close()
+    receiver.join()
+    assert receiver.complete and receiver.progress() == {"events": 600, "calls": 300}
+    calls = receiver.calls()  # assembled batch by batch, events not kept
+    assert calls == assemble_calls(iter_events(writer.path)[0])
+    assert len(calls) == 300 and calls[0].qualname == "sum"  # callsites resolved
+    assert writer.stats()["events_streamed"] == 600
+
+
+def test_stream_without_end_frame_is_incomplete(tmp_path):
+    read_fd, write_fd = os.pipe()
+    receiver = StreamReceiver(read_fd, "run-000")
+    receiver.start()
+    os.write(write_fd, b"E" + msgspec.json.encode(make_event()) + b"\n")
+    os.close(write_fd)  # the child died before closing its writer
+    receiver.join()
+    assert not receiver.complete and receiver.n_events == 1
+
+
+def test_event_stream_decodes_in_batches(tmp_path, monkeypatch):
+    import pytracer.trace.reader as reader
+
+    monkeypatch.setattr(reader, "READ_CHUNK_BYTES", 300)  # a few lines per batch
+    writer = TraceWriter(tmp_path)
+    for i in range(50):
+        writer.write_event(make_event(event_id=i, call_id=i))
+    writer.close()
+    stream = EventStream(writer.path)
+    assert [e.event_id for e in stream] == list(range(50))
+    assert not stream.truncated
+
+    raw = writer.path.read_bytes()
+    writer.path.write_bytes(raw[:-15])
+    stream = EventStream(writer.path)
+    assert len(list(stream)) == 49 and stream.truncated
+
+    lines = raw.splitlines(keepends=True)
+    lines[30] = b'{"garbage": true\n'
+    writer.path.write_bytes(b"".join(lines))
+    with pytest.raises(PytracerError, match="line 31"):
+        list(EventStream(writer.path))
+
+
+def test_event_stream_binary_is_lazy(tmp_path):
+    writer = BinaryTraceWriter(tmp_path)
+    for i in range(5):
+        writer.write_event(make_event(event_id=i))
+    writer.close()
+    stream = iter(EventStream(writer.path))
+    assert next(stream).event_id == 0
+    stream.close()  # abandoning a stream releases the mapping
+    assert [e.event_id for e in EventStream(writer.path)] == list(range(5))
+
+
+@pytest.mark.parametrize("capture_format", ["jsonl", "binary"])
+def test_trace_index_random_access(tmp_path, capture_format):
+    writer = make_trace_writer(tmp_path, capture_format)
+    writer.write_callsite(Callsite(callsite_id=0, module="numpy", qualname="add",
+                                   source=SourceRef(file="/tmp/x.py", lineno=3)))
+    events = []
+    for call_id in range(4):  # calls 0..3 at one site, occurrences 0..3
+        events.append(make_call_record(2 * call_id, call_id, "input", ["a", "b"],
+                                       module="", qualname="", source=None,
+                                       callsite_id=0, occurrence=call_id))
+        events.append(make_call_record(2 * call_id + 1, call_id, "output", ["Ret"],
+                                       module="", qualname="", source=None,
+                                       callsite_id=0, occurrence=call_id))
+    events.append(make_call_record(8, 7, "input", ["x"], region="solver"))
+    events.append(make_event(event_id=9, call_id=7, phase="exception", arg_name=None,
+                             summary=None, args=[], note="ValueError: x"))
+    for event in events:
+        writer.write_event(event)
+    writer.close()
+    expected = assemble_calls(iter_events(writer.path)[0])
+
+    assert open_index(tmp_path) is None
+    assert build_index(tmp_path) == tmp_path / INDEX_FILENAME
+    with open_index(tmp_path) as index:
+        assert len(index) == 5
+        assert index.call(2) == expected[2]
+        assert index.call(7) == expected[4]
+        assert index.call(5) is None and index.events(99) == []
+        site = index.sites.index(("numpy", "add", None, "/tmp/x.py", 3, "t1"))
+        assert index.call_ids_at(site).tolist() == [0, 1, 2, 3]
+        assert index.call_at(site, 3) == expected[3]
+        assert index.call_at(site, 4) is None
+        stubs = index.call_stubs()
+        assert [s.call_id for s in stubs] == [c.call_id for c in expected]
+        assert [s.site for s in stubs] == [c.site for c in expected]
+        assert stubs[4].exception is not None and stubs[4].region == "solver"
+        assert not stubs[0].inputs and stubs[0].exception is None
+
+    # the index is only trusted while the capture file is unchanged
+    with open(writer.path, "ab") as fo:
+        fo.write(b"\n")
+    assert open_index(tmp_path) is None
+    with open_index(tmp_path, build=True) as index:
+        assert index.call(0) == expected[0]
+
+
+def test_load_run_calls_names_both_capture_files(tmp_path):
+    with pytest.raises(PytracerError, match=f"events.jsonl or {BINARY_EVENTS_FILENAME}"):
+        load_run_calls(tmp_path)
+
+
+@pytest.mark.parametrize("version", ["2.0.0", "3.0.0"])
+def test_readable_schema_versions(tmp_path, version):
+    writer = TraceWriter(tmp_path)
+    writer.write_event(make_event(schema_version=version))
+    writer.close()
+    assert len(iter_events(writer.path)[0]) == 1
+
+
+def test_unknown_schema_version_rejected(tmp_path):
+    writer = TraceWriter(tmp_path)
+    writer.write_event(make_event(schema_version="4.0.0"))
+    writer.close()
+    with pytest.raises(PytracerError, match="schema version '4.0.0' is not supported"):
+        iter_events(writer.path)
+    with pytest.raises(PytracerError, match="not supported"):
+        build_index(tmp_path)
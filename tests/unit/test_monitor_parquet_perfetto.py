@@ -2,14 +2,17 @@
 
 import json
 import sys
+import tracemalloc
 
 import pytest
-from test_events_io import make_event
+from test_events_io import make_call_record, make_event
 
 from pytracer._errors import PytracerError
 from pytracer.instrumentation.monitor import MONITOR_FILENAME, Monitor
 from pytracer.report.perfetto import export_perfetto
 from pytracer.storage.parquet import finalize_run
+from pytracer.trace import reader
+from pytracer.trace.reader import REGIONS_FILENAME
 from pytracer.trace.writer import TraceWriter
 
 
@@ -73,10 +76,72 @@ def test_parquet_finalize_roundtrip(tmp_path):
     assert table.column("shape").to_pylist()[0] == [3]
 
 
+def test_parquet_finalize_streams_in_bounded_memory(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    monkeypatch.setattr(reader, "READ_CHUNK_BYTES", 1 << 16)
+    warmup = TraceWriter(tmp_path / "warmup")
+    warmup.write_event(make_event())
+    warmup.close()
+    finalize_run(tmp_path / "warmup")  # imports pyarrow outside the measurement
+
+    n_events = 8000
+    writer = TraceWriter(tmp_path / "run")
+    for i in range(n_events):
+        phase = "input" if i % 2 == 0 else "output"
+        writer.write_event(make_call_record(i, i // 2, phase, ["a", "b", "c"]))
+    writer.close()
+    budget = writer.path.stat().st_size // 3  # the trace is 3x larger than the budget
+
+    tracemalloc.start()
+    try:
+        out = finalize_run(tmp_path / "run", row_group_size=500)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < budget
+    parquet = pq.ParquetFile(out)
+    assert parquet.metadata.num_rows == 3 * n_events
+    assert parquet.metadata.num_row_groups == 3 * n_events // 500
+    assert parquet.read_row_group(6).column("arg_name").to_pylist()[:3] == ["a", "b", "c"]
+    assert not (tmp_path / "run" / "events.tmp").exists()
+
+
 def test_parquet_finalize_missing_events(tmp_path):
     assert finalize_run(tmp_path) is None
 
 
+def test_parquet_finalize_empty_capture_writes_nothing(tmp_path):
+    pytest.importorskip("pyarrow")
+    TraceWriter(tmp_path).close()
+    assert finalize_run(tmp_path) is None
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["events.jsonl"]
+
+
+@pytest.mark.parametrize("truncate", [False, True])
+def test_parquet_finalize_flags_truncation_in_schema(tmp_path, truncate):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    from pytracer.storage.parquet import TRUNCATED_KEY
+
+    writer = TraceWriter(tmp_path)
+    for i in range(5):
+        writer.write_event(make_event(event_id=i, call_id=i))
+    writer.close()
+    if truncate:
+        writer.path.write_bytes(writer.path.read_bytes()[:-15])
+
+    out = finalize_run(tmp_path, row_group_size=2)
+    flag = pq.read_schema(out).metadata[TRUNCATED_KEY.encode()]
+    assert flag == (b"true" if truncate else b"false")
+    parquet = pq.ParquetFile(out)
+    assert parquet.metadata.num_rows == (4 if truncate else 5)
+    assert parquet.metadata.num_row_groups == (2 if truncate else 3)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["events.jsonl", "events.parquet"]
+
+
 def test_perfetto_errors_without_runs(tmp_path):
     with pytest.raises(PytracerError, match="runs"):
         export_perfetto(tmp_path)
@@ -103,3 +168,19 @@ def test_perfetto_span_structure(tmp_path):
     assert span["name"] == "numpy.sum"
     assert span["dur"] == 50.0  # microseconds
     assert "input:a" in span["args"]
+
+
+def test_perfetto_region_rows(tmp_path):
+    run_dir = tmp_path / "runs" / "run-000"
+    writer = TraceWriter(run_dir)
+    writer.write_event(make_event(event_id=0, call_id=0, phase="input", ts_ns=2_000,
+                                  region="solver"))
+    writer.write_event(make_event(event_id=1, call_id=0, phase="output", ts_ns=3_000))
+    writer.close()
+    (run_dir / REGIONS_FILENAME).write_text(json.dumps(
+        {"windows": [{"name": "solver", "start_ns": 1_000, "end_ns": 5_000}], "dropped": 0}
+    ))
+    payload = json.loads(export_perfetto(tmp_path, tmp_path / "t.json").read_text())
+    call, region = [e for e in payload["traceEvents"] if e["ph"] == "X"]
+    assert call["args"]["region"] == "solver" and call["ts"] == 1.0
+    assert (region["name"], region["tid"], region["ts"], region["dur"]) == ("solver", 1, 0.0, 4.0)
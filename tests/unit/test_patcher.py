@@ -1,9 +1,12 @@
+import inspect
+import sys
+
 import numpy as np
 import pytest
 
 from pytracer.instrumentation.patcher import Patcher, resolve_targets
-from pytracer.instrumentation.recorder import Recorder
-from pytracer.trace.reader import assemble_calls, iter_events
+from pytracer.instrumentation.recorder import Recorder, make_binder
+from pytracer.trace.reader import assemble_calls, iter_events, load_call_sampling
 from pytracer.trace.writer import TraceWriter
 
 
@@ -166,3 +169,111 @@ def test_parent_linkage_for_nested_calls(recorder):
         assert by_name["sum"].parent_call_id == by_name["outer_fn"].call_id
     finally:
         del sys.modules[__name__].outer_fn
+
+
+def _all_kinds(a, b=1, /, c=2, *rest, d, e=3, **extra):
+    pass
+
+
+# Python 3.13 binds an unfilled, defaulted positional-only name passed by
+# keyword into **kwargs; earlier versions reject the call.
+_BIND_OPTIONAL_POSITIONAL_ONLY_TO_EXTRA = pytest.mark.skipif(
+    sys.version_info < (3, 13), reason="Signature.bind rejects this before 3.13"
+)
+_BIND_REJECTS_OPTIONAL_POSITIONAL_ONLY = pytest.mark.skipif(
+    sys.version_info >= (3, 13), reason="Signature.bind accepts this from 3.13"
+)
+
+
+def _method_like(self, x, y=0):
+    pass
+
+
+@pytest.mark.parametrize(
+    "fn, args, kwargs",
+    [
+        (np.sum, (np.ones(3),), {}),
+        (np.sum, (np.ones(3), 0), {"keepdims": True}),
+        (np.sum, (np.ones(3),), {"axis": 0, "dtype": float}),
+        (np.sum, (), {"a": np.ones(3)}),
+        (np.linalg.norm, (np.ones(3), 2), {}),
+        (_all_kinds, (1,), {"d": 4}),
+        (_all_kinds, (1, 2, 3, 4, 5), {"e": 6, "d": 7}),
+        (_all_kinds, (1,), {"c": 2, "d": 4, "zz": 5}),  # **extra: slow path
+        (_all_kinds, (1,), {"a": 2, "d": 4}),  # positional-only name lands in **extra
+        pytest.param(
+            _all_kinds, (1,), {"b": 2, "d": 4}, marks=_BIND_OPTIONAL_POSITIONAL_ONLY_TO_EXTRA
+        ),
+        (_method_like, ("obj", 1), {}),
+    ],
+)
+def test_binder_matches_signature_bind(fn, args, kwargs):
+    expected = dict(inspect.signature(fn).bind(*args, **kwargs).arguments)
+    expected.pop("self", None)
+    got = make_binder(fn).bind(args, kwargs)
+    assert list(got) == list(expected)
+    assert all(got[k] is expected[k] or got[k] == expected[k] for k in expected)
+
+
+@pytest.mark.parametrize(
+    "args, kwargs",
+    [
+        ((), {"d": 1}),
+        ((1,), {}),
+        pytest.param((1,), {"b": 2, "d": 4}, marks=_BIND_REJECTS_OPTIONAL_POSITIONAL_ONLY),
+        ((1, 2, 3), {"c": 1, "d": 1}),
+    ],
+)
+def test_binder_rejects_what_bind_rejects(args, kwargs):
+    with pytest.raises(TypeError):
+        inspect.signature(_all_kinds).bind(*args, **kwargs)
+    assert make_binder(_all_kinds).bind(args, kwargs) is None
+
+
+@pytest.mark.parametrize(
+    "policy, expected",
+    [
+        ("every", [0, 1, 2, 5, 8, 11]),
+        ("backoff", [0, 1, 2, 3, 5, 9]),
+    ],
+)
+def test_call_sampling_keeps_first_then_thins(tmp_path, policy, expected):
+    writer = TraceWriter(tmp_path)
+    rec = Recorder(
+        writer, "run-000", call_sampling=policy, call_sampling_first=2, call_sampling_every=3
+    )
+    report = resolve_targets(["numpy.sum"])
+    with Patcher(rec) as patcher:
+        patcher.patch(report.resolved)
+        results = [np.sum(np.arange(4.0)) for _ in range(12)]
+    assert results == [6.0] * 12  # skipped calls still run
+    calls = read_calls(rec)
+    assert [c.occurrence for c in calls] == expected
+    assert rec.stats()["calls_skipped"] == 12 - len(expected)
+
+    path = rec.write_call_sampling(tmp_path)
+    skipped = load_call_sampling(tmp_path)
+    assert path is not None and list(skipped.values()) == [12 - len(expected)]
+    assert next(iter(skipped)) == calls[0].site
+
+
+def test_call_sampling_off_writes_nothing(recorder, tmp_path):
+    assert recorder.write_call_sampling(tmp_path) is None
+    assert load_call_sampling(tmp_path) is None
+    assert "calls_skipped" not in recorder.stats()
+
+
+def test_one_record_per_call_side(recorder):
+    # a Python function: builtins such as np.dot have no signature on numpy < 2
+    report = resolve_targets(["numpy.linalg.norm"])
+    a = np.array([3.0, 4.0])
+    with Patcher(recorder) as patcher:
+        patcher.patch(report.resolved)
+        np.linalg.norm(a, None)
+    recorder.writer.close()
+    events, _ = iter_events(recorder.writer.path)
+    assert [e.phase for e in events] == ["input", "output"]
+    assert [arg.name for arg in events[0].args] == ["x", "ord"]
+    assert events[0].ts_ns <= events[1].ts_ns
+    (call,) = assemble_calls(events)
+    assert call.inputs["ord"] is None and call.outputs["Ret"].mean == 5.0
@@ -73,6 +73,20 @@ def test_markdown_element_basis_note():
     assert "| element " in md
 
 
+def test_markdown_convergence_section():
+    data = sample_data()
+    data["functions"][0]["min_output_sig_ci_bits"] = 0.8
+    data["experiment"]["adaptive"] = {
+        "target_ci_bits": 1.0, "max_runs": 40, "converged": True,
+        "waves": [{"runs": 5, "unconverged": ["numpy.linalg.solve"]},
+                  {"runs": 10, "unconverged": []}],
+    }
+    md = render_markdown(data)
+    assert "## Convergence" in md and "10 of at most 40 runs in 2 wave(s)" in md
+    assert "| `numpy.linalg.solve` | 12.3 | 0.80 |" in md
+    assert "## Convergence" not in render_markdown(sample_data())
+
+
 def test_html_escapes_and_wraps():
     data = sample_data()
     data["experiment"]["script"] = "<script>alert(1)</script>"
@@ -132,7 +146,7 @@ def test_environment_allowlist_blocks_secrets():
 def test_collect_and_roundtrip_metadata(tmp_path):
     meta = collect_run_metadata("exp-1", "run-000", ["prog.py", "--x"])
     assert isinstance(meta, RunMetadata)
-    assert meta.schema_version == "2.0.0"
+    assert meta.schema_version == "3.0.0"
     assert meta.run_id == "run-000"
     assert "numpy" in meta.packages
     assert "AWS_SECRET_ACCESS_KEY" not in meta.environment
@@ -1,6 +1,7 @@
 import numpy as np
+import pytest
 
-from pytracer.trace.summary import array_fingerprint, summarize_value
+from pytracer.trace.summary import SummaryCache, array_fingerprint, summarize_value
 
 
 def test_scalar_int():
@@ -75,3 +76,122 @@ def test_summary_never_raises_on_weird_objects():
             raise RuntimeError("no")
 
     assert summarize_value(Weird()) is None
+
+
+def _reference_stats(array):
+    """The straightforward multi-pass definition the fused kernel must match."""
+    values = np.abs(array) if array.dtype.kind == "c" else array
+    values = values.astype(np.float64) if values.dtype.kind == "b" else values
+    out = {"zero_count": int(np.count_nonzero(values == 0))}
+    if values.dtype.kind == "f":
+        finite = np.isfinite(values)
+        out["nan_count"] = int(np.count_nonzero(np.isnan(values)))
+        out["inf_count"] = int(np.count_nonzero(np.isinf(values)))
+        absv = np.abs(values)
+        tiny = np.finfo(values.dtype).tiny
+        out["subnormal_count"] = int(np.count_nonzero((absv > 0) & (absv < tiny)))
+        if not finite.all():
+            values = values[finite]
+    fv64 = values.astype(np.float64)
+    if fv64.size:
+        out.update(mean=float(np.mean(fv64)), std=float(np.std(fv64)),
+                   min=float(np.min(fv64)), max=float(np.max(fv64)),
+                   l2_norm=float(np.linalg.norm(fv64.ravel())))
+    return out
+
+
+def _summary_arrays():
+    rng = np.random.default_rng(7)
+    big = rng.standard_normal(100_003) * 1e3
+    specials = big.copy()
+    specials[::97] = np.nan
+    specials[5::131] = np.inf
+    specials[7::151] = -np.inf
+    specials[11::89] = 0.0
+    specials[13::83] = -0.0
+    specials[17::79] = np.finfo(np.float64).tiny / 3
+    return [
+        big,
+        specials,
+        big.reshape(7, -1, order="F") if big.size % 7 == 0 else big[:100_002].reshape(6, -1),
+        np.asfortranarray(big[:100_000].reshape(400, 250)),
+        big[::3],
+        specials[::-2],
+        big.astype(np.float32),
+        specials.astype(np.float32),
+        big[:5000].astype(np.float16),
+        rng.integers(-50, 50, 77_777),
+        rng.integers(0, 2, 1000).astype(bool),
+        (big[:4000] + 1j * big[4000:8000]).astype(np.complex64),
+        np.float64(2.5),
+        np.array(-0.0),
+        np.full(3, np.nan),
+    ]
+
+
+def test_fused_kernel_bit_identical_to_reference():
+    for array in _summary_arrays():
+        s = summarize_value(np.asarray(array) if np.ndim(array) == 0 else array)
+        for field, expected in _reference_stats(np.asarray(array)).items():
+            got = getattr(s, field)
+            assert np.array_equal(np.float64(got), np.float64(expected), equal_nan=True) and \
+                np.signbit(got) == np.signbit(expected), (array.dtype, field, got, expected)
+
+
+def test_sampled_summary_estimates_large_arrays():
+    rng = np.random.default_rng(3)
+    a = rng.standard_normal(2_000_000) + 5.0
+    a[::10] = np.nan  # periodic: a plain stride would alias with it
+    exact = summarize_value(a)
+    s = summarize_value(a, sample_above=100_000, sample_size=10_000)
+    assert s.size == a.size and s.shape == a.shape
+    assert s.sample_ratio == 10_000 / a.size
+    assert abs(s.mean - exact.mean) < 5 * s.mean_stderr
+    assert abs(s.nan_count - exact.nan_count) <= 0.1 * exact.nan_count
+    assert s.min >= exact.min and s.max <= exact.max
+    assert s.fingerprint == exact.fingerprint
+    # deterministic: same data, same estimate, whatever the memory layout
+    assert summarize_value(a.copy(), sample_above=100_000, sample_size=10_000) == s
+    strided = a.reshape(1000, 2000)[:, ::2]
+    assert summarize_value(strided, sample_above=100_000, sample_size=10_000).sample_ratio
+
+
+def test_sampled_summary_exact_below_threshold():
+    a = np.arange(1000.0)
+    assert summarize_value(a, sample_above=100_000) == summarize_value(a)
+    assert summarize_value(a, sample_above=100_000).sample_ratio is None
+
+
+def test_summary_cache_exact_hits_only_unchanged_content():
+    cache = SummaryCache(8)
+    a = np.arange(100.0)
+    first = cache.summarize(a)
+    assert cache.summarize(a) is first
+    assert cache.summarize(a.copy()) is first  # equal content, other buffer
+    a[50] = -1.0
+    assert cache.summarize(a) == summarize_value(a) != first
+    assert cache.summarize(np.asfortranarray(a.reshape(10, 10))) is not first
+    assert cache.stats() == {"summary_cache_hits": 2, "summary_cache_misses": 3,
+                             "summary_cache_disabled": 0}
+
+
+def test_summary_cache_bounded_lru():
+    cache = SummaryCache(2)
+    arrays = [np.full(4, float(i)) for i in range(3)]
+    for a in arrays:
+        cache.summarize(a)
+    cache.summarize(arrays[0])  # evicted by arrays[2]
+    assert cache.misses == 4 and len(cache._entries) == 2
+
+
+def test_summary_cache_sampled_validator_and_safety():
+    cache = SummaryCache(8, validate="sampled")
+    a = np.arange(10_000.0)
+    first = cache.summarize(a)
+    assert cache.summarize(a) is first
+    a[0] = 7.0  # a sampled position: detected
+    assert cache.summarize(a) is not first
+    cache.note_inplace_write()
+    assert cache.disabled and cache.summarize(a) == summarize_value(a)
+    with pytest.raises(ValueError):
+        SummaryCache(8, validate="never")
@@ -71,6 +71,22 @@ def test_out_argument_flagged(patched_add):
     assert any(ev.inplace for ev in events)
 
 
+def test_inplace_write_disables_sampled_summary_cache(tmp_path):
+    writer = TraceWriter(tmp_path)
+    recorder = Recorder(writer, "run-000", summary_cache_validate="sampled")
+    patcher = Patcher(recorder)
+    patcher.patch(resolve_targets(["numpy.add"]).resolved)
+    try:
+        a = np.arange(1000.0)
+        np.add(a, 1.0)
+        assert not recorder.summaries.disabled
+        np.add(a, 1.0, out=a)
+        assert recorder.summaries.disabled
+    finally:
+        patcher.unpatch()
+        writer.close()
+
+
 def test_unpatch_restores_real_ufunc(tmp_path):
     writer = TraceWriter(tmp_path)
     recorder = Recorder(writer, "run-000")